@@ -16,6 +16,7 @@
 import os
 import sys
 import argparse
+import tempfile
 from pathlib import Path
 
 import uvicorn
@@ -84,11 +85,32 @@ def configure_environment(args: argparse.Namespace) -> None:
         os.environ[constant.CONFIG_FILE] = args.config_file
 
 
+def configure_metrics(server_config) -> None:
+    """Share the metrics of multiple workers through a directory.
+
+    The directory is emptied first, samples of a previous run would
+    otherwise be summed into the new ones.
+    """
+    from src.main.app.core.metrics.metrics import MULTIPROC_DIR_ENV
+
+    if server_config.workers <= 1 or os.environ.get(MULTIPROC_DIR_ENV):
+        return
+    metrics_dir = Path(
+        server_config.metrics_multiproc_dir
+        or os.path.join(tempfile.gettempdir(), "fast_web_metrics")
+    )
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for sample_file in metrics_dir.glob("*.db"):
+        sample_file.unlink()
+    os.environ[MULTIPROC_DIR_ENV] = str(metrics_dir)
+
+
 def run_server() -> None:
     """Load configuration and start the Uvicorn server."""
     from src.main.app.core.config import config_manager
 
     server_config = config_manager.load_server_config()
+    configure_metrics(server_config)
     logger.info(
         f"OpenAPI url: http://{server_config.host}:{server_config.port}/docs"
     )
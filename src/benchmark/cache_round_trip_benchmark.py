@@ -0,0 +1,104 @@
+"""Compare warming and reading N keys one by one and in batches.
+
+Runs against the page cache, and against Redis when `--url` points at a
+reachable server, where every single-key call is a network round trip
+while a batch costs one.
+
+Usage (from the project root):
+    python -m src.benchmark.cache_round_trip_benchmark [--keys N]
+        [--url redis://localhost:6379/15] [--serializer json]
+"""
+
+import argparse
+import asyncio
+import time
+
+import redis.asyncio as redis
+
+from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.page_cache import PageCache
+from src.main.app.core.cache.redis_cache import RedisCache
+from src.main.app.core.cache.serializer import get_serializer
+
+PREFIX = "benchmark:"
+
+
+async def measure(cache: Cache, keys: int):
+    mapping = {
+        f"{PREFIX}{index}": {"id": index, "label": f"item {index}"}
+        for index in range(keys)
+    }
+    timings = {}
+
+    start = time.perf_counter()
+    for key, value in mapping.items():
+        await cache.set(key, value)
+    timings["set"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in mapping:
+        await cache.get(key)
+    timings["get"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in mapping:
+        await cache.delete(key)
+    timings["delete"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await cache.set_many(mapping)
+    timings["set_many"] = time.perf_counter() - start
+    start = time.perf_counter()
+    values = await cache.get_many(mapping)
+    timings["get_many"] = time.perf_counter() - start
+    assert len(values) == keys
+    start = time.perf_counter()
+    await cache.delete_by_prefix(PREFIX)
+    timings["delete_by_prefix"] = time.perf_counter() - start
+    return timings
+
+
+def report(label: str, timings) -> None:
+    for single, batch in (
+        ("set", "set_many"),
+        ("get", "get_many"),
+        ("delete", "delete_by_prefix"),
+    ):
+        print(
+            f"{label:>8} {single:>7} {timings[single] * 1000:>10.1f} "
+            f"{batch:>17} {timings[batch] * 1000:>10.1f} "
+            f"{timings[single] / timings[batch]:>8.1f}x"
+        )
+
+
+async def main(args) -> None:
+    print(f"keys={args.keys} serializer={args.serializer}")
+    print(
+        f"{'backend':>8} {'single':>7} {'ms':>10} {'batch':>17} "
+        f"{'ms':>10} {'speedup':>9}"
+    )
+    report("page", await measure(PageCache(), args.keys))
+    serializer = get_serializer(args.serializer)
+    client = redis.Redis.from_url(
+        args.url, decode_responses=not serializer.binary
+    )
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError) as e:
+        await client.aclose()
+        print(f"redis skipped, {args.url} is unreachable: {e}")
+        return
+    try:
+        report(
+            "redis", await measure(RedisCache(client, serializer), args.keys)
+        )
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    parser.add_argument("--serializer", default="json")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""Compare probe endpoint requests/sec behind the session middlewares.
+
+Requests go through an in-process ASGI transport, so the numbers show the
+middleware overhead without any network or server in between.
+
+Usage (from the project root):
+    python -m src.benchmark.db_session_middleware_benchmark [--requests N]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.main.app.controller.probe_controller import probe_router
+from src.main.app.core.middleware.db_session_middleware import (
+    create_middleware_and_session_proxy,
+)
+
+try:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+except ImportError:
+    from sqlalchemy.orm import sessionmaker as async_sessionmaker
+
+PROBE_PATH = "/v1/probe/liveness"
+CONCURRENCY = 16
+
+
+class LegacySQLAlchemyMiddleware(BaseHTTPMiddleware):
+    """The former middleware: a session opened and committed per request."""
+
+    def __init__(self, app, custom_engine):
+        super().__init__(app)
+        self.session_maker = async_sessionmaker(
+            custom_engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+    async def dispatch(self, request, call_next):
+        session = self.session_maker()
+        try:
+            response = await call_next(request)
+            await session.commit()
+            return response
+        finally:
+            await session.close()
+
+
+def make_app(middleware, **kwargs) -> FastAPI:
+    app = FastAPI()
+    app.include_router(probe_router, prefix="/v1/probe")
+    if middleware is not None:
+        app.add_middleware(middleware, **kwargs)
+    return app
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.get(PROBE_PATH)
+                assert response.status_code == 200
+
+        await worker(100)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(requests // CONCURRENCY) for _ in range(CONCURRENCY))
+        )
+        return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        cases = [("no middleware", make_app(None))]
+        cases.append(
+            (
+                "BaseHTTPMiddleware",
+                make_app(LegacySQLAlchemyMiddleware, custom_engine=engine),
+            )
+        )
+        middleware, _ = create_middleware_and_session_proxy()
+        cases.append(
+            ("ASGI, lazy session", make_app(middleware, custom_engine=engine))
+        )
+        middleware, _ = create_middleware_and_session_proxy()
+        cases.append(
+            (
+                "ASGI, path excluded",
+                make_app(
+                    middleware,
+                    custom_engine=engine,
+                    exclude_paths=["/v1/probe"],
+                ),
+            )
+        )
+        print(f"requests={requests} concurrency={CONCURRENCY}")
+        print(f"{'middleware':>22} {'requests/sec':>14}")
+        for label, app in cases:
+            print(f"{label:>22} {await measure(app, requests):>14,.0f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(main(parser.parse_args().requests))
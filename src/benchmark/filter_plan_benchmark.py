@@ -0,0 +1,123 @@
+"""Compare the per-call cost of filtered page selects with and without the
+compiled filter-plan cache.
+
+The legacy path rebuilds the select through the FilterOperators if-chain on
+every call, the plan path reuses the statement of the filter shape and only
+binds new values. Both run the same query against a small SQLite table, so
+the difference is the statement construction and cache-key overhead.
+
+Usage (from the project root):
+    python -m src.benchmark.filter_plan_benchmark [--calls N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.constant import FilterOperators
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+
+ROWS = 1_000
+PAGE_SIZE = 10
+SORT_LIST = [{"field": "nickname", "order": "asc"}]
+
+
+def filters_for(index: int) -> dict:
+    """Same filter shape, different values on every call."""
+    return {
+        FilterOperators.EQ: {"status": index % 2},
+        FilterOperators.LIKE: {"username": f"%{index % 10}%"},
+        FilterOperators.BETWEEN: {"id": (index % 100, index % 100 + 500)},
+    }
+
+
+async def legacy_page(session: AsyncSession, current: int, **kwargs):
+    """The pre-plan select_by_ordered_page query construction."""
+    query = select(UserModel)
+    if FilterOperators.EQ in kwargs:
+        for column, value in kwargs[FilterOperators.EQ].items():
+            query = query.filter(getattr(UserModel, column) == value)
+    if FilterOperators.LIKE in kwargs:
+        for column, value in kwargs[FilterOperators.LIKE].items():
+            query = query.filter(getattr(UserModel, column).like(value))
+    if FilterOperators.BETWEEN in kwargs:
+        for column, (start, end) in kwargs[FilterOperators.BETWEEN].items():
+            query = query.filter(getattr(UserModel, column).between(start, end))
+    for sort_item in SORT_LIST:
+        query = query.order_by(getattr(UserModel, sort_item["field"]).asc())
+    query = query.offset((current - 1) * PAGE_SIZE).limit(PAGE_SIZE)
+    return (await session.exec(query)).all()
+
+
+async def plan_page(session: AsyncSession, current: int, **kwargs):
+    records, _ = await userMapper.select_by_ordered_page(
+        current=current,
+        page_size=PAGE_SIZE,
+        sort_list=SORT_LIST,
+        db_session=session,
+        **kwargs,
+    )
+    return records
+
+
+async def measure(session: AsyncSession, page_func, calls: int) -> float:
+    """Return the median latency of `page_func` in microseconds."""
+    samples = []
+    for index in range(calls):
+        start = time.perf_counter()
+        await page_func(session, index % 5 + 1, **filters_for(index))
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+async def main(calls: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    now = datetime.now()
+    async with AsyncSession(engine) as session:
+        await session.exec(
+            insert(UserModel),
+            params=[
+                {
+                    "id": index,
+                    "username": f"user{index}",
+                    "password": "x",
+                    "nickname": f"nick{index % 7}",
+                    "status": index % 2,
+                    "create_time": now,
+                    "update_time": now,
+                }
+                for index in range(1, ROWS + 1)
+            ],
+        )
+        await session.commit()
+
+        for index in range(5):
+            legacy = await legacy_page(session, 1, **filters_for(index))
+            planned = await plan_page(session, 1, **filters_for(index))
+            assert [r.id for r in legacy] == [r.id for r in planned]
+
+        legacy_us = await measure(session, legacy_page, calls)
+        plan_us = await measure(session, plan_page, calls)
+    await engine.dispose()
+
+    print(f"{'path':<10}{'median us/call':>16}")
+    print(f"{'legacy':<10}{legacy_us:>16.1f}")
+    print(f"{'plan':<10}{plan_us:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,124 @@
+"""Compare the row-by-row and the chunked import of a large user sheet.
+
+Usage (from the project root):
+    python -m src.benchmark.import_benchmark [--rows N]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+import xlsxwriter
+from fastapi import UploadFile
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+from src.main.app.schema.sys_user_schema import UserCreate
+from src.main.app.service.impl.sys_user_service_impl import UserServiceImpl
+
+HEADER = ["username", "password", "nickname", "status", "remark"]
+
+
+def make_xlsx(path: str, rows: int) -> None:
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, HEADER)
+    for index in range(1, rows + 1):
+        worksheet.write_row(
+            index, 0, [f"user{index}", "x", f"nick{index}", index % 3]
+        )
+    workbook.close()
+
+
+def make_csv(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8-sig") as file:
+        file.write(",".join(HEADER) + "\n")
+        for index in range(1, rows + 1):
+            file.write(f"user{index},x,nick{index},{index % 3},\n")
+
+
+async def legacy_import(path: str, session: AsyncSession) -> int:
+    """The former import_user followed by batch_create_user."""
+    with open(path, "rb") as file:
+        contents = file.read()
+    import_df = pd.read_excel(io.BytesIO(contents))
+    import_df = import_df.fillna("")
+    records = import_df.to_dict(orient="records")
+    for record in records:
+        for key, value in record.items():
+            if value == "":
+                record[key] = None
+    create_list = [UserCreate(**record) for record in records]
+    # One statement for all rows exceeds SQLite's bound parameter limit
+    row_count = 0
+    for start in range(0, len(create_list), 1000):
+        row_count += await userMapper.batch_insert(
+            data_list=[
+                UserModel(**create.model_dump())
+                for create in create_list[start : start + 1000]
+            ],
+            db_session=session,
+        )
+    return row_count
+
+
+async def chunked_import(path: str, session: AsyncSession) -> int:
+    service = UserServiceImpl(mapper=userMapper)
+    with open(path, "rb") as file:
+        result = await service.import_data(
+            file=UploadFile(file, filename=os.path.basename(path)),
+            schema=UserCreate,
+            db_session=session,
+        )
+    assert not result.errors
+    return result.success_count
+
+
+async def measure(session: AsyncSession, label: str, coro) -> None:
+    start = time.perf_counter()
+    row_count = await coro
+    await session.commit()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>14} {row_count:>10} {elapsed:>10.2f}")
+    await session.exec(delete(UserModel))
+    await session.commit()
+
+
+async def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xlsx_path = os.path.join(tmp_dir, "user.xlsx")
+        csv_path = os.path.join(tmp_dir, "user.csv")
+        make_xlsx(xlsx_path, rows)
+        make_csv(csv_path, rows)
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[UserModel.__table__]
+            )
+        async with AsyncSession(engine) as session:
+            print(f"{'path':>14} {'rows':>10} {'seconds':>10}")
+            await measure(
+                session, "chunked xlsx", chunked_import(xlsx_path, session)
+            )
+            await measure(
+                session, "chunked csv", chunked_import(csv_path, session)
+            )
+            await measure(
+                session, "legacy xlsx", legacy_import(xlsx_path, session)
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().rows))
@@ -0,0 +1,114 @@
+"""Compare authenticated requests/sec behind the JWT middlewares.
+
+Requests go through an in-process ASGI transport, so the numbers show the
+authentication overhead without any network or server in between.
+
+Usage (from the project root):
+    python -m src.benchmark.jwt_middleware_benchmark [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, Request
+from jose import JWTError, jwt
+from starlette.responses import JSONResponse
+
+from src.main.app.core import constant
+from src.main.app.core.enums import TokenTypeEnum
+from src.main.app.core.middleware import jwt_middleware
+from src.main.app.core.middleware.jwt_middleware import JWTMiddleware
+from src.main.app.core.schema import CurrentUser
+from src.main.app.core.security import security
+
+API = jwt_middleware.server_config.api_version
+CONCURRENCY = 16
+security_config = jwt_middleware.security_config
+
+
+def legacy_decode(token: str):
+    return jwt.decode(
+        token,
+        security_config.secret_key,
+        algorithms=[security_config.algorithm],
+    )
+
+
+async def legacy_jwt_middleware(request: Request, call_next):
+    """The former middleware: whitelist split and two decodes per request."""
+    white_list_routes = [
+        router.strip()
+        for router in security_config.white_list_routes.split(",")
+    ]
+    path = request.url.path
+    if API + path.split(API)[1] in white_list_routes:
+        return await call_next(request)
+    try:
+        token = request.headers.get(constant.AUTHORIZATION).split(" ")[-1]
+        legacy_decode(token)
+        request.state.user_id = int(legacy_decode(token)["sub"])
+    except JWTError:
+        return JSONResponse(status_code=401, content={})
+    return await call_next(request)
+
+
+def legacy_current_user(request: Request) -> CurrentUser:
+    token = request.headers.get(constant.AUTHORIZATION).split(" ")[-1]
+    return CurrentUser(user_id=int(legacy_decode(token)["sub"]))
+
+
+def make_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    dependency = legacy_current_user if legacy else security.get_current_user()
+
+    @app.get(API + "/me")
+    async def me(current_user: CurrentUser = Depends(dependency)):
+        return current_user.user_id
+
+    if legacy:
+        app.middleware("http")(legacy_jwt_middleware)
+    else:
+        app.add_middleware(JWTMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, requests: int, token: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        headers={constant.AUTHORIZATION: f"Bearer {token}"},
+    ) as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.get(API + "/me")
+                assert response.status_code == 200
+
+        await worker(100)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(worker(requests // CONCURRENCY) for _ in range(CONCURRENCY))
+        )
+        return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int) -> None:
+    security_config.enable = True
+    token = security.create_token(1, token_type=TokenTypeEnum.access)
+    print(f"requests={requests} concurrency={CONCURRENCY}")
+    print(f"{'middleware':>22} {'requests/sec':>14}")
+    for label, legacy in (
+        ("BaseHTTPMiddleware", True),
+        ("ASGI, cached", False),
+    ):
+        rate = await measure(make_app(legacy), requests, token)
+        print(f"{label:>22} {rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(main(parser.parse_args().requests))
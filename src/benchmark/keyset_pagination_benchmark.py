@@ -0,0 +1,109 @@
+"""Compare OFFSET and keyset pagination latency on a large sys_user table.
+
+Usage (from the project root):
+    python -m src.benchmark.keyset_pagination_benchmark [--rows N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.utils.cursor_util import NEXT, encode_cursor
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+
+PAGE_SIZE = 10
+PAGES = (1, 1_000, 10_000)
+REPEAT = 20
+
+
+async def prepare(session: AsyncSession, rows: int) -> None:
+    """Fill sys_user with `rows` synthetic users."""
+    now = datetime.now()
+    batch = []
+    for index in range(1, rows + 1):
+        batch.append(
+            {
+                "id": index,
+                "username": f"user{index}",
+                "password": "x",
+                "nickname": f"nick{index}",
+                "create_time": now,
+                "update_time": now,
+            }
+        )
+        if len(batch) == 10_000:
+            await session.exec(insert(UserModel), params=batch)
+            batch = []
+    if batch:
+        await session.exec(insert(UserModel), params=batch)
+    await session.commit()
+
+
+async def cursor_for_page(session: AsyncSession, page: int) -> str:
+    """Return the keyset cursor that selects `page` (default id desc)."""
+    if page == 1:
+        return ""
+    offset = (page - 1) * PAGE_SIZE - 1
+    statement = (
+        select(UserModel.id)
+        .order_by(UserModel.id.desc())
+        .offset(offset)
+        .limit(1)
+    )
+    last_id = (await session.exec(statement)).one()
+    return encode_cursor([("id", last_id)], NEXT)
+
+
+async def measure(coro_factory) -> float:
+    """Median latency in milliseconds of `REPEAT` runs."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        await coro_factory()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "benchmark.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[UserModel.__table__]
+            )
+        async with AsyncSession(engine) as session:
+            await prepare(session, rows)
+            print(f"rows={rows} page_size={PAGE_SIZE} repeat={REPEAT}")
+            print(f"{'page':>8} {'offset ms':>12} {'keyset ms':>12}")
+            for page in PAGES:
+                cursor = await cursor_for_page(session, page)
+                offset_ms = await measure(
+                    lambda: userMapper.select_by_ordered_page(
+                        current=page, page_size=PAGE_SIZE, db_session=session
+                    )
+                )
+                keyset_ms = await measure(
+                    lambda: userMapper.select_by_ordered_page(
+                        page_size=PAGE_SIZE, cursor=cursor, db_session=session
+                    )
+                )
+                print(f"{page:>8} {offset_ms:>12.3f} {keyset_ms:>12.3f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, default=PAGE_SIZE * max(PAGES) + PAGE_SIZE
+    )
+    asyncio.run(main(parser.parse_args().rows))
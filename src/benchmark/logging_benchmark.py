@@ -0,0 +1,92 @@
+"""Measure the time a log call costs the caller, per file sink.
+
+Each sink receives the same records bound to a request context:
+- file: loguru's synchronous file sink, formatted and written by the caller
+- enqueue: the same sink with loguru's `enqueue=True`, pickling each record
+  through a multiprocessing queue
+- batched: `BatchedLogWriter`, encoding JSON and writing in batches from a
+  background thread
+
+Caller time is what a request handler pays per call; total time also
+includes writing the queued records out when the sink is removed.
+
+Usage (from the project root):
+    python -m src.benchmark.logging_benchmark [--records N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.main.app.core.utils.log_util import (
+    BatchedLogWriter,
+    add_request_context,
+    bind_request,
+    unbind_request,
+)
+
+SCOPE = {
+    "type": "http",
+    "path": "/v1/user/me",
+    "state": {"request_id": "0" * 32, "user_id": 1},
+}
+
+
+def run(label: str, sink, records: int, **options) -> None:
+    handler = logger.add(sink, level="INFO", **options)
+    token = bind_request(SCOPE)
+    start = time.perf_counter()
+    for i in range(records):
+        logger.bind(status=200).info(f"GET /v1/user/me {i}")
+    caller = time.perf_counter() - start
+    unbind_request(token)
+    logger.remove(handler)
+    total = time.perf_counter() - start
+    print(
+        f"{label:>8} {caller / records * 1e6:>8.2f} us/call caller "
+        f"{total / records * 1e6:>8.2f} us/call total"
+    )
+
+
+def main(args) -> None:
+    logger.remove()
+    logger.configure(patcher=add_request_context)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        print(f"records={args.records}")
+        run(
+            "file",
+            str(directory / "file.log"),
+            args.records,
+            rotation="10 MB",
+            compression="zip",
+            serialize=True,
+        )
+        run(
+            "enqueue",
+            str(directory / "enqueue.log"),
+            args.records,
+            rotation="10 MB",
+            compression="zip",
+            serialize=True,
+            enqueue=True,
+        )
+        run(
+            "batched",
+            BatchedLogWriter(
+                str(directory / "batched.log"), queue_size=args.records
+            ),
+            args.records,
+            format="{message}",
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--records", type=int, default=100_000)
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+"""Measure latency of an unrelated endpoint during a login storm.
+
+`--logins` concurrent requests verify a bcrypt password, once inline on the
+event loop as before and once in the password hashing pool, while a probe
+endpoint is requested in a loop. Requests go through an in-process ASGI
+transport, so the probe latency shows how long the event loop is blocked.
+
+Usage (from the project root):
+    python -m src.benchmark.password_hash_benchmark [--logins N]
+        [--rounds R] [--workers W]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+from src.main.app.core.security.password_hasher import PasswordHasher
+
+PROBE_INTERVAL = 0.005
+
+
+def make_app(hashed: str, hasher: PasswordHasher = None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe():
+        return "ok"
+
+    @app.post("/login")
+    async def login():
+        if hasher is None:
+            return bcrypt.checkpw(b"secret", hashed.encode())
+        return await hasher.verify("secret", hashed)
+
+    return app
+
+
+async def measure(app: FastAPI, logins: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+        latencies = []
+
+        async def storm():
+            responses = await asyncio.gather(
+                *(client.post("/login") for _ in range(logins))
+            )
+            assert all(response.json() is True for response in responses)
+
+        start = time.perf_counter()
+        task = asyncio.create_task(storm())
+        while not task.done():
+            due = time.perf_counter() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            await client.get("/probe")
+            # Counted from when the probe was due, a blocked loop also
+            # delays the timer that sends it
+            latencies.append(time.perf_counter() - due)
+        await task
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return elapsed, statistics.median(latencies), p99, len(latencies)
+
+
+async def main(args) -> None:
+    hashed = bcrypt.hashpw(b"secret", bcrypt.gensalt(args.rounds)).decode()
+    hasher = PasswordHasher(workers=args.workers, bcrypt_rounds=args.rounds)
+    print(f"logins={args.logins} rounds={args.rounds} workers={args.workers}")
+    print(
+        f"{'case':>10} {'storm s':>9} {'probe p50 ms':>13} "
+        f"{'probe p99 ms':>13} {'probes':>7}"
+    )
+    for label, app in (
+        ("inline", make_app(hashed)),
+        ("pool", make_app(hashed, hasher)),
+    ):
+        elapsed, p50, p99, probes = await measure(app, args.logins)
+        print(
+            f"{label:>10} {elapsed:>9.1f} {p50 * 1000:>13.1f} "
+            f"{p99 * 1000:>13.1f} {probes:>7}"
+        )
+    print(f"pool stats: {hasher.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,54 @@
+"""Measure snowflake ID throughput and check uniqueness across processes.
+
+Every process runs its own generator with a distinct worker ID, as leased
+ones would be, and allocates IDs one at a time and in bulk. All IDs are
+then collected and checked for duplicates.
+
+Usage (from the project root):
+    python -m src.benchmark.snowflake_benchmark [--processes N] [--ids N]
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from src.main.app.core.utils.snowflake_util import SnowflakeGenerator
+
+BULK_SIZE = 1000
+
+
+def allocate(worker_id: int, ids: int):
+    generator = SnowflakeGenerator(worker_id=worker_id)
+    start = time.perf_counter()
+    single = [generator.next_id() for _ in range(ids)]
+    single_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bulk = []
+    for _ in range(0, ids, BULK_SIZE):
+        bulk.extend(generator.next_ids(BULK_SIZE))
+    bulk_seconds = time.perf_counter() - start
+    return single + bulk, single_seconds, bulk_seconds
+
+
+def main(args) -> None:
+    with multiprocessing.Pool(args.processes) as pool:
+        results = pool.starmap(
+            allocate, [(worker, args.ids) for worker in range(args.processes)]
+        )
+    all_ids = [id for ids, _, _ in results for id in ids]
+    duplicates = len(all_ids) - len(set(all_ids))
+    print(f"processes={args.processes} ids={len(all_ids)}")
+    for label, index in (("next_id", 1), ("next_ids", 2)):
+        rate = sum(args.ids / result[index] for result in results)
+        print(f"{label:>8} {rate:>14,.0f} IDs/s")
+    print(f"duplicates={duplicates}")
+    assert duplicates == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--ids", type=int, default=200_000)
+    main(parser.parse_args())
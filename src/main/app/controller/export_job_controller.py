@@ -0,0 +1,48 @@
+"""Export job REST Controller"""
+
+from fastapi import APIRouter, Depends
+from starlette.responses import FileResponse
+
+from src.main.app.core.enums import ExportJobStatusEnum
+from src.main.app.core.schema import HttpResponse, CurrentUser, ExportJob
+from src.main.app.core.security import get_current_user
+from src.main.app.core.utils.excel_util import MEDIA_TYPES
+from src.main.app.enums import BusinessErrorCode
+from src.main.app.exception import BusinessException
+from src.main.app.manager.export_job_manager import exportJobManager
+
+export_job_router = APIRouter()
+
+
+def _get_job(job_id: str, current_user: CurrentUser) -> ExportJob:
+    export_job = exportJobManager.get_job(job_id, owner_id=current_user.user_id)
+    if export_job is None:
+        raise BusinessException(BusinessErrorCode.EXPORT_JOB_NOT_FOUND)
+    return export_job
+
+
+@export_job_router.get("/{job_id}")
+async def get_export_job(
+    job_id: str, current_user: CurrentUser = Depends(get_current_user())
+) -> HttpResponse[ExportJob]:
+    """
+    Retrieves the state of an export job.
+    """
+    return HttpResponse.success(_get_job(job_id, current_user))
+
+
+@export_job_router.get("/{job_id}/download")
+async def download_export_job(
+    job_id: str, current_user: CurrentUser = Depends(get_current_user())
+) -> FileResponse:
+    """
+    Downloads the file of a succeeded export job.
+    """
+    export_job = _get_job(job_id, current_user)
+    if export_job.status != ExportJobStatusEnum.SUCCEEDED:
+        raise BusinessException(BusinessErrorCode.EXPORT_JOB_NOT_READY)
+    return FileResponse(
+        exportJobManager.get_file_path(export_job),
+        media_type=MEDIA_TYPES[export_job.export_type],
+        filename=export_job.file_name,
+    )
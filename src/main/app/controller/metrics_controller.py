@@ -0,0 +1,16 @@
+"""Prometheus metrics endpoint"""
+
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from src.main.app.core import metrics
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("")
+async def get_metrics() -> Response:
+    """
+    Exposes the metrics of every worker in the Prometheus text format.
+    """
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,10 +1,16 @@
 """DictData REST Controller"""
 
-from typing import Annotated, List
-from fastapi import APIRouter, Query, UploadFile, Form, Depends
-from starlette.responses import StreamingResponse
+from typing import Annotated, Dict, List
+from fastapi import APIRouter, Query, UploadFile, Form, Depends, Request
+from starlette.responses import Response, StreamingResponse
 from src.main.app.core.security import get_current_user
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_dict_data_mapper import dictDataMapper
 from src.main.app.model.sys_dict_data_model import DictDataModel
@@ -15,6 +21,8 @@ from src.main.app.schema.sys_dict_data_schema import (
     DictDataCreate,
     DictDataBatchModify,
     DictDataDetail,
+    DictDataLookup,
+    DictDataPage,
 )
 from src.main.app.service.impl.sys_dict_data_service_impl import (
     DictDataServiceImpl,
@@ -50,6 +58,52 @@ async def get_dict_data_detail(
     return HttpResponse.success(dict_data_detail)
 
 
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in etags or etag in etags
+
+
+@dict_data_router.get("/by-type/{type}")
+async def get_dict_data_by_type(
+    type: str,
+    request: Request,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[List[DictDataPage]]:
+    """
+    Returns the dict data of a type in sort order, served from memory.
+    """
+    lookup: DictDataLookup = await dict_data_service.get_dict_data_by_types(
+        types=[type], current_user=current_user
+    )
+    if _not_modified(request, lookup.etag):
+        return Response(status_code=304, headers={"ETag": lookup.etag})
+    response.headers["ETag"] = lookup.etag
+    return HttpResponse.success(lookup.items[type])
+
+
+@dict_data_router.get("/by-types")
+async def get_dict_data_by_types(
+    request: Request,
+    response: Response,
+    types: List[str] = Query(...),
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[Dict[str, List[DictDataPage]]]:
+    """
+    Returns the dict data of several types at once, keyed by type.
+    """
+    lookup: DictDataLookup = await dict_data_service.get_dict_data_by_types(
+        types=types, current_user=current_user
+    )
+    if _not_modified(request, lookup.etag):
+        return Response(status_code=304, headers={"ETag": lookup.etag})
+    response.headers["ETag"] = lookup.etag
+    return HttpResponse.success(lookup.items)
+
+
 @dict_data_router.get("/export-template")
 async def export_template(
     current_user: CurrentUser = Depends(get_current_user()),
@@ -59,13 +113,31 @@ async def export_template(
     )
 
 
+@dict_data_router.post("/export-job")
+async def create_dict_data_export_job(
+    dict_data_query: Annotated[DictDataQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await dict_data_service.create_dict_data_export_job(
+        dict_data_query=dict_data_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @dict_data_router.get("/export")
 async def export_dict_data_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await dict_data_service.export_dict_data_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -95,13 +167,11 @@ async def batch_create_dict_data(
 async def import_dict_data(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[DictDataCreate]]:
-    dict_data_create_list: List[
-        DictDataCreate
-    ] = await dict_data_service.import_dict_data(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await dict_data_service.import_dict_data(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(dict_data_create_list)
+    return HttpResponse.success(import_result)
 
 
 @dict_data_router.delete("/remove/{id}")
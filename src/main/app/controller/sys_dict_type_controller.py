@@ -4,7 +4,13 @@ from typing import Annotated, List
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from starlette.responses import StreamingResponse
 from src.main.app.core.security import get_current_user
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_dict_type_mapper import dictTypeMapper
 from src.main.app.model.sys_dict_type_model import DictTypeModel
@@ -59,13 +65,31 @@ async def export_template(
     )
 
 
+@dict_type_router.post("/export-job")
+async def create_dict_type_export_job(
+    dict_type_query: Annotated[DictTypeQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await dict_type_service.create_dict_type_export_job(
+        dict_type_query=dict_type_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @dict_type_router.get("/export")
 async def export_dict_type_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await dict_type_service.export_dict_type_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -95,13 +119,11 @@ async def batch_create_dict_type(
 async def import_dict_type(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[DictTypeCreate]]:
-    dict_type_create_list: List[
-        DictTypeCreate
-    ] = await dict_type_service.import_dict_type(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await dict_type_service.import_dict_type(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(dict_type_create_list)
+    return HttpResponse.success(import_result)
 
 
 @dict_type_router.delete("/remove/{id}")
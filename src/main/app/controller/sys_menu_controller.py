@@ -1,10 +1,16 @@
 """Menu REST Controller"""
 
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from starlette.responses import StreamingResponse
 from src.main.app.core.security import get_current_user
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_menu_mapper import menuMapper
 from src.main.app.model.sys_menu_model import MenuModel
@@ -15,6 +21,7 @@ from src.main.app.schema.sys_menu_schema import (
     MenuCreate,
     MenuBatchModify,
     MenuDetail,
+    MenuTree,
 )
 from src.main.app.service.impl.sys_menu_service_impl import MenuServiceImpl
 from src.main.app.service.sys_menu_service import MenuService
@@ -34,6 +41,20 @@ async def get_menu_by_page(
     return HttpResponse.success(menu_page_result)
 
 
+@menu_router.get("/tree")
+async def get_menu_tree(
+    id: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[List[MenuTree]]:
+    """
+    Retrieves the whole menu tree, or the subtree rooted at `id`.
+    """
+    menu_tree: List[MenuTree] = await menu_service.get_menu_tree(
+        id=id, current_user=current_user
+    )
+    return HttpResponse.success(menu_tree)
+
+
 @menu_router.get("/detail/{id}")
 async def get_menu_detail(
     id: int, current_user: CurrentUser = Depends(get_current_user())
@@ -53,13 +74,31 @@ async def export_template(
     )
 
 
+@menu_router.post("/export-job")
+async def create_menu_export_job(
+    menu_query: Annotated[MenuQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await menu_service.create_menu_export_job(
+        menu_query=menu_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @menu_router.get("/export")
 async def export_menu_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await menu_service.export_menu_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -89,11 +128,11 @@ async def batch_create_menu(
 async def import_menu(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[MenuCreate]]:
-    menu_create_list: List[MenuCreate] = await menu_service.import_menu(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await menu_service.import_menu(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(menu_create_list)
+    return HttpResponse.success(import_result)
 
 
 @menu_router.delete("/remove/{id}")
@@ -5,9 +5,15 @@ from typing import Annotated, List
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from starlette.responses import StreamingResponse
 
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.core.schema import PageResult
 from src.main.app.core.security import get_current_user
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_role_mapper import roleMapper
 from src.main.app.model.sys_role_model import RoleModel
@@ -55,13 +61,31 @@ async def export_template(
     )
 
 
+@role_router.post("/export-job")
+async def create_role_export_job(
+    role_query: Annotated[RoleQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await role_service.create_role_export_job(
+        role_query=role_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @role_router.get("/export")
 async def export_role_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await role_service.export_role_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -91,11 +115,11 @@ async def batch_create_role(
 async def import_role(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[RoleCreate]]:
-    role_create_list: List[RoleCreate] = await role_service.import_role(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await role_service.import_role(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(role_create_list)
+    return HttpResponse.success(import_result)
 
 
 @role_router.delete("/remove/{id}")
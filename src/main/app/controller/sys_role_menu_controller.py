@@ -4,7 +4,13 @@ from typing import Annotated, List
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from starlette.responses import StreamingResponse
 from src.main.app.core.security import get_current_user
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_role_menu_mapper import roleMenuMapper
 from src.main.app.model.sys_role_menu_model import RoleMenuModel
@@ -59,13 +65,31 @@ async def export_template(
     )
 
 
+@role_menu_router.post("/export-job")
+async def create_role_menu_export_job(
+    role_menu_query: Annotated[RoleMenuQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await role_menu_service.create_role_menu_export_job(
+        role_menu_query=role_menu_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @role_menu_router.get("/export")
 async def export_role_menu_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await role_menu_service.export_role_menu_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -95,13 +119,11 @@ async def batch_create_role_menu(
 async def import_role_menu(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[RoleMenuCreate]]:
-    role_menu_create_list: List[
-        RoleMenuCreate
-    ] = await role_menu_service.import_role_menu(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await role_menu_service.import_role_menu(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(role_menu_create_list)
+    return HttpResponse.success(import_result)
 
 
 @role_menu_router.delete("/remove/{id}")
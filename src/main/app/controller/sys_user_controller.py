@@ -1,18 +1,24 @@
 """User REST Controller"""
 
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from starlette.responses import StreamingResponse
 
-from src.main.app.core.schema import HttpResponse, Token, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    Token,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.core.schema import PageResult
-from src.main.app.core.security import get_current_user
+from src.main.app.core.security import get_current_user, get_oauth2_scheme
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_user_mapper import userMapper
 from src.main.app.model.sys_user_model import UserModel
-from src.main.app.schema.sys_menu_schema import MenuPage
 from src.main.app.schema.sys_user_schema import (
     UserQuery,
     UserModify,
@@ -20,6 +26,7 @@ from src.main.app.schema.sys_user_schema import (
     UserBatchModify,
     UserDetail,
     LoginForm,
+    RefreshTokenForm,
     UserPage,
     UserInfo,
 )
@@ -50,6 +57,46 @@ async def login(
     return await user_service.login(login_form=login_form)
 
 
+@user_router.post("/refreshTokens")
+async def refresh_tokens(refresh_token_form: RefreshTokenForm) -> Token:
+    """
+    Exchanges a refresh token for a new token pair, revoking the old one.
+
+    Args:
+        refresh_token_form: The refresh token to rotate.
+
+    Returns:
+        Token object with the new access and refresh tokens.
+    """
+    return await user_service.refresh_tokens(
+        refresh_token=refresh_token_form.refresh_token
+    )
+
+
+@user_router.post("/logout")
+async def logout(
+    refresh_token_form: Optional[RefreshTokenForm] = None,
+    access_token: str = Depends(get_oauth2_scheme()),
+) -> HttpResponse[None]:
+    """
+    Revokes the current access token and the given refresh token.
+
+    Args:
+        refresh_token_form: Optional refresh token of the same session.
+        access_token: The bearer token of the request.
+
+    Returns:
+        BaseResponse with no data.
+    """
+    await user_service.logout(
+        access_token=access_token,
+        refresh_token=refresh_token_form.refresh_token
+        if refresh_token_form
+        else None,
+    )
+    return HttpResponse.success()
+
+
 @user_router.get("/me")
 async def get_me_info(
     current_user: CurrentUser = Depends(get_current_user()),
@@ -65,22 +112,12 @@ async def get_me_info(
     """
     user_id = current_user.user_id
     user_page: UserPage = await user_service.find_by_id(id=user_id)
-    roles, role_models = await user_service.get_roles(id=user_id)
-    menus: List[MenuPage] = await user_service.get_menus(
-        id=user_id, role_models=role_models
-    )
-    if UserInfo.is_admin(user_id):
-        permissions = ["*.*.*"]
-    else:
-        permission_list = [menu.permission for menu in menus]
-        permissions = [
-            permission for permission in permission_list if permission
-        ]
+    user_permission = await user_service.get_user_permission(id=user_id)
     user_info = UserInfo(
         **user_page.model_dump(),
-        permissions=permissions,
-        roles=roles,
-        menus=menus,
+        permissions=user_permission.permissions,
+        roles=user_permission.roles,
+        menus=user_permission.menus,
     )
     return HttpResponse.success(user_info)
 
@@ -115,13 +152,31 @@ async def export_template(
     )
 
 
+@user_router.post("/export-job")
+async def create_user_export_job(
+    user_query: Annotated[UserQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await user_service.create_user_export_job(
+        user_query=user_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @user_router.get("/export")
 async def export_user_page(
     current_user: CurrentUser = Depends(get_current_user()),
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
 ) -> StreamingResponse:
     return await user_service.export_user_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -151,11 +206,11 @@ async def batch_create_user(
 async def import_user(
     current_user: CurrentUser = Depends(get_current_user()),
     file: UploadFile = Form(),
-) -> HttpResponse[List[UserCreate]]:
-    user_create_list: List[UserCreate] = await user_service.import_user(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await user_service.import_user(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(user_create_list)
+    return HttpResponse.success(import_result)
 
 
 @user_router.delete("/remove/{id}")
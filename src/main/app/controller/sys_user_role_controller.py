@@ -4,7 +4,13 @@ from typing import Annotated, List
 from fastapi import APIRouter, Query, UploadFile, Form, Depends
 from starlette.responses import StreamingResponse
 from src.main.app.core.security import get_current_user
-from src.main.app.core.schema import HttpResponse, CurrentUser
+from src.main.app.core.schema import (
+    HttpResponse,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
+from src.main.app.core.enums import ExportTypeEnum
 from src.main.app.core.utils import excel_util
 from src.main.app.mapper.sys_user_role_mapper import userRoleMapper
 from src.main.app.model.sys_user_role_model import UserRoleModel
@@ -59,13 +65,31 @@ async def export_template(
     )
 
 
+@user_role_router.post("/export-job")
+async def create_user_role_export_job(
+    user_role_query: Annotated[UserRoleQuery, Query()],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    current_user: CurrentUser = Depends(get_current_user()),
+) -> HttpResponse[ExportJob]:
+    """
+    Starts a background export of the records matching a page query.
+    """
+    export_job: ExportJob = await user_role_service.create_user_role_export_job(
+        user_role_query=user_role_query,
+        export_type=export_type,
+        current_user=current_user,
+    )
+    return HttpResponse.success(export_job)
+
+
 @user_role_router.get("/export")
 async def export_user_role_page(
     ids: list[int] = Query(...),
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
     current_user: CurrentUser = Depends(get_current_user()),
 ) -> StreamingResponse:
     return await user_role_service.export_user_role_page(
-        ids=ids, current_user=current_user
+        ids=ids, export_type=export_type, current_user=current_user
     )
 
 
@@ -95,13 +119,11 @@ async def batch_create_user_role(
 async def import_user_role(
     file: UploadFile = Form(),
     current_user: CurrentUser = Depends(get_current_user()),
-) -> HttpResponse[List[UserRoleCreate]]:
-    user_role_create_list: List[
-        UserRoleCreate
-    ] = await user_role_service.import_user_role(
+) -> HttpResponse[ImportResult]:
+    import_result: ImportResult = await user_role_service.import_user_role(
         file=file, current_user=current_user
     )
-    return HttpResponse.success(user_role_create_list)
+    return HttpResponse.success(import_result)
 
 
 @user_role_router.delete("/remove/{id}")
@@ -1,7 +1,16 @@
 """Abstract base class for Cache"""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 
 class Cache(ABC):
@@ -28,3 +37,76 @@ class Cache(ABC):
         """Check if a key exists in the cache."""
 
         raise NotImplementedError
+
+    @abstractmethod
+    async def keys(self, prefix: str) -> List[str]:
+        """List the live keys starting with a prefix."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, timeout=None) -> bool:
+        """Set a key only if it is absent, returning whether it was set."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve several keys at once, missing keys are left out."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many(self, mapping: Dict[str, Any], timeout=None) -> None:
+        """Set several keys at once with an optional shared timeout."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys at once, returning how many existed."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically add to an integer counter, starting from 0.
+
+        Counters are stored as plain integers whatever the serializer, read
+        them with `incr(key, 0)`.
+        """
+
+        raise NotImplementedError
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Retrieve a value and the seconds it has left, None if unknown."""
+
+        return await self.get(key), None
+
+    async def get_many_with_ttl(
+        self, keys: Iterable[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """Retrieve several keys with the seconds each has left."""
+
+        values = await self.get_many(keys)
+        return {key: (value, None) for key, value in values.items()}
+
+    async def delete_by_prefix(self, prefix: str) -> int:
+        """Delete the keys starting with a prefix, returning how many."""
+
+        keys = await self.keys(prefix)
+        if not keys:
+            return 0
+        return await self.delete_many(keys)
+
+    async def get_or_set(
+        self, key: str, loader: Callable[[], Awaitable[Any]], timeout=None
+    ) -> Any:
+        """Return the cached value of a key, loading and storing it if missing."""
+
+        value = await self.get(key)
+        if value is None:
+            value = await loader()
+            if value is not None:
+                await self.set(key, value, timeout)
+        return value
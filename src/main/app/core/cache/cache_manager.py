@@ -1,24 +1,61 @@
 """Cache Client manager to instantiate the appropriate cache client"""
 
+from typing import Optional
+
 from src.main.app.core.cache.cache import Cache
 from src.main.app.core.cache.redis_cache import RedisManager
 from src.main.app.core.config.config_manager import load_config
 
+# Shared so that every caller reads through the same local tier
+_tiered_cache: Optional[Cache] = None
+_page_cache: Optional[Cache] = None
+
 
 async def get_cache_client() -> Cache:
     """Initialize and return the appropriate cache client based on configuration.
 
     Returns:
-        Cache: Redis client if Redis is enabled in config, otherwise returns page cache.
+        Cache: Redis client if Redis is enabled in config, fronted by an
+            in-process tier unless its size is 0, otherwise returns page
+            cache.
     """
+    global _tiered_cache, _page_cache
 
     config = load_config()
     if config.database.enable_redis:
         from src.main.app.core.cache.redis_cache import RedisCache
 
+        from src.main.app.core.cache.serializer import get_serializer
+
         redis_client = await RedisManager.get_instance()
-        return RedisCache(redis_client)
+        serializer = get_serializer(config.database.cache_serializer)
+        remote = RedisCache(
+            await RedisManager.get_binary_instance()
+            if serializer.binary
+            else redis_client,
+            serializer,
+        )
+        if config.database.local_cache_size <= 0:
+            return remote
+        if _tiered_cache is None:
+            from src.main.app.core.cache.tiered_cache import TieredCache
+
+            _tiered_cache = TieredCache(
+                remote,
+                redis_client,
+                maxsize=config.database.local_cache_size,
+                ttl=config.database.local_cache_ttl,
+                channel=config.database.cache_invalidation_channel,
+            )
+        return _tiered_cache
     else:
-        from src.main.app.core.cache.page_cache import PageCache
+        if _page_cache is None:
+            from src.main.app.core.cache.page_cache import PageCache
 
-        return PageCache()
+            _page_cache = PageCache(
+                maxsize=config.database.page_cache_size,
+                directory=config.database.page_cache_dir or None,
+                disk_size_limit=config.database.page_cache_disk_limit,
+                memory_ttl=config.database.local_cache_ttl,
+            )
+        return _page_cache
@@ -0,0 +1,60 @@
+"""Tag versions shared through the cache to invalidate tagged entries"""
+
+import time
+import uuid
+from typing import Dict, Iterable, Optional
+
+from loguru import logger
+
+from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.cache_manager import get_cache_client
+
+TAG_PREFIX = "cache_tag:"
+
+
+async def get_tag_versions(cache: Cache, tags: Iterable[str]) -> Dict[str, str]:
+    """Return the current version of each tag, creating missing ones.
+
+    Args:
+        cache: The cache holding the versions.
+        tags: The tag names, usually table names.
+
+    Returns:
+        Dict[str, str]: Version token of every tag.
+    """
+    keys = {tag: f"{TAG_PREFIX}{tag}" for tag in tags}
+    stored = await cache.get_many(keys.values())
+    versions = {tag: stored.get(key) for tag, key in keys.items()}
+    missing = {
+        keys[tag]: uuid.uuid4().hex
+        for tag, version in versions.items()
+        if version is None
+    }
+    if missing:
+        await cache.set_many(missing)
+        versions.update(
+            {tag: missing[key] for tag, key in keys.items() if key in missing}
+        )
+    return versions
+
+
+def written_at(version: str) -> Optional[float]:
+    """Return the timestamp of the write that set a tag version, if any."""
+    _, _, timestamp = version.partition(":")
+    return float(timestamp) if timestamp else None
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Give the tags new versions, orphaning every entry built on them.
+
+    The versions carry the time of the write, see `written_at`. Failures
+    are logged rather than raised, this runs after commits.
+    """
+    if not tags:
+        return
+    version = f"{uuid.uuid4().hex}:{time.time()}"
+    try:
+        cache = await get_cache_client()
+        await cache.set_many({f"{TAG_PREFIX}{tag}": version for tag in tags})
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
@@ -0,0 +1,123 @@
+"""Declarative caching of async service and mapper reads"""
+
+import functools
+import hashlib
+import inspect
+import json
+import time
+import typing
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter
+
+from src.main.app.core.cache.cache_manager import get_cache_client
+from src.main.app.core.cache.cache_tags import get_tag_versions, written_at
+from src.main.app.core.config.config_manager import load_config
+from src.main.app.core.middleware.db_session_middleware import db
+
+CACHED_PREFIX = "cached:"
+# Never part of a key, results do not depend on them
+IGNORED_ARGUMENTS = ("self", "cls", "current_user")
+
+
+def _encode_argument(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def cached(
+    *tags: str,
+    ttl: Optional[int] = None,
+    ignore: Iterable[str] = IGNORED_ARGUMENTS,
+):
+    """
+    Cache the result of an async function in the configured cache.
+
+    The key is built from the function name, the current versions of
+    `tags` and the call arguments, except the `ignore`d ones. Writing a
+    table through a mapper gives its tag, the table name, a new version
+    once the transaction commits, so every entry built on it is missed.
+    Results are stored as JSON validated against the return annotation,
+    and None results are not cached. A context that has written reads
+    around the cache, so uncommitted rows are never cached. Within
+    database.replica_max_lag seconds of a write to a tag, results are
+    read from the primary, a lagging replica would return rows older
+    than the new tag version.
+
+    Args:
+        tags: Tags the result depends on, usually table names.
+        ttl: Seconds an entry lives, database.cached_ttl if None.
+        ignore: Argument names left out of the key.
+    """
+
+    def decorator(function: Callable):
+        signature = inspect.signature(function)
+        name = f"{function.__module__}.{function.__qualname__}"
+        ignored = frozenset(ignore)
+        adapter: Optional[TypeAdapter] = None
+
+        def get_adapter() -> TypeAdapter:
+            # Resolved lazily, annotations may be postponed strings
+            nonlocal adapter
+            if adapter is None:
+                return_type = typing.get_type_hints(function)["return"]
+                adapter = TypeAdapter(return_type)
+            return adapter
+
+        def build_key(args, kwargs, versions) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {
+                key: value
+                for key, value in bound.arguments.items()
+                if key not in ignored
+            }
+            payload = json.dumps(
+                [versions, arguments], sort_keys=True, default=_encode_argument
+            )
+            digest = hashlib.blake2b(payload.encode(), digest_size=16)
+            return f"{CACHED_PREFIX}{name}:{digest.hexdigest()}"
+
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            if db.has_written:
+                return await function(*args, **kwargs)
+            try:
+                cache = await get_cache_client()
+                versions = await get_tag_versions(cache, tags)
+                key = build_key(args, kwargs, versions)
+                data = await cache.get(key)
+            except Exception as e:
+                logger.warning(f"Cache read of {name} failed: {e}")
+                return await function(*args, **kwargs)
+            if data is not None:
+                return get_adapter().validate_json(data)
+
+            database_config = load_config().database
+            written_after = time.time() - database_config.replica_max_lag
+            if any(
+                (written_at(version) or 0) > written_after
+                for version in versions.values()
+            ):
+                with db.pin_primary():
+                    result = await function(*args, **kwargs)
+            else:
+                result = await function(*args, **kwargs)
+            if result is not None:
+                timeout = ttl if ttl is not None else database_config.cached_ttl
+                try:
+                    await cache.set(
+                        key, get_adapter().dump_json(result).decode(), timeout
+                    )
+                except Exception as e:
+                    logger.warning(f"Cache write of {name} failed: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
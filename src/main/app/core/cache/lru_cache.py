@@ -0,0 +1,96 @@
+"""Bounded in-process LRU cache with per-key TTL"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """Bounded LRU mapping whose entries expire after their TTL.
+
+    Not thread-safe, meant for use from the event loop. Expired entries
+    are dropped when looked up, or evicted as least recently used.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expire time or None, value)
+        self._entries: "OrderedDict[Hashable, Tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live value of a key, default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expire_at, value = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value for `ttl` seconds, the default TTL if None."""
+        ttl = self.ttl if ttl is None else ttl
+        expire_at = None if ttl is None else time.monotonic() + ttl
+        self._store(key, expire_at, value)
+
+    def delete(self, key: Hashable) -> bool:
+        """Drop a key, returning whether it was live."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        expire_at = entry[0]
+        return expire_at is None or expire_at > time.monotonic()
+
+    def incr(self, key: Hashable, amount: int = 1) -> int:
+        """Add to an integer value, starting from 0, keeping its expiry."""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or (entry[0] is not None and entry[0] <= now):
+            expire_at = None if self.ttl is None else now + self.ttl
+            value = amount
+        else:
+            expire_at, value = entry[0], entry[1] + amount
+        self._store(key, expire_at, value)
+        return value
+
+    def keys(self) -> List[Hashable]:
+        """Return the live keys, dropping expired ones."""
+        now = time.monotonic()
+        for key in [
+            key
+            for key, (expire_at, _) in self._entries.items()
+            if expire_at is not None and expire_at <= now
+        ]:
+            del self._entries[key]
+        return list(self._entries)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Drop the string keys starting with a prefix."""
+        for key in [
+            key
+            for key in self._entries
+            if isinstance(key, str) and key.startswith(prefix)
+        ]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def _store(self, key: Hashable, expire_at: Optional[float], value: Any):
+        self._entries[key] = (expire_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_MISSING = object()
@@ -1,34 +1,185 @@
 """Simple in-memory page cache implementation"""
 
-from typing import Any
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
 import diskcache
 
 from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+_MEMORY_HITS = CACHE_REQUESTS.labels("memory", "hit")
+_MEMORY_MISSES = CACHE_REQUESTS.labels("memory", "miss")
+_DISK_HITS = CACHE_REQUESTS.labels("disk", "hit")
+_DISK_MISSES = CACHE_REQUESTS.labels("disk", "miss")
 
 
 class PageCache(Cache):
-    def __init__(self):
-        self.cache = diskcache.Cache()
+    """
+    Cache kept in a bounded in-memory LRU with per-key timeouts.
+
+    With a `directory` every entry is also written to a diskcache there,
+    which survives restarts and is shared by the processes pointing at the
+    same directory. Its SQLite I/O runs in a worker thread, and the memory
+    tier then keeps entries at most `memory_ttl` seconds, so writes of
+    other processes show up after that.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        directory: Optional[str] = None,
+        disk_size_limit: int = 2**30,
+        memory_ttl: Optional[float] = 60,
+    ):
+        self.memory = LRUCache(maxsize=maxsize)
+        self.disk = (
+            diskcache.Cache(directory, size_limit=disk_size_limit)
+            if directory
+            else None
+        )
+        self.memory_ttl = memory_ttl if self.disk is not None else None
+
+    def _memory_ttl(self, timeout: Optional[float]) -> Optional[float]:
+        ttls = [ttl for ttl in (timeout, self.memory_ttl) if ttl]
+        return min(ttls) if ttls else None
+
+    def _remember(self, key: str, value: Any, expire_time: Optional[float]):
+        timeout = None if expire_time is None else expire_time - time.time()
+        self.memory.set(key, value, self._memory_ttl(timeout))
 
     async def get(self, key: str) -> Any:
-        """Retrieve a value by key from the in-memory cache."""
-        return self.cache.get(key)
+        """Retrieve a value by key from memory, else from disk."""
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            _MEMORY_HITS.inc()
+            return value
+        _MEMORY_MISSES.inc()
+        if self.disk is None:
+            return None
+        value, expire_time = await asyncio.to_thread(
+            self.disk.get, key, expire_time=True
+        )
+        if value is None:
+            _DISK_MISSES.inc()
+        else:
+            _DISK_HITS.inc()
+            self._remember(key, value, expire_time)
+        return value
 
     async def set(self, key: str, value: Any, timeout: int = None) -> None:
-        """Set the value for a key in the in-memory cache."""
-        if timeout:
-            self.cache.set(key, value, timeout)
-        else:
-            self.cache.set(key, value)
+        """Set the value for a key in the cache."""
+        self.memory.set(key, value, self._memory_ttl(timeout))
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, timeout or None)
 
     async def delete(self, key: str) -> None:
-        """Delete a key from the in-memory cache."""
-        if key in self.cache:
-            self.cache.delete(key)
+        """Delete a key from the cache."""
+        self.memory.delete(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
 
     async def exists(self, key: str) -> bool:
-        """Check if a key exists in the in-memory cache."""
-        if key in self.cache:
+        """Check if a key exists in the cache."""
+        if key in self.memory:
+            return True
+        if self.disk is None:
+            return False
+        return await asyncio.to_thread(self.disk.__contains__, key)
+
+    async def keys(self, prefix: str) -> List[str]:
+        """List the live keys starting with a prefix."""
+        if self.disk is not None:
+            return await asyncio.to_thread(self._disk_keys, prefix)
+        return [
+            key
+            for key in self.memory.keys()
+            if isinstance(key, str) and key.startswith(prefix)
+        ]
+
+    async def add(self, key: str, value: Any, timeout=None) -> bool:
+        """Set a key only if it is absent, atomically across processes."""
+        if self.disk is None:
+            if key in self.memory:
+                return False
+            self.memory.set(key, value, timeout or None)
             return True
-        return False
+        self.memory.delete(key)
+        return await asyncio.to_thread(
+            self.disk.add, key, value, timeout or None
+        )
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve several keys, the disk misses in one transaction."""
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.memory.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                values[key] = value
+        _MEMORY_HITS.inc(len(values))
+        _MEMORY_MISSES.inc(len(missing))
+        if missing and self.disk is not None:
+            found = await asyncio.to_thread(self._disk_get_many, missing)
+            _DISK_HITS.inc(len(found))
+            _DISK_MISSES.inc(len(missing) - len(found))
+            for key, (value, expire_time) in found.items():
+                self._remember(key, value, expire_time)
+                values[key] = value
+        return values
+
+    async def set_many(self, mapping: Dict[str, Any], timeout=None) -> None:
+        """Set several keys, on disk in one transaction."""
+        ttl = self._memory_ttl(timeout)
+        for key, value in mapping.items():
+            self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            await asyncio.to_thread(self._disk_set_many, mapping, timeout)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys, on disk in one transaction."""
+        keys = list(keys)
+        deleted = sum(self.memory.delete(key) for key in keys)
+        if self.disk is None:
+            return deleted
+        return await asyncio.to_thread(self._disk_delete_many, keys)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically add to an integer counter."""
+        if self.disk is None:
+            return self.memory.incr(key, amount)
+        # Counters are read from disk, other processes may change them
+        self.memory.delete(key)
+        return await asyncio.to_thread(self.disk.incr, key, amount)
+
+    def _disk_keys(self, prefix: str) -> List[str]:
+        return [
+            key
+            for key in self.disk.iterkeys()
+            if isinstance(key, str)
+            and key.startswith(prefix)
+            and key in self.disk
+        ]
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        found = {}
+        with self.disk.transact():
+            for key in keys:
+                value, expire_time = self.disk.get(key, expire_time=True)
+                if value is not None:
+                    found[key] = (value, expire_time)
+        return found
+
+    def _disk_set_many(self, mapping: Dict[str, Any], timeout) -> None:
+        with self.disk.transact():
+            for key, value in mapping.items():
+                self.disk.set(key, value, timeout or None)
+
+    def _disk_delete_many(self, keys: List[str]) -> int:
+        with self.disk.transact():
+            return sum(self.disk.delete(key) for key in keys)
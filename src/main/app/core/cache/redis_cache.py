@@ -1,26 +1,41 @@
 """Redis cache implementation"""
 
-from typing import Any
-
-from src.main.app.core.cache.cache import Cache
 import asyncio
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import redis.asyncio as redis
 
+from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.serializer import RawSerializer, Serializer
 from src.main.app.core.config.config_manager import load_config
 
+# Keys deleted per round trip by delete_by_prefix
+DELETE_BATCH_SIZE = 500
+
 
 class RedisCache(Cache):
-    def __init__(self, redis_client):
+    """
+    Cache stored in Redis, values encoded by `serializer`.
+
+    The default serializer stores values as given, so they read back as
+    strings from a client decoding responses. Binary serializers need a
+    client that does not decode them. Batch methods cost one round trip.
+    """
+
+    def __init__(self, redis_client, serializer: Optional[Serializer] = None):
         self.redis_client = redis_client
+        self.serializer = serializer or RawSerializer()
+
+    def _loads(self, data: Any) -> Any:
+        return None if data is None else self.serializer.loads(data)
 
     async def get(self, key: str) -> Any:
         """Retrieve a value by key from Redis."""
-        return await self.redis_client.get(key)
+        return self._loads(await self.redis_client.get(key))
 
     async def set(self, key: str, value: Any, timeout=None):
         """Set the value of a key in Redis with timeout."""
+        value = self.serializer.dumps(value)
         if timeout:
             await self.redis_client.setex(key, timeout, value)
         else:
@@ -34,12 +49,122 @@ class RedisCache(Cache):
         """Check if a key exists in Redis."""
         return await self.redis_client.exists(key)
 
+    async def keys(self, prefix: str) -> List[str]:
+        """List the keys starting with a prefix, scanning incrementally.
+
+        Keys are decoded to strings, also from a client returning bytes.
+        """
+        return [
+            key.decode() if isinstance(key, bytes) else key
+            async for key in self.redis_client.scan_iter(match=f"{prefix}*")
+        ]
+
+    async def add(self, key: str, value: Any, timeout=None) -> bool:
+        """Set a key only if it is absent with SET NX."""
+        return bool(
+            await self.redis_client.set(
+                key, self.serializer.dumps(value), ex=timeout or None, nx=True
+            )
+        )
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Retrieve several keys with a single MGET."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = await self.redis_client.mget(keys)
+        return {
+            key: self._loads(value)
+            for key, value in zip(keys, values)
+            if value is not None
+        }
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Retrieve a value and its remaining timeout with GET and PTTL."""
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            data, pttl = await pipe.execute()
+        return self._loads(data), _seconds(pttl)
+
+    async def get_many_with_ttl(
+        self, keys: Iterable[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """Retrieve several keys with their remaining timeouts in one MULTI."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            values, *pttls = await pipe.execute()
+        return {
+            key: (self._loads(value), _seconds(pttl))
+            for key, value, pttl in zip(keys, values, pttls)
+            if value is not None
+        }
+
+    async def set_many(self, mapping: Dict[str, Any], timeout=None) -> None:
+        """Set several keys in one pipelined round trip."""
+        if not mapping:
+            return
+        if not timeout:
+            await self.redis_client.mset(
+                {
+                    key: self.serializer.dumps(value)
+                    for key, value in mapping.items()
+                }
+            )
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.setex(key, timeout, self.serializer.dumps(value))
+            await pipe.execute()
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys with a single DEL."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        return await self.redis_client.delete(*keys)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """Atomically add to an integer counter with INCRBY."""
+        return await self.redis_client.incrby(key, amount)
+
+    async def delete_by_prefix(self, prefix: str) -> int:
+        """Delete the keys starting with a prefix, a batch per round trip."""
+        deleted = 0
+        batch = []
+        async for key in self.redis_client.scan_iter(
+            match=f"{prefix}*", count=DELETE_BATCH_SIZE
+        ):
+            batch.append(key)
+            if len(batch) >= DELETE_BATCH_SIZE:
+                deleted += await self.redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis_client.unlink(*batch)
+        return deleted
+
+
+def _seconds(pttl: int) -> Optional[float]:
+    # Negative when the key has no timeout or is gone
+    return pttl / 1000 if pttl >= 0 else None
+
 
 class RedisManager:
     _instance: Optional[redis.Redis] = None
     _connection_pool: Optional[redis.ConnectionPool] = None
+    _binary_instance: Optional[redis.Redis] = None
     _lock = asyncio.Lock()
 
+    @staticmethod
+    def _url() -> str:
+        database = load_config().database
+        return f"redis://:{database.cache_pass}@{database.cache_host}:{database.cache_port}/{database.db_num}"
+
     @classmethod
     async def get_instance(cls) -> redis.Redis:
         """
@@ -48,9 +173,8 @@ class RedisManager:
         if cls._instance is None:
             async with cls._lock:
                 if cls._connection_pool is None:
-                    database = load_config().database
                     cls._connection_pool = redis.ConnectionPool.from_url(
-                        f"redis://:{database.cache_pass}@{database.cache_host}:{database.cache_port}/{database.db_num}",
+                        cls._url(),
                         decode_responses=True,
                     )
                 if cls._instance is None:
@@ -58,3 +182,16 @@ class RedisManager:
                         cls._connection_pool
                     )
         return cls._instance
+
+    @classmethod
+    async def get_binary_instance(cls) -> redis.Redis:
+        """
+        Get a redis instance returning raw bytes, for binary serializers
+        """
+        if cls._binary_instance is None:
+            async with cls._lock:
+                if cls._binary_instance is None:
+                    cls._binary_instance = await redis.Redis.from_pool(
+                        redis.ConnectionPool.from_url(cls._url())
+                    )
+        return cls._binary_instance
@@ -0,0 +1,116 @@
+"""Serializers turning cached values into what Redis stores"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+RAW = "raw"
+JSON = "json"
+ORJSON = "orjson"
+MSGPACK = "msgpack"
+
+
+class Serializer(ABC):
+    """Encode values before they are stored and decode them when read.
+
+    `binary` serializers produce bytes, so their Redis client must not
+    decode responses.
+    """
+
+    binary = False
+
+    @abstractmethod
+    def dumps(self, value: Any) -> Union[str, bytes]:
+        """Encode a value."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a stored value."""
+
+        raise NotImplementedError
+
+
+class RawSerializer(Serializer):
+    """Store values as given, Redis reads them back as strings."""
+
+    def dumps(self, value: Any) -> Any:
+        return value
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return data
+
+
+class JsonSerializer(Serializer):
+    """Store values as JSON text."""
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """Store values as JSON encoded by orjson."""
+
+    binary = True
+
+    def __init__(self):
+        if orjson is None:
+            raise ValueError(
+                "The orjson serializer needs the orjson package, install "
+                "the orjson extra"
+            )
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """Store values as MessagePack."""
+
+    binary = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError(
+                "The msgpack serializer needs the msgpack package, install "
+                "the msgpack extra"
+            )
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS: Dict[str, Type[Serializer]] = {
+    RAW: RawSerializer,
+    JSON: JsonSerializer,
+    ORJSON: OrjsonSerializer,
+    MSGPACK: MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """Return a serializer by its configured name."""
+    serializer = SERIALIZERS.get(name)
+    if serializer is None:
+        raise ValueError(f"Unsupported cache serializer: {name}")
+    return serializer()
@@ -0,0 +1,257 @@
+"""Two tier cache, an in-process LRU in front of Redis"""
+
+import asyncio
+import json
+import uuid
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+)
+
+from loguru import logger
+
+from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+_LOCAL_HITS = CACHE_REQUESTS.labels("local", "hit")
+_LOCAL_MISSES = CACHE_REQUESTS.labels("local", "miss")
+_REMOTE_HITS = CACHE_REQUESTS.labels("redis", "hit")
+_REMOTE_MISSES = CACHE_REQUESTS.labels("redis", "miss")
+
+
+class TieredCache(Cache):
+    """
+    Serve reads from a bounded in-process LRU tier before Redis.
+
+    Writes and deletes go to Redis, drop the local entries and publish the
+    keys on `channel`; every worker listens on it and drops them from its
+    own local tier, so a stale entry lives at most until the message
+    arrives or `ttl` expires. Entries are kept locally no longer than the
+    timeout they have left in Redis, and not at all until the subscription
+    is confirmed. Concurrent misses on a key share one Redis round trip,
+    and concurrent `get_or_set` calls share one loader run. Hits and misses
+    of both tiers are counted in the `cache_requests_total` metric.
+    """
+
+    def __init__(
+        self,
+        remote: Cache,
+        redis_client,
+        maxsize: int = 10000,
+        ttl: Optional[float] = 60,
+        channel: str = "cache_invalidation",
+    ):
+        self.remote = remote
+        self.redis_client = redis_client
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.channel = channel
+        self.node_id = uuid.uuid4().hex
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # Bumped by every invalidation so a Redis read that raced with one
+        # is not stored locally
+        self._generation = 0
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
+
+    async def get(self, key: str) -> Any:
+        """Return a value from the local tier, else from Redis."""
+        self._ensure_listener()
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            _LOCAL_HITS.inc()
+            return value
+        _LOCAL_MISSES.inc()
+        return await self._single_flight(key, lambda: self._get_remote(key))
+
+    async def set(self, key: str, value: Any, timeout=None):
+        """Write a value to Redis and invalidate the key on every worker."""
+        await self.remote.set(key, value, timeout)
+        await self._invalidate([key])
+
+    async def delete(self, key: str):
+        """Delete a key from Redis and from every worker's local tier."""
+        result = await self.remote.delete(key)
+        await self._invalidate([key])
+        return result
+
+    async def exists(self, key: str):
+        """Check if a key exists in Redis."""
+        return await self.remote.exists(key)
+
+    async def keys(self, prefix: str) -> List[str]:
+        """List the keys in Redis starting with a prefix."""
+        return await self.remote.keys(prefix)
+
+    async def add(self, key: str, value: Any, timeout=None) -> bool:
+        """Set a key in Redis only if it is absent."""
+        added = await self.remote.add(key, value, timeout)
+        if added:
+            await self._invalidate([key])
+        return added
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return local values, fetching the others in one Redis call."""
+        self._ensure_listener()
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                values[key] = value
+        _LOCAL_HITS.inc(len(values))
+        _LOCAL_MISSES.inc(len(missing))
+        if not missing:
+            return values
+        generation = self._generation
+        found = await self.remote.get_many_with_ttl(missing)
+        _REMOTE_HITS.inc(len(found))
+        _REMOTE_MISSES.inc(len(missing) - len(found))
+        store = self._subscribed and generation == self._generation
+        for key, (value, remaining) in found.items():
+            if store:
+                self._set_local(key, value, remaining)
+            values[key] = value
+        return values
+
+    async def set_many(self, mapping: Dict[str, Any], timeout=None) -> None:
+        """Write several values and invalidate them with one message."""
+        await self.remote.set_many(mapping, timeout)
+        await self._invalidate(list(mapping))
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete several keys and invalidate them with one message."""
+        keys = list(keys)
+        result = await self.remote.delete_many(keys)
+        await self._invalidate(keys)
+        return result
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """Add to a counter in Redis, counters are not kept locally."""
+        result = await self.remote.incr(key, amount)
+        await self._invalidate([key])
+        return result
+
+    async def delete_by_prefix(self, prefix: str) -> int:
+        """Delete the keys starting with a prefix on every tier."""
+        result = await self.remote.delete_by_prefix(prefix)
+        await self._invalidate(prefix=prefix)
+        return result
+
+    async def get_or_set(
+        self, key: str, loader: Callable[[], Awaitable[Any]], timeout=None
+    ) -> Any:
+        """Return the cached value of a key, loading it once if missing."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        return await self._single_flight(
+            ("load", key), lambda: Cache.get_or_set(self, key, loader, timeout)
+        )
+
+    async def close(self) -> None:
+        """Stop listening for invalidations."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _get_remote(self, key: str) -> Any:
+        generation = self._generation
+        value, remaining = await self.remote.get_with_ttl(key)
+        if value is None:
+            _REMOTE_MISSES.inc()
+            return None
+        _REMOTE_HITS.inc()
+        if self._subscribed and generation == self._generation:
+            self._set_local(key, value, remaining)
+        return value
+
+    def _set_local(self, key: str, value: Any, remaining: Optional[float]):
+        # A key expiring in Redis must not outlive it locally
+        ttl = self.local.ttl
+        if remaining is not None:
+            ttl = remaining if ttl is None else min(ttl, remaining)
+        self.local.set(key, value, ttl)
+
+    async def _single_flight(
+        self, key: Hashable, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await load()
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here so waiter-less failures are not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _invalidate(
+        self, keys: Iterable[str] = (), prefix: Optional[str] = None
+    ) -> None:
+        self._evict(keys, prefix)
+        await self.redis_client.publish(
+            self.channel,
+            json.dumps(
+                {"node": self.node_id, "keys": list(keys), "prefix": prefix}
+            ),
+        )
+
+    def _evict(self, keys: Iterable[str], prefix: Optional[str]) -> None:
+        self._generation += 1
+        for key in keys:
+            self.local.delete(key)
+        if prefix is not None:
+            self.local.delete_prefix(prefix)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        if self._listener is not None:
+            # Invalidations may have been missed while disconnected
+            self._subscribed = False
+            self.local.clear()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    self._subscribed = True
+                    continue
+                if message["type"] != "message":
+                    continue
+                data = json.loads(message["data"])
+                if data["node"] != self.node_id:
+                    self._evict(data["keys"], data["prefix"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener stopped: {e}")
+        finally:
+            self._subscribed = False
+            self.local.clear()
+            await pubsub.aclose()
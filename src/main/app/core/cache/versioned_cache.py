@@ -0,0 +1,64 @@
+"""In-process LRU cache whose entries are tied to table write versions"""
+
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.mapper import table_version
+
+
+class VersionedCache:
+    """Bounded LRU cache with a TTL, invalidated by writes to its tables.
+
+    Each entry remembers the write versions of `tables` taken before its
+    value was loaded. A mapper write to any of them bumps a version, so the
+    entry no longer matches and is dropped on the next lookup.
+    """
+
+    def __init__(self, tables: Iterable[str], ttl: int, maxsize: int = 1024):
+        self.tables = tuple(tables)
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (table versions, value)
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def versions(self) -> Tuple[int, ...]:
+        """Return the current write versions of the watched tables."""
+        return tuple(table_version.get_version(table) for table in self.tables)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the live value of a key, None if missing or stale."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        versions, value = entry
+        if versions != self.versions():
+            self._entries.delete(key)
+            return None
+        return value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        versions: Optional[Tuple[int, ...]] = None,
+    ) -> None:
+        """Store a value.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            versions: The table versions read before loading the value, the
+                current ones if None. Passing them drops values that were
+                loaded while a write happened.
+        """
+        if versions is None:
+            versions = self.versions()
+        self._entries.set(key, (versions, value))
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a key if present."""
+        self._entries.delete(key)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
@@ -1,6 +1,6 @@
 """Database configuration for the application."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from src.main.app.core.utils import alembic_config_util
 from src.main.app.core.utils.alembic_config_util import get_sqlite_db_path
@@ -21,6 +21,28 @@ class DatabaseConfig:
         db_num: int,
         dialect: str = None,
         url: Optional[str] = None,
+        count_strategy: str = "exact",
+        count_cache_ttl: int = 60,
+        count_estimate_threshold: int = 10000,
+        insert_batch_size: int = 1000,
+        replica_urls: str = "",
+        replica_weights: str = "",
+        replica_health_interval: int = 10,
+        replica_max_lag: float = 5,
+        local_cache_size: int = 10000,
+        local_cache_ttl: int = 60,
+        cache_invalidation_channel: str = "cache_invalidation",
+        cache_serializer: str = "raw",
+        page_cache_size: int = 10000,
+        page_cache_dir: str = "",
+        page_cache_disk_limit: int = 1073741824,
+        cached_ttl: int = 300,
+        pool_timeout: int = 30,
+        statement_cache_size: int = 500,
+        engine_options: Optional[Dict[str, Dict]] = None,
+        sql_profile: bool = False,
+        sql_profile_slowest: int = 3,
+        sql_n_plus_one_threshold: int = 3,
     ) -> None:
         """
         Initializes database configuration.
@@ -38,6 +60,42 @@ class DatabaseConfig:
             cache_port: Redis port number.
             cache_pass: Redis password.
             db_num: Redis database number.
+            count_strategy: How paginated totals are counted (exact,
+                estimated or cached).
+            count_cache_ttl: Seconds a cached total stays valid.
+            count_estimate_threshold: Estimated totals below this value are
+                replaced by an exact count.
+            insert_batch_size: Rows sent per round trip by batch inserts.
+            replica_urls: Comma separated urls of read replicas.
+            replica_weights: Comma separated weights of the replicas in the
+                same order, 1 for missing ones.
+            replica_health_interval: Seconds between replica health checks.
+            replica_max_lag: Seconds replicas may lag behind the primary,
+                for as long after a write @cached reads from the primary.
+            local_cache_size: Entries kept in the in-process tier in front
+                of Redis, 0 disables the tier.
+            local_cache_ttl: Seconds an entry stays in the in-process tier,
+                also in front of a persistent page cache.
+            cache_invalidation_channel: Redis pub/sub channel the workers
+                evict their in-process entries from.
+            cache_serializer: How Redis values are encoded, raw, json,
+                orjson or msgpack. The last two need the extras of the
+                same name.
+            page_cache_size: Entries kept in memory by the page cache used
+                without Redis.
+            page_cache_dir: Directory of a persistent page cache tier
+                shared by the processes, empty keeps it in memory only.
+            page_cache_disk_limit: Bytes the persistent tier may use.
+            cached_ttl: Default seconds a result cached by @cached lives.
+            pool_timeout: Seconds a checkout waits for a pooled connection.
+            statement_cache_size: Compiled statements cached per engine.
+            engine_options: Engine options by dialect name, e.g. postgresql,
+                overriding the pool settings above for that dialect.
+            sql_profile: Whether to profile the statements of each request,
+                sent in a Server-Timing header and logged.
+            sql_profile_slowest: Slowest statements logged per request.
+            sql_n_plus_one_threshold: Runs of one statement shape within a
+                request from which it is logged as a likely N+1.
         """
         if dialect is None or len(dialect.strip()) == 0:
             dialect = alembic_config_util.get_db_dialect()
@@ -58,6 +116,28 @@ class DatabaseConfig:
         self.cache_port = cache_port
         self.cache_pass = cache_pass
         self.db_num = db_num
+        self.count_strategy = count_strategy
+        self.count_cache_ttl = count_cache_ttl
+        self.count_estimate_threshold = count_estimate_threshold
+        self.insert_batch_size = insert_batch_size
+        self.replica_urls = replica_urls
+        self.replica_weights = replica_weights
+        self.replica_health_interval = replica_health_interval
+        self.replica_max_lag = replica_max_lag
+        self.local_cache_size = local_cache_size
+        self.local_cache_ttl = local_cache_ttl
+        self.cache_invalidation_channel = cache_invalidation_channel
+        self.cache_serializer = cache_serializer
+        self.page_cache_size = page_cache_size
+        self.page_cache_dir = page_cache_dir
+        self.page_cache_disk_limit = page_cache_disk_limit
+        self.cached_ttl = cached_ttl
+        self.pool_timeout = pool_timeout
+        self.statement_cache_size = statement_cache_size
+        self.engine_options = engine_options or {}
+        self.sql_profile = sql_profile
+        self.sql_profile_slowest = sql_profile_slowest
+        self.sql_n_plus_one_threshold = sql_n_plus_one_threshold
 
     def __str__(self) -> str:
         """
@@ -13,6 +13,16 @@ class SecurityConfig:
         white_list_routes: str,
         backend_cors_origins: str,
         black_ip_list: str,
+        permission_cache_ttl: int = 300,
+        permission_cache_size: int = 10000,
+        token_cache_size: int = 10000,
+        token_denylist_capacity: int = 100000,
+        token_denylist_error_rate: float = 0.001,
+        token_denylist_sync_interval: int = 5,
+        password_hash_scheme: str = "bcrypt",
+        password_hash_workers: int = 2,
+        password_hash_max_queue: int = 1000,
+        bcrypt_rounds: int = 12,
     ) -> None:
         """
         Initializes security configuration.
@@ -27,6 +37,21 @@ class SecurityConfig:
             white_list_routes: Comma-separated list of routes which can be accessed without authentication.
             backend_cors_origins: Comma-separated list of allowed CORS origins.
             black_ip_list: Comma-separated list of blocked IP addresses.
+            permission_cache_ttl: Seconds resolved user permissions stay cached.
+            permission_cache_size: Max number of users whose permissions are cached.
+            token_cache_size: Max number of verified tokens kept decoded.
+            token_denylist_capacity: Revoked tokens the local Bloom filter is
+                sized for.
+            token_denylist_error_rate: False positive rate of the filter.
+            token_denylist_sync_interval: Seconds between polls for tokens
+                revoked by other processes.
+            password_hash_scheme: Scheme of new password hashes, bcrypt or
+                argon2id (needs argon2-cffi). Older hashes are replaced on
+                login.
+            password_hash_workers: Threads hashing passwords.
+            password_hash_max_queue: Hashes allowed to wait for a thread
+                before logins are refused as busy, 0 for no limit.
+            bcrypt_rounds: Cost factor of bcrypt hashes.
         """
         self.enable = enable
         self.enable_swagger = enable_swagger
@@ -37,6 +62,16 @@ class SecurityConfig:
         self.white_list_routes = white_list_routes
         self.backend_cors_origins = backend_cors_origins
         self.black_ip_list = black_ip_list
+        self.permission_cache_ttl = permission_cache_ttl
+        self.permission_cache_size = permission_cache_size
+        self.token_cache_size = token_cache_size
+        self.token_denylist_capacity = token_denylist_capacity
+        self.token_denylist_error_rate = token_denylist_error_rate
+        self.token_denylist_sync_interval = token_denylist_sync_interval
+        self.password_hash_scheme = password_hash_scheme
+        self.password_hash_workers = password_hash_workers
+        self.password_hash_max_queue = password_hash_max_queue
+        self.bcrypt_rounds = bcrypt_rounds
 
     def __str__(self) -> str:
         """
@@ -17,6 +17,18 @@ class ServerConfig:
         linux_tz: str,
         enable_rate_limit: bool,
         global_default_limits: str,
+        export_spool_dir: str = "",
+        export_max_workers: int = 2,
+        export_job_ttl: int = 3600,
+        snowflake_datacenter_id: int = 0,
+        snowflake_worker_id: int = -1,
+        snowflake_lease_ttl: int = 60,
+        metrics_multiproc_dir: str = "",
+        log_queue_size: int = 10000,
+        log_rotation_bytes: int = 10485760,
+        log_retention_days: int = 30,
+        access_log_sample_rate: float = 1.0,
+        access_log_slow_ms: int = 1000,
     ) -> None:
         """
         Initializes server configuration.
@@ -35,6 +47,25 @@ class ServerConfig:
             linux_tz: Linux timezone setting.
             enable_rate_limit: Whether to enable rate limiting.
             global_default_limits: Global rate limit setting.
+            export_spool_dir: Directory export jobs write their files to,
+                a directory under the system temp dir if empty.
+            export_max_workers: Max number of export jobs running at once.
+            export_job_ttl: Seconds a finished export job and its file are kept.
+            snowflake_datacenter_id: Datacenter ID of snowflake IDs, 0..31.
+            snowflake_worker_id: Worker ID of snowflake IDs, 0..31, or -1 to
+                lease a free one through Redis.
+            snowflake_lease_ttl: Seconds a leased worker ID is held unless
+                renewed.
+            metrics_multiproc_dir: Directory the workers share their metrics
+                through, a directory under the system temp dir if empty.
+            log_queue_size: Max number of records waiting for the log
+                writer, records logged while it is full are dropped.
+            log_rotation_bytes: Size the log file is rotated and zipped at.
+            log_retention_days: Days zipped log files are kept.
+            access_log_sample_rate: Fraction of successful requests written
+                to the access log, 0..1.
+            access_log_slow_ms: Milliseconds from which a request is always
+                written to the access log, as are server errors.
         """
         self.host = host
         self.name = name
@@ -49,6 +80,18 @@ class ServerConfig:
         self.linux_tz = linux_tz
         self.enable_rate_limit = enable_rate_limit
         self.global_default_limits = global_default_limits
+        self.export_spool_dir = export_spool_dir
+        self.export_max_workers = export_max_workers
+        self.export_job_ttl = export_job_ttl
+        self.snowflake_datacenter_id = snowflake_datacenter_id
+        self.snowflake_worker_id = snowflake_worker_id
+        self.snowflake_lease_ttl = snowflake_lease_ttl
+        self.metrics_multiproc_dir = metrics_multiproc_dir
+        self.log_queue_size = log_queue_size
+        self.log_rotation_bytes = log_rotation_bytes
+        self.log_retention_days = log_retention_days
+        self.access_log_sample_rate = access_log_sample_rate
+        self.access_log_slow_ms = access_log_slow_ms
 
     def __str__(self) -> str:
         """
@@ -5,6 +5,7 @@ from .constant import (
     ENV,
     CONFIG_FILE,
     AUTHORIZATION,
+    TOKEN_CLAIMS,
     CONFIG_FILE_NAME,
     FilterOperators,
 )
@@ -14,6 +15,7 @@ __all__ = [
     "ENV",
     "CONFIG_FILE",
     "AUTHORIZATION",
+    "TOKEN_CLAIMS",
     "CONFIG_FILE_NAME",
     FilterOperators,
 ]
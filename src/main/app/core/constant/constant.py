@@ -9,6 +9,8 @@ RESOURCE_DIR: str = os.path.abspath(
 ENV = "env"
 CONFIG_FILE = "config_file"
 AUTHORIZATION = "Authorization"
+# Request state key of the claims verified by the JWT middleware
+TOKEN_CLAIMS = "token_claims"
 CONFIG_FILE_NAME = "config.yml"
 MAX_PAGE_SIZE = 1000
 ROOT_PARENT_ID = 0
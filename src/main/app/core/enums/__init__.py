@@ -1,7 +1,15 @@
 """Enum for the application"""
 
 from .base_error_code import CustomExceptionCode
-from .enum import SortEnum, TokenTypeEnum, DBTypeEnum, MediaTypeEnum
+from .enum import (
+    SortEnum,
+    TokenTypeEnum,
+    DBTypeEnum,
+    MediaTypeEnum,
+    CountStrategyEnum,
+    ExportTypeEnum,
+    ExportJobStatusEnum,
+)
 
 __all__ = [
     CustomExceptionCode,
@@ -9,4 +17,7 @@ __all__ = [
     TokenTypeEnum,
     DBTypeEnum,
     MediaTypeEnum,
+    CountStrategyEnum,
+    ExportTypeEnum,
+    ExportJobStatusEnum,
 ]
@@ -28,6 +28,30 @@ class DBTypeEnum(str, Enum):
     SQLITE = "sqlite"
 
 
+class CountStrategyEnum(str, Enum):
+    """Enumeration for total count strategies of paginated queries."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class ExportTypeEnum(str, Enum):
+    """Enumeration for file formats of data exports."""
+
+    XLSX = "xlsx"
+    CSV = "csv"
+
+
+class ExportJobStatusEnum(str, Enum):
+    """Enumeration for states of background export jobs."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
 class MediaTypeEnum(str, Enum):
     """Enumeration for media/content types."""
 
@@ -38,3 +62,6 @@ class CommonErrorCode(CustomExceptionCode):
     """Error codes for core domain."""
 
     INTERNAL_SERVER_ERROR = (-1, "Internal server exception")
+    INVALID_CURSOR = (-2, "Invalid pagination cursor")
+    UNSUPPORTED_UPSERT = (-3, "Upsert is not supported by the database")
+    SERVER_BUSY = (-4, "Server is busy, please retry later")
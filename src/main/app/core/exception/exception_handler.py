@@ -1,8 +1,6 @@
 """Exception handlers module for FastAPI application."""
 
 import http
-import textwrap
-import traceback
 from typing import Dict, Any, Optional
 
 from pydantic_core._pydantic_core import ValidationError  # noqa
@@ -22,56 +20,6 @@ from src.main.app.core.exception import CustomException
 config = load_config()
 
 
-async def extract_request_data(request: Request) -> Dict[str, Any]:
-    """
-    Extract request data based on content type.
-
-    Args:
-        request: The FastAPI request object
-
-    Returns:
-        Dictionary containing parsed request data
-    """
-    data = {}
-
-    # Try to get request data based on content type
-    content_type = request.headers.get("content-type", "")
-
-    try:
-        if "application/json" in content_type:
-            data["json"] = await request.json()
-        elif (
-            "application/x-www-form-urlencoded" in content_type
-            or "multipart/form-data" in content_type
-        ):
-            # Get form data but exclude files
-            form = await request.form()
-            form_data = {}
-            for key, value in form.items():
-                # Check if it's a file upload (UploadFile instance)
-                if not hasattr(value, "filename"):  # Not a file
-                    form_data[key] = value
-                else:
-                    # Record that a file was present but not included
-                    form_data[key] = f"<file: {value.filename}>"
-
-            if form_data:
-                data["form"] = form_data
-        else:
-            # Get raw body
-            body = await request.body()
-            if body:
-                # Try to decode as string, if fails save as binary indicator
-                try:
-                    data["body"] = body.decode("utf-8")
-                except UnicodeDecodeError:
-                    data["body"] = f"<binary: {len(body)} bytes>"
-    except Exception as e:
-        data["error"] = f"Failed to parse request data: {str(e)}"
-
-    return data
-
-
 def collect_request_info(request: Request) -> Dict[str, Any]:
     """
     Collect comprehensive request information for logging.
@@ -86,7 +34,8 @@ def collect_request_info(request: Request) -> Dict[str, Any]:
         "path": request.url.path,
         "method": request.method,
         "query_params": dict(request.query_params),
-        "headers": dict(request.headers),
+        "content_type": request.headers.get("content-type"),
+        "content_length": request.headers.get("content-length"),
         "client": f"{request.client.host}:{request.client.port}"
         if request.client
         else None,
@@ -101,14 +50,9 @@ def log_exception(exc: Exception, request_info: Dict[str, Any]) -> None:
         exc: The exception that was raised
         request_info: Dictionary containing request information
     """
-    logger.error(
-        textwrap.dedent(f"""\
-    Unhandled exception,
-    exception_type: {type(exc).__name__},
-    exception_message: {str(exc)},
-    traceback: {traceback.format_exc()},
-    request: {request_info},
-    """)
+    # The traceback is formatted by the log writer, off the event loop
+    logger.opt(exception=exc).bind(request=request_info).error(
+        f"Unhandled exception {type(exc).__name__}: {exc}"
     )
 
 
@@ -165,17 +109,9 @@ async def global_exception_handler(
     Returns:
         Response object with appropriate error information
     """
-    # Collect request information
+    # Collect request information, the body is not read again
     request_info = collect_request_info(request)
 
-    # Get request data
-    try:
-        request_data = await extract_request_data(request)
-        if request_data:
-            request_info["data"] = request_data
-    except Exception as e:
-        request_info["data_error"] = str(e)
-
     # Log the exception with context
     log_exception(exc, request_info)
 
@@ -1,7 +1,17 @@
 """BaseMapper defines the database operations to be implemented"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -33,27 +43,42 @@ class BaseMapper(ABC, Generic[ModelType]):
         self,
         *,
         data_list: List[ModelType],
+        batch_size: Optional[int] = None,
+        returning: bool = False,
+        upsert: bool = False,
+        conflict_keys: Optional[List[str]] = None,
+        update_fields: Optional[List[str]] = None,
         db_session: Optional[AsyncSession] = None,
-    ) -> int:
-        """Insert data list into the database in a single operation.
+    ) -> Union[int, List[IDType]]:
+        """Insert data list into the database in batches.
 
         Args:
             data_list: List of data to insert
+            batch_size: Rows sent per round trip, configured if None
+            returning: Whether to return the IDs of the written rows
+            upsert: Whether to update the existing row on a key conflict
+            conflict_keys: Columns of the conflicting unique key
+            update_fields: Columns overwritten on conflict
             db_session: Optional async database session
 
         Returns:
-            Number of data list successfully inserted
+            Number of data list successfully inserted, or their IDs
         """
         raise NotImplementedError
 
     @abstractmethod
     async def select_by_id(
-        self, *, id: IDType, db_session: Optional[AsyncSession] = None
+        self,
+        *,
+        id: IDType,
+        use_primary: bool = False,
+        db_session: Optional[AsyncSession] = None,
     ) -> Optional[ModelType]:
         """Select a single record by its ID.
 
         Args:
             id: The ID of the record to select
+            use_primary: Read from the primary instead of a replica
             db_session: Optional async database session
 
         Returns:
@@ -63,12 +88,17 @@ class BaseMapper(ABC, Generic[ModelType]):
 
     @abstractmethod
     async def select_by_ids(
-        self, *, ids: List[IDType], db_session: Optional[AsyncSession] = None
+        self,
+        *,
+        ids: List[IDType],
+        use_primary: bool = False,
+        db_session: Optional[AsyncSession] = None,
     ) -> List[ModelType]:
         """Select record list by their IDs.
 
         Args:
             ids: List of IDs to select
+            use_primary: Read from the primary instead of a replica
             db_session: Optional async database session
 
         Returns:
@@ -82,6 +112,7 @@ class BaseMapper(ABC, Generic[ModelType]):
         *,
         current: IDType,
         page_size: int,
+        use_primary: bool = False,
         db_session: Optional[AsyncSession] = None,
         **kwargs,
     ) -> Tuple[List[ModelType], int]:
@@ -90,6 +121,7 @@ class BaseMapper(ABC, Generic[ModelType]):
         Args:
             current: Current page number (1-based)
             page_size: Number of data_list per page
+            use_primary: Read from the primary instead of a replica
             db_session: Optional async database session
             **kwargs: Additional filter criteria
 
@@ -105,6 +137,8 @@ class BaseMapper(ABC, Generic[ModelType]):
         current: IDType,
         page_size: int,
         sort: List[SortItem] = None,
+        cursor: Optional[str] = None,
+        use_primary: bool = False,
         db_session: Optional[AsyncSession] = None,
         **kwargs,
     ) -> Tuple[List[ModelType], int]:
@@ -114,6 +148,8 @@ class BaseMapper(ABC, Generic[ModelType]):
             current: Current page number (1-based)
             page_size: Number of record list per page
             sort: Sorting specification in the format[{"field": "field1", "sort": "asc"}]
+            cursor: Optional keyset cursor, switches from OFFSET to seek paging
+            use_primary: Read from the primary instead of a replica
             db_session: Optional async database session
             **kwargs: Additional filter criteria
 
@@ -129,6 +165,7 @@ class BaseMapper(ABC, Generic[ModelType]):
         current: IDType,
         page_size: int,
         sort: List[SortItem] = None,
+        use_primary: bool = False,
         db_session: Optional[AsyncSession] = None,
         **kwargs,
     ) -> Tuple[List[ModelType], int]:
@@ -138,6 +175,7 @@ class BaseMapper(ABC, Generic[ModelType]):
             current: Current page number (1-based)
             page_size: Number of record list per page
             sort: Sorting specification in the format[{"field": "field1", "sort": "asc"}]
+            use_primary: Read from the primary instead of a replica
             db_session: Optional async database session
             **kwargs: Additional filter criteria
 
@@ -146,6 +184,33 @@ class BaseMapper(ABC, Generic[ModelType]):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def select_stream(
+        self,
+        *,
+        ids: Optional[List[IDType]] = None,
+        sort_list: List[SortItem] = None,
+        chunk_size: int = 1000,
+        use_primary: bool = False,
+        db_session: Optional[AsyncSession] = None,
+        **kwargs,
+    ) -> AsyncIterator[List[ModelType]]:
+        """Stream filtered, sorted record list in chunks from a server-side cursor.
+
+        Args:
+            ids: Optional list of IDs to restrict the records to
+            sort_list: Sorting specification in the format[{"field": "field1", "order": "asc"}]
+            chunk_size: Number of records fetched and yielded at a time
+            use_primary: Read from the primary instead of a replica
+            db_session: Optional async database session. If None, a dedicated
+                session is opened for the lifetime of the stream.
+            **kwargs: Additional filter criteria
+
+        Returns:
+            Async iterator over lists of at most chunk_size records
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update_by_id(
         self, *, data: ModelType, db_session: Optional[AsyncSession] = None
@@ -181,6 +246,26 @@ class BaseMapper(ABC, Generic[ModelType]):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def bulk_update(
+        self,
+        *,
+        data_list: List[Union[ModelType, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        db_session: Optional[AsyncSession] = None,
+    ) -> List[int]:
+        """Update record list by their IDs, each with its own values.
+
+        Args:
+            data_list: Partial data to update, each containing the ID
+            batch_size: Items per statement, configured if None
+            db_session: Optional async database session
+
+        Returns:
+            Number of records updated per item (0 or 1), in input order
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def delete_by_id(
         self, *, id: IDType, db_session: Optional[AsyncSession] = None
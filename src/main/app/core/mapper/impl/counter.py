@@ -0,0 +1,244 @@
+"""Total count strategies for paginated queries"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.dialects.mysql.base import MySQLDialect
+from sqlalchemy.dialects.postgresql.base import PGDialect
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.config import config_manager
+from src.main.app.core.enums import CountStrategyEnum, DBTypeEnum
+from src.main.app.core.mapper import table_version
+
+# Compile EXPLAIN statements with named parameters text() binds again, the
+# driver dialects may render positional ones or bind casts
+_EXPLAIN_DIALECTS = {
+    DBTypeEnum.PGSQL.value: PGDialect(paramstyle="named"),
+    DBTypeEnum.MYSQL.value: MySQLDialect(paramstyle="named"),
+}
+
+
+class RowCount(int):
+    """A row count that records whether it is exact or an estimate."""
+
+    exact: bool = True
+
+    def __new__(cls, value: int, exact: bool = True) -> "RowCount":
+        row_count = super().__new__(cls, value)
+        row_count.exact = exact
+        return row_count
+
+
+def is_exact(total: int) -> bool:
+    """Return whether a total, e.g. of a page, was counted exactly."""
+    return getattr(total, "exact", True)
+
+
+class Counter(ABC):
+    """Count the rows matched by a filtered select."""
+
+    @abstractmethod
+    async def count(
+        self,
+        *,
+        query,
+        db_session: AsyncSession,
+        params: Optional[Dict[str, Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> RowCount:
+        """Return the number of rows `query` selects with `params` bound.
+
+        `key` identifies the statement of `query` when given, e.g. its
+        filter shape, so it need not be compiled to be told apart.
+        """
+        raise NotImplementedError
+
+
+class ExactCounter(Counter):
+    """SELECT count(*) over the filtered query."""
+
+    async def count(
+        self,
+        *,
+        query,
+        db_session: AsyncSession,
+        params: Optional[Dict[str, Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> RowCount:
+        count_query = select(func.count()).select_from(query.subquery())
+        count_result = await db_session.exec(count_query, params=params)
+        return RowCount(count_result.all()[0])
+
+
+class EstimatedCounter(Counter):
+    """Read the row estimate from planner statistics.
+
+    Unfiltered queries use the table statistics (`pg_class.reltuples`,
+    `information_schema.TABLES.TABLE_ROWS`), filtered ones the row estimate
+    of EXPLAIN. Dialects without statistics, failed lookups and estimates
+    below `threshold` fall back to an exact count, which the returned
+    count records. Lookups run in a savepoint, so a failed one leaves the
+    transaction usable for the fallback.
+    """
+
+    def __init__(self, threshold: int, exact_counter: Counter):
+        self.threshold = threshold
+        self.exact_counter = exact_counter
+
+    async def count(
+        self,
+        *,
+        query,
+        db_session: AsyncSession,
+        params: Optional[Dict[str, Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> RowCount:
+        estimate: Optional[int] = None
+        dialect = db_session.get_bind().dialect
+        if dialect.name in (DBTypeEnum.PGSQL.value, DBTypeEnum.MYSQL.value):
+            try:
+                # A failed statement aborts a PostgreSQL transaction
+                async with db_session.begin_nested():
+                    estimate = await self._estimate(
+                        query.params(params or {}), dialect, db_session
+                    )
+            except Exception as e:
+                logger.warning(f"Row estimate failed, counting exactly: {e}")
+        if estimate is None or estimate < self.threshold:
+            return await self.exact_counter.count(
+                query=query, db_session=db_session, params=params, key=key
+            )
+        return RowCount(estimate, exact=False)
+
+    async def _estimate(
+        self, query, dialect, db_session: AsyncSession
+    ) -> Optional[int]:
+        table_name = query.get_final_froms()[0].name
+        if dialect.name == DBTypeEnum.PGSQL.value:
+            if query.whereclause is None:
+                statement = text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = CAST(:table_name AS regclass)"
+                )
+                result = await db_session.exec(
+                    statement, params={"table_name": table_name}
+                )
+                reltuples = result.scalar()
+                # -1 means the table has never been analyzed
+                return reltuples if reltuples and reltuples >= 0 else None
+            plan = await self._explain(
+                "EXPLAIN (FORMAT JSON) ", query, dialect, db_session
+            )
+            return int(plan[0]["Plan"]["Plan Rows"])
+        if dialect.name == DBTypeEnum.MYSQL.value:
+            if query.whereclause is None:
+                statement = text(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() "
+                    "AND TABLE_NAME = :table_name"
+                )
+                result = await db_session.exec(
+                    statement, params={"table_name": table_name}
+                )
+                return result.scalar()
+            plan = await self._explain(
+                "EXPLAIN FORMAT=JSON ", query, dialect, db_session
+            )
+            table = plan["query_block"].get("table", {})
+            rows = table.get("rows_produced_per_join")
+            return int(rows) if rows is not None else None
+        return None
+
+    @staticmethod
+    async def _explain(prefix: str, query, dialect, db_session: AsyncSession):
+        compiled = query.compile(dialect=_EXPLAIN_DIALECTS[dialect.name])
+        result = await db_session.exec(
+            text(prefix + str(compiled)), params=compiled.params
+        )
+        plan = result.scalar()
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+
+class CachedCounter(Counter):
+    """Exact counts memoized per table version and filter fingerprint.
+
+    Entries expire after `ttl` seconds and are dropped as soon as a mapper
+    writes to the table, since the table version is part of the key.
+    Queries counted without a key are compiled to be fingerprinted.
+    """
+
+    def __init__(self, ttl: int, exact_counter: Counter, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.exact_counter = exact_counter
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def fingerprint(
+        query,
+        params: Optional[Dict[str, Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> Tuple:
+        """Identify a query by its table version, key or SQL and values."""
+        table_name = query.get_final_froms()[0].name
+        bound_params = params or {}
+        if key is None:
+            compiled = query.compile()
+            key = str(compiled)
+            bound_params = {**compiled.params, **bound_params}
+        return (
+            table_name,
+            table_version.get_version(table_name),
+            key,
+            repr(sorted(bound_params.items())),
+        )
+
+    async def count(
+        self,
+        *,
+        query,
+        db_session: AsyncSession,
+        params: Optional[Dict[str, Any]] = None,
+        key: Optional[Hashable] = None,
+    ) -> RowCount:
+        fingerprint = self.fingerprint(query, params, key)
+        total = self._entries.get(fingerprint)
+        if total is not None:
+            return total
+
+        total = await self.exact_counter.count(
+            query=query, db_session=db_session, params=params, key=key
+        )
+        self._entries.set(fingerprint, total)
+        return total
+
+
+_counter_map: Dict[CountStrategyEnum, Counter] = {}
+
+
+def get_counter(strategy: Optional[CountStrategyEnum] = None) -> Counter:
+    """Return the shared counter of a strategy, the configured one if None."""
+    database_config = config_manager.load_database_config()
+    strategy = CountStrategyEnum(strategy or database_config.count_strategy)
+    if strategy not in _counter_map:
+        exact_counter = ExactCounter()
+        if strategy == CountStrategyEnum.ESTIMATED:
+            counter = EstimatedCounter(
+                threshold=database_config.count_estimate_threshold,
+                exact_counter=exact_counter,
+            )
+        elif strategy == CountStrategyEnum.CACHED:
+            counter = CachedCounter(
+                ttl=database_config.count_cache_ttl,
+                exact_counter=exact_counter,
+            )
+        else:
+            counter = exact_counter
+        _counter_map[strategy] = counter
+    return _counter_map[strategy]
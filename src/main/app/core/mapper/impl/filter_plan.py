@@ -0,0 +1,140 @@
+"""Compiled filter plans shared by the paging methods of SqlModelMapper.
+
+The FilterOperators dict passed to the paging methods is reduced to its shape,
+the operators and columns used, and every shape is compiled once into a select
+whose values are bound parameters. Repeat shapes reuse the same statement
+objects, so neither the expression tree nor its SQLAlchemy cache key has to be
+rebuilt, and the compiled SQL is served from the engine's statement cache.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+from sqlalchemy import bindparam
+from sqlmodel import SQLModel, select
+
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.constant import FilterOperators
+
+# Operators in the order their conditions are applied
+OPERATORS: Tuple[str, ...] = (
+    FilterOperators.EQ,
+    FilterOperators.NE,
+    FilterOperators.GT,
+    FilterOperators.GE,
+    FilterOperators.LT,
+    FilterOperators.LE,
+    FilterOperators.BETWEEN,
+    FilterOperators.LIKE,
+)
+
+# Statements derived from one plan, e.g. one per sort specification
+DERIVED_MAXSIZE = 64
+
+# (operator, column, is_null) triples
+FilterShape = Tuple[Tuple[str, str, bool], ...]
+
+
+def get_filter_shape(filters: Dict[str, Any]) -> FilterShape:
+    """Return the hashable shape of a FilterOperators dict."""
+    shape = []
+    for operator in OPERATORS:
+        for column, value in sorted((filters.get(operator) or {}).items()):
+            shape.append((operator, column, value is None))
+    return tuple(shape)
+
+
+def _param_name(operator: str, column: str) -> str:
+    return f"{operator.lower()}_{column}"
+
+
+class FilterPlan:
+    """A filtered select of one filter shape with bound parameter values.
+
+    At most `derived_maxsize` derived statements are kept, the least
+    recently used are rebuilt when requested again.
+    """
+
+    def __init__(
+        self,
+        model: Type[SQLModel],
+        shape: FilterShape,
+        derived_maxsize: int = DERIVED_MAXSIZE,
+    ):
+        self.shape = shape
+        conditions = []
+        for operator, column_name, is_null in shape:
+            column = getattr(model, column_name)
+            name = _param_name(operator, column_name)
+            if operator == FilterOperators.EQ:
+                conditions.append(
+                    column.is_(None) if is_null else column == bindparam(name)
+                )
+            elif operator == FilterOperators.NE:
+                conditions.append(
+                    column.is_not(None)
+                    if is_null
+                    else column != bindparam(name)
+                )
+            elif operator == FilterOperators.GT:
+                conditions.append(column > bindparam(name))
+            elif operator == FilterOperators.GE:
+                conditions.append(column >= bindparam(name))
+            elif operator == FilterOperators.LT:
+                conditions.append(column < bindparam(name))
+            elif operator == FilterOperators.LE:
+                conditions.append(column <= bindparam(name))
+            elif operator == FilterOperators.BETWEEN:
+                conditions.append(
+                    column.between(
+                        bindparam(f"{name}_start"), bindparam(f"{name}_end")
+                    )
+                )
+            elif operator == FilterOperators.LIKE:
+                conditions.append(column.like(bindparam(name)))
+        self.statement = select(model).where(*conditions)
+        self._derived = LRUCache(maxsize=derived_maxsize)
+
+    def bind(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the values of a FilterOperators dict to the plan parameters."""
+        params = {}
+        for operator, column, is_null in self.shape:
+            if is_null:
+                continue
+            value = filters[operator][column]
+            name = _param_name(operator, column)
+            if operator == FilterOperators.BETWEEN:
+                params[f"{name}_start"], params[f"{name}_end"] = value
+            else:
+                params[name] = value
+        return params
+
+    def derive(self, key: Hashable, builder: Callable[[Any], Any]):
+        """Return a statement derived from the filtered select, built once.
+
+        Args:
+            key: Identifies the derivation, e.g. the sort specification.
+            builder: Called with the filtered select on the first request.
+        """
+        statement = self._derived.get(key)
+        if statement is None:
+            statement = builder(self.statement)
+            self._derived.set(key, statement)
+        return statement
+
+
+class FilterPlanCache:
+    """LRU cache of the filter plans of one model."""
+
+    def __init__(self, model: Type[SQLModel], maxsize: int = 256):
+        self.model = model
+        self.maxsize = maxsize
+        self._plans = LRUCache(maxsize=maxsize)
+
+    def get(self, filters: Dict[str, Any]) -> Tuple[FilterPlan, Dict[str, Any]]:
+        """Return the plan of a FilterOperators dict and its parameters."""
+        shape = get_filter_shape(filters)
+        plan: Optional[FilterPlan] = self._plans.get(shape)
+        if plan is None:
+            plan = FilterPlan(self.model, shape)
+            self._plans.set(shape, plan)
+        return plan, plan.bind(filters)
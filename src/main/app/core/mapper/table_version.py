@@ -0,0 +1,157 @@
+"""Per-table write versions used to invalidate in-process caches.
+
+Every mapper write bumps the version of its table immediately, so the same
+request reads its own writes, and once more after the transaction commits
+or rolls back, so entries rebuilt from not yet committed data in between
+are dropped too. Caches patching in only the rows modified since their
+last refresh reload in full after a rollback, see `get_rollbacks`. Once
+shared, committed bumps are published to the other
+workers, which bump their own versions of the tables.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+DIRTY_TABLES = "dirty_tables"
+# Committed tables the other workers have not been told about yet
+COMMITTED_TABLES = "committed_tables"
+
+_versions: Dict[str, int] = defaultdict(int)
+_rollbacks: Dict[str, int] = defaultdict(int)
+_node_id = uuid.uuid4().hex
+_redis_client = None
+_channel: Optional[str] = None
+_listener: Optional[asyncio.Task] = None
+
+
+def get_version(table_name: str) -> int:
+    """Return the current write version of a table."""
+    return _versions[table_name]
+
+
+def bump_version(table_name: str) -> int:
+    """Advance the write version of a table and return the new value."""
+    _versions[table_name] += 1
+    return _versions[table_name]
+
+
+def get_rollbacks(table_name: str) -> int:
+    """
+    Return how many transactions writing to a table were rolled back. The
+    undone rows get their old update time back, an incremental refresh
+    would not read them again.
+    """
+    return _rollbacks[table_name]
+
+
+def mark_dirty(session, table_name: str) -> None:
+    """Record a write to a table made through the given session.
+
+    Args:
+        session: The sync or async session the write was issued on.
+        table_name: Name of the written table.
+    """
+    bump_version(table_name)
+    dirty_tables: Set[str] = session.info.setdefault(DIRTY_TABLES, set())
+    dirty_tables.add(table_name)
+
+
+async def start_sharing(
+    redis_client, channel: str, retry_interval: float = 5
+) -> None:
+    """
+    Share the version bumps of this worker with the others through Redis
+    pub/sub on `channel`, and apply theirs, until `stop_sharing`.
+    """
+    global _redis_client, _channel, _listener
+    await stop_sharing()
+    _redis_client = redis_client
+    _channel = channel
+    _listener = asyncio.create_task(_listen(retry_interval))
+
+
+async def stop_sharing() -> None:
+    """Stop publishing and applying version bumps."""
+    global _redis_client, _channel, _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+    _redis_client = _channel = _listener = None
+
+
+async def publish_versions(table_names: Iterable[str]) -> None:
+    """
+    Tell the other workers to bump the versions of committed tables. A
+    failure is only logged, their entries then live until their TTL.
+    """
+    table_names = list(table_names)
+    if _redis_client is None or not table_names:
+        return
+    # Keys and prefix keep the message readable by the cache listeners
+    message = {
+        "node": _node_id,
+        "keys": [],
+        "prefix": None,
+        "tables": table_names,
+    }
+    try:
+        await _redis_client.publish(_channel, json.dumps(message))
+    except Exception as e:
+        logger.warning(f"Table versions of {table_names} not published: {e}")
+
+
+async def _listen(retry_interval: float) -> None:
+    while True:
+        pubsub = _redis_client.pubsub()
+        try:
+            await pubsub.subscribe(_channel)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    # Bumps may have been missed while not subscribed
+                    for table_name in list(_versions):
+                        bump_version(table_name)
+                    continue
+                if message["type"] != "message":
+                    continue
+                data = json.loads(message["data"])
+                if data["node"] != _node_id:
+                    for table_name in data.get("tables", ()):
+                        bump_version(table_name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Table version listener stopped: {e}")
+        finally:
+            await pubsub.aclose()
+        await asyncio.sleep(retry_interval)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session) -> None:
+    table_names = session.info.pop(DIRTY_TABLES, set())
+    for table_name in table_names:
+        bump_version(table_name)
+    session.info.setdefault(COMMITTED_TABLES, set()).update(table_names)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _bump_rolled_back_tables(session: Session, previous_transaction) -> None:
+    # Entries built from the undone writes must not outlive them. A
+    # savepoint undoes only part of the transaction, the rest still commits
+    if previous_transaction.nested:
+        table_names = session.info.get(DIRTY_TABLES, ())
+    else:
+        table_names = session.info.pop(DIRTY_TABLES, ())
+    for table_name in table_names:
+        bump_version(table_name)
+        _rollbacks[table_name] += 1
@@ -0,0 +1,43 @@
+"""Export the metrics symbols."""
+
+from .metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_STATEMENTS_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    JWT_VERIFY_DURATION,
+    MULTIPROC_DIR_ENV,
+    PASSWORD_HASH_QUEUED,
+    PASSWORD_HASH_RUNNING,
+    UNMATCHED_ROUTE,
+    count_statements,
+    mark_process_dead,
+    render,
+)
+
+__all__ = [
+    CACHE_REQUESTS,
+    CONTENT_TYPE,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_STATEMENTS_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    JWT_VERIFY_DURATION,
+    MULTIPROC_DIR_ENV,
+    PASSWORD_HASH_QUEUED,
+    PASSWORD_HASH_RUNNING,
+    UNMATCHED_ROUTE,
+    count_statements,
+    mark_process_dead,
+    render,
+]
@@ -0,0 +1,129 @@
+"""Prometheus metrics of the request, database, cache and auth hot paths"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Set before the workers start, each then writes its samples to files in
+# this directory and a scrape of any worker sums those of all of them
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+# Requests rejected before routing, e.g. by authentication, or not found
+UNMATCHED_ROUTE = "unmatched"
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    multiprocess_mode="livesum",
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while serving an HTTP request.",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a checkout waited for a pooled connection, opening included.",
+    ["database"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections a pool keeps open.",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Pooled connections in use.",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond the pool size.",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by tier and result, hit or miss.",
+    ["tier", "result"],
+)
+JWT_VERIFY_DURATION = Histogram(
+    "jwt_verify_seconds",
+    "Time to verify a bearer token, denylist check included.",
+    buckets=(0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+PASSWORD_HASH_QUEUED = Gauge(
+    "password_hash_queued",
+    "Password hashes waiting for a hashing thread.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_RUNNING = Gauge(
+    "password_hash_running",
+    "Password hashes being computed.",
+    multiprocess_mode="livesum",
+)
+
+_statements: ContextVar[Optional[List[int]]] = ContextVar(
+    "statements", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(*args) -> None:
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@contextmanager
+def count_statements() -> Iterator[List[int]]:
+    """Count the SQL statements executed in the context, in `counter[0]`."""
+    counter = [0]
+    token = _statements.set(counter)
+    try:
+        yield counter
+    finally:
+        _statements.reset(token)
+
+
+def render() -> bytes:
+    """Return the samples of every worker in the text exposition format."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this worker, on shutdown."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,7 +1,7 @@
 """Export middleware symbols."""
 
 from .db_session_middleware import SQLAlchemyMiddleware, db
-from .jwt_middleware import jwt_middleware
-from .log_middleware import log_requests
+from .jwt_middleware import JWTMiddleware
+from .log_middleware import AccessLogMiddleware
 
-__all__ = [SQLAlchemyMiddleware, jwt_middleware, log_requests, db]
+__all__ = [SQLAlchemyMiddleware, JWTMiddleware, AccessLogMiddleware, db]
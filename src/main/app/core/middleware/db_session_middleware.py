@@ -1,38 +1,123 @@
 """Session proxy used in the project"""
 
+import http
+from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Sequence, Tuple, Union
 
+from loguru import logger
+from sqlalchemy import event
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
-)
 from fastapi_async_sqlalchemy.exceptions import (
     MissingSessionError,
     SessionNotInitialisedError,
 )
-from starlette.requests import Request
-from starlette.types import ASGIApp
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.main.app.core.cache.cache_tags import invalidate_tags
+from src.main.app.core.enums.enum import CommonErrorCode
+from src.main.app.core.mapper import table_version
+from src.main.app.core.mapper.table_version import (
+    COMMITTED_TABLES,
+    DIRTY_TABLES,
+)
+from src.main.app.core.session.replica_router import ReplicaRouter
+from src.main.app.core.session.sql_profiler import log_profile, profile_sql
 
 try:
     from sqlalchemy.ext.asyncio import async_sessionmaker
 except ImportError:
     from sqlalchemy.orm import sessionmaker as async_sessionmaker
 
+HAS_WRITES = "has_writes"
+# Kept after commit, replicas may not have caught up with the write yet
+HAS_WRITTEN = "has_written"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_writes(orm_execute_state: ORMExecuteState) -> None:
+    # Anything but a SELECT may write, e.g. insert, update, delete or text
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES] = True
+        orm_execute_state.session.info[HAS_WRITTEN] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, *args) -> None:
+    session.info[HAS_WRITTEN] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_writes(session: Session, *args) -> None:
+    session.info.pop(HAS_WRITES, None)
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Return whether a session executed or holds changes to commit."""
+    return bool(
+        session.info.get(HAS_WRITES)
+        or session.info.get(DIRTY_TABLES)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+def has_written(session: AsyncSession) -> bool:
+    """Return whether a session wrote anything, committed or not."""
+    return bool(session.info.get(HAS_WRITTEN) or has_writes(session))
+
+
+class _SessionHolder:
+    """Per-context slot that opens its session on first access."""
+
+    __slots__ = ("session_args", "session", "read_session", "active")
+
+    def __init__(self, session_args: Dict):
+        self.session_args = session_args
+        self.session: Optional[AsyncSession] = None
+        self.read_session: Optional[AsyncSession] = None
+        # Tasks copy the context, so the slot may outlive its scope
+        self.active = True
+
 
 def create_middleware_and_session_proxy():
     """Create and return SQLAlchemy middleware and session proxy classes."""
     _Session: Optional[async_sessionmaker] = None
-    _session: ContextVar[Optional[AsyncSession]] = ContextVar(
-        "_session", default=None
+    _router = ReplicaRouter()
+    _holder: ContextVar[Optional[_SessionHolder]] = ContextVar(
+        "_holder", default=None
+    )
+    _primary_pinned: ContextVar[bool] = ContextVar(
+        "_primary_pinned", default=False
     )
 
-    class SQLAlchemyMiddleware(BaseHTTPMiddleware):
-        """Middleware for managing SQLAlchemy sessions in FastAPI applications."""
+    class SQLAlchemyMiddleware:
+        """
+        Pure ASGI middleware providing `db.session` to HTTP requests.
+
+        The session is only opened when a request first uses `db.session`,
+        and committed only if something was written. The commit happens
+        before the response starts, so a failed commit is answered with a
+        500 instead of the success response. Writes made while a body is
+        streamed are committed on exit. Requests whose path starts with one
+        of `exclude_paths` get no session scope at all.
+
+        With `replicas`, given as `(engine, weight)` pairs, `db.read_session`
+        reads from a healthy replica until the request writes through
+        `db.session`, after which reads stay on the primary.
+
+        With `profile_sql` the statements of each request are profiled,
+        sent in a Server-Timing header and logged with the `slowest` ones
+        and those run `n_plus_one_threshold` times or more.
+        """
 
         def __init__(
             self,
@@ -42,10 +127,20 @@ def create_middleware_and_session_proxy():
             engine_args: Dict = None,
             session_args: Dict = None,
             commit_on_exit: bool = True,
+            exclude_paths: Sequence[str] = (),
+            replicas: Sequence[Tuple[AsyncEngine, int]] = (),
+            health_check_interval: float = 10,
+            profile_sql: bool = False,
+            slowest: int = 3,
+            n_plus_one_threshold: int = 3,
         ):
             """Initialize the middleware with database configuration."""
-            super().__init__(app)
+            self.app = app
             self.commit_on_exit = commit_on_exit
+            self.exclude_paths = tuple(exclude_paths)
+            self.profile_sql = profile_sql
+            self.slowest = slowest
+            self.n_plus_one_threshold = n_plus_one_threshold
             engine_args = engine_args or {}
             session_args = session_args or {}
 
@@ -58,7 +153,8 @@ def create_middleware_and_session_proxy():
             else:
                 engine = custom_engine
 
-            nonlocal _Session
+            nonlocal _Session, _router
+            _router = ReplicaRouter(replicas, health_check_interval)
             _Session = async_sessionmaker(
                 engine,
                 class_=AsyncSession,
@@ -66,27 +162,138 @@ def create_middleware_and_session_proxy():
                 **session_args,
             )
 
-        async def dispatch(
-            self, request: Request, call_next: RequestResponseEndpoint
-        ):
+        async def __call__(
+            self, scope: Scope, receive: Receive, send: Send
+        ) -> None:
             """Manage database session for each request."""
-            async with DBSession(commit_on_exit=self.commit_on_exit):
-                return await call_next(request)
+            if scope["type"] != "http" or scope["path"].startswith(
+                self.exclude_paths
+            ):
+                await self.app(scope, receive, send)
+                return
+            if not self.profile_sql:
+                await self._serve(scope, receive, send)
+                return
+
+            profiling = profile_sql(self.slowest, self.n_plus_one_threshold)
+            with profiling as profile:
+
+                async def send_wrapper(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        timing = profile.server_timing().encode()
+                        message = {
+                            **message,
+                            "headers": [
+                                *message.get("headers", ()),
+                                (b"server-timing", timing),
+                            ],
+                        }
+                    await send(message)
+
+                # Statements of the commit on exit are logged, not sent
+                await self._serve(scope, receive, send_wrapper)
+            log_profile(profile, f"{scope['method']} {scope['path']}")
+
+        async def _serve(
+            self, scope: Scope, receive: Receive, send: Send
+        ) -> None:
+            session_scope = DBSession(commit_on_exit=self.commit_on_exit)
+            commit_failed = False
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal commit_failed
+                if commit_failed:
+                    # The response was replaced, drop the rest of its body
+                    return
+                if message["type"] == "http.response.start":
+                    try:
+                        await session_scope.commit()
+                    except Exception as e:
+                        commit_failed = True
+                        logger.opt(exception=e).error(
+                            f"Commit failed, answering {scope['path']} "
+                            f"with a 500"
+                        )
+                        error_code = CommonErrorCode.INTERNAL_SERVER_ERROR
+                        response = JSONResponse(
+                            status_code=http.HTTPStatus.INTERNAL_SERVER_ERROR,
+                            content={
+                                "code": error_code.code,
+                                "msg": error_code.msg,
+                            },
+                        )
+                        await response(scope, receive, send)
+                        return
+                await send(message)
+
+            async with session_scope:
+                await self.app(scope, receive, send_wrapper)
 
     class DBSessionMeta(type):
         """Metaclass for DBSession providing session property."""
 
-        @property
-        def session(self) -> AsyncSession:
-            """Get the current async context session."""
+        @staticmethod
+        def _active_holder() -> _SessionHolder:
             if _Session is None:
                 raise SessionNotInitialisedError
 
-            session = _session.get()
-            if session is None:
+            holder = _holder.get()
+            if holder is None or not holder.active:
                 raise MissingSessionError
+            return holder
+
+        @property
+        def session(self) -> AsyncSession:
+            """Get the current async context session, opening it if needed."""
+            holder = self._active_holder()
+            if holder.session is None:
+                holder.session = _Session(**holder.session_args)
+            return holder.session
+
+        @property
+        def read_session(self) -> AsyncSession:
+            """
+            Get the session for reads of the current async context.
+
+            This is a replica session, or the primary one when there are no
+            healthy replicas, the context already wrote to the primary or
+            reads are pinned to it.
+            """
+            if _primary_pinned.get():
+                return self.session
+            holder = self._active_holder()
+            if holder.session is not None and has_written(holder.session):
+                return holder.session
+
+            if holder.read_session is None:
+                engine = _router.pick()
+                if engine is None:
+                    return self.session
+                holder.read_session = _Session(
+                    bind=engine, **holder.session_args
+                )
+            return holder.read_session
 
-            return session
+        @staticmethod
+        @contextmanager
+        def pin_primary():
+            """Serve `read_session` from the primary within the block."""
+            token = _primary_pinned.set(True)
+            try:
+                yield
+            finally:
+                _primary_pinned.reset(token)
+
+        @property
+        def has_written(self) -> bool:
+            """Whether the current async context wrote to the primary."""
+            holder = _holder.get()
+            return bool(
+                holder is not None
+                and holder.active
+                and holder.session is not None
+                and has_written(holder.session)
+            )
 
     class DBSession(metaclass=DBSessionMeta):
         """Context manager for database sessions."""
@@ -96,6 +303,7 @@ def create_middleware_and_session_proxy():
         ):
             """Initialize session context manager."""
             self.token = None
+            self.holder: Optional[_SessionHolder] = None
             self.session_args = session_args or {}
             self.commit_on_exit = commit_on_exit
 
@@ -104,21 +312,56 @@ def create_middleware_and_session_proxy():
             if not isinstance(_Session, async_sessionmaker):
                 raise SessionNotInitialisedError
 
-            self.token = _session.set(_Session(**self.session_args))  # type: ignore
+            self.holder = _SessionHolder(self.session_args)
+            self.token = _holder.set(self.holder)
+            _router.maybe_check()
             return type(self)
 
         async def __aexit__(self, exc_type, exc_value, traceback):
             """Exit session context, handling commit/rollback."""
-            session = _session.get()
+            holder = self.holder
+            holder.active = False
+            session = holder.session
+            _holder.reset(self.token)
+            if holder.read_session is not None:
+                await holder.read_session.close()
+            if session is None:
+                return
 
             try:
                 if exc_type is not None:
                     await session.rollback()
-                elif self.commit_on_exit:
-                    await session.commit()
+                    # Commits made explicitly before the error still count
+                    await _announce_commits(session)
+                else:
+                    await self.commit()
             finally:
                 await session.close()
-                _session.reset(self.token)
+
+        async def commit(self) -> None:
+            """
+            Commit the writes of the scope's session so far, if committing
+            on exit, rolling back and raising if the commit fails.
+            """
+            session = self.holder.session
+            if session is None:
+                return
+            if self.commit_on_exit and has_writes(session):
+                try:
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+            await _announce_commits(session)
+
+    async def _announce_commits(session: AsyncSession) -> None:
+        tables = tuple(session.info.pop(COMMITTED_TABLES, ()))
+        if not tables:
+            return
+        # Entries cached with the tables' old tag versions are orphaned
+        # only now, reads before could not see the rows
+        await invalidate_tags(*tables)
+        await table_version.publish_versions(tables)
 
     return SQLAlchemyMiddleware, DBSession
 
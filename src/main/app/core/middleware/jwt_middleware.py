@@ -1,15 +1,21 @@
 """JWT middleware for FastAPI authentication"""
 
 import http
+import time
+from typing import FrozenSet
 
-from fastapi import Request
-from jose import JWTError
+from jose import ExpiredSignatureError, JWTError
 from loguru import logger
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.main.app.core import security, constant
 from src.main.app.core.config import config_manager
+from src.main.app.core.enums.base_error_code import CustomExceptionCode
 from src.main.app.core.enums.enum import MediaTypeEnum
+from src.main.app.core.metrics import JWT_VERIFY_DURATION
+from src.main.app.core.security.token_denylist import TokenRevokedError
 from src.main.app.enums.auth_error_code import AuthErrorCode
 
 # Load configuration
@@ -17,63 +23,103 @@ server_config = config_manager.load_server_config()
 security_config = config_manager.load_security_config()
 
 
-async def jwt_middleware(request: Request, call_next):
-    # Check if URL contains API version and is not JSON media type
-    raw_url_path = request.url.path
-    if not raw_url_path.__contains__(
-        server_config.api_version
-    ) or raw_url_path.__contains__(MediaTypeEnum.JSON.value):
-        if security_config.enable_swagger:
-            return await call_next(request)
-        else:
-            return JSONResponse(
-                status_code=http.HTTPStatus.FORBIDDEN,
-                content={
-                    "code": AuthErrorCode.OPENAPI_FORBIDDEN.code,
-                    "msg": AuthErrorCode.OPENAPI_FORBIDDEN.msg,
-                },
-            )
-
-    # Check if route is in whitelist
-    white_list_routes = [
-        router.strip()
-        for router in security_config.white_list_routes.split(",")
-    ]
-    request_url_path = (
-        server_config.api_version
-        + raw_url_path.split(server_config.api_version)[1]
+def compile_white_list(white_list_routes: str) -> FrozenSet[str]:
+    """Parse the comma separated whitelist into a set of routes."""
+    return frozenset(
+        route.strip() for route in white_list_routes.split(",") if route.strip()
     )
-    if request_url_path in white_list_routes:
-        return await call_next(request)
 
-    # Disable jwt parse
-    if not security_config.enable:
-        return await call_next(request)
 
-    # Validate JWT token
-    auth_header = request.headers.get(constant.AUTHORIZATION)
-    if auth_header:
+class JWTMiddleware:
+    """
+    Pure ASGI middleware authenticating API requests by their bearer token.
+
+    The whitelist is compiled once, and each token is decoded once per
+    request through the verified-token cache, then checked against the
+    revoked token denylist. Its claims and user ID are stored in the
+    request state, where `get_current_user` reuses them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.api_version = server_config.api_version
+        self.white_list = compile_white_list(security_config.white_list_routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Check if URL contains API version and is not JSON media type
+        path = scope["path"]
+        start = path.find(self.api_version)
+        if start < 0 or MediaTypeEnum.JSON.value in path:
+            if security_config.enable_swagger:
+                await self.app(scope, receive, send)
+            else:
+                await self._reject(
+                    scope,
+                    receive,
+                    send,
+                    http.HTTPStatus.FORBIDDEN,
+                    AuthErrorCode.OPENAPI_FORBIDDEN,
+                )
+            return
+
+        # Check if route is in whitelist, or jwt parse is disabled
+        if path[start:] in self.white_list or not security_config.enable:
+            await self.app(scope, receive, send)
+            return
+
+        # Validate JWT token
+        auth_header = Headers(scope=scope).get(constant.AUTHORIZATION)
+        if not auth_header:
+            await self._reject(
+                scope,
+                receive,
+                send,
+                http.HTTPStatus.UNAUTHORIZED,
+                AuthErrorCode.MISSING_TOKEN,
+            )
+            return
         try:
-            token = auth_header.split(" ")[-1]
-            security.validate_token(token)
-            user_id = security.get_user_id(token)
-            request.state.user_id = user_id
-        except JWTError as e:
+            claims = await self._verify(auth_header.split(" ")[-1])
+            user_id = int(claims["sub"])
+        except ExpiredSignatureError:
+            error_code = AuthErrorCode.TOKEN_EXPIRED
+        except TokenRevokedError:
+            error_code = AuthErrorCode.TOKEN_REVOKED
+        except (JWTError, KeyError, ValueError) as e:
             logger.error(f"{e}")
-            return JSONResponse(
-                status_code=http.HTTPStatus.UNAUTHORIZED,
-                content={
-                    "code": AuthErrorCode.TOKEN_EXPIRED.code,
-                    "msg": AuthErrorCode.TOKEN_EXPIRED.msg,
-                },
-            )
-    else:
-        return JSONResponse(
-            status_code=http.HTTPStatus.UNAUTHORIZED,
-            content={
-                "code": AuthErrorCode.MISSING_TOKEN.code,
-                "msg": AuthErrorCode.MISSING_TOKEN.msg,
-            },
+            error_code = AuthErrorCode.INVALID_TOKEN
+        else:
+            state = scope.setdefault("state", {})
+            state[constant.TOKEN_CLAIMS] = claims
+            state["user_id"] = user_id
+            await self.app(scope, receive, send)
+            return
+        await self._reject(
+            scope, receive, send, http.HTTPStatus.UNAUTHORIZED, error_code
         )
 
-    return await call_next(request)
+    @staticmethod
+    async def _verify(token: str) -> dict:
+        start = time.perf_counter()
+        try:
+            return await security.verify_token(token)
+        finally:
+            JWT_VERIFY_DURATION.observe(time.perf_counter() - start)
+
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        error_code: CustomExceptionCode,
+    ) -> None:
+        response = JSONResponse(
+            status_code=status_code,
+            content={"code": error_code.code, "msg": error_code.msg},
+        )
+        await response(scope, receive, send)
@@ -1,49 +1,68 @@
-"""FastAPI Request Logging Middleware"""
+"""Access log middleware binding the request context of log records"""
 
+import random
 import time
 import uuid
 
 from loguru import logger
-from fastapi import Request
-
-
-async def log_requests(request: Request, call_next):
-    """Middleware to log all incoming requests and responses"""
-    # Generate unique request ID
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-
-    # Log request start information
-    start_time = time.time()
-
-    # Request started log
-    logger.info(
-        f"Request started - {request.method} {request.url.path} "
-        f"(ID: {request_id}, IP: {request.client.host if request.client else None}, "
-        f"UA: {request.headers.get('user-agent')})"
-    )
-
-    try:
-        response = await call_next(request)
-    except Exception as exc:
-        # Log exception information
-        logger.error(
-            f"Request failed - {request.method} {request.url.path} "
-            f"(ID: {request_id}, Error: {str(exc)})",
-            exc_info=True,
-        )
-        raise
-
-    # Calculate processing time
-    process_time = round((time.time() - start_time) * 1000, 2)
-
-    # Request completed log
-    logger.info(
-        f"Request completed - {request.method} {request.url.path} "
-        f"(ID: {request_id}, Status: {response.status_code}, "
-        f"Time: {process_time}ms)"
-    )
-
-    # Add request ID to response headers
-    response.headers["X-Request-ID"] = request_id
-    return response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.main.app.core.utils.log_util import bind_request, unbind_request
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI middleware giving each request an ID, returned in the
+    `X-Request-ID` header, and writing a sampled access log.
+
+    The request is bound once, so every record logged while serving it
+    carries its request_id, user_id and route template. Access lines of
+    successful requests are sampled at `sample_rate`, those of server
+    errors and of requests slower than `slow_ms` are always written.
+    """
+
+    def __init__(
+        self, app: ASGIApp, sample_rate: float = 1.0, slow_ms: float = 1000
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode()),
+                ]
+            await send(message)
+
+        token = bind_request(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if (
+                status_code >= 500
+                or duration_ms >= self.slow_ms
+                or random.random() < self.sample_rate
+            ):
+                logger.bind(
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status_code,
+                    duration_ms=round(duration_ms, 2),
+                ).info(f"{scope['method']} {scope['path']} {status_code}")
+        # Left bound on errors, which the server error handler outside logs
+        unbind_request(token)
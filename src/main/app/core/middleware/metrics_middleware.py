@@ -0,0 +1,55 @@
+"""Metrics middleware recording the latency and outcome of requests"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.main.app.core.metrics import (
+    DB_STATEMENTS_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    UNMATCHED_ROUTE,
+    count_statements,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting HTTP requests by route template and
+    status code, and observing their latency and SQL statement count.
+
+    Routes are labelled by their template, e.g. `/v1/user/{id}`, so the
+    number of series stays bounded. Requests answered before routing, such
+    as rejected tokens or unknown paths, are labelled `unmatched`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            with count_statements() as statements:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+            DB_STATEMENTS_PER_REQUEST.observe(statements[0])
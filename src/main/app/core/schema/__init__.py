@@ -1,6 +1,25 @@
 """Export the core schemas' symbols."""
 
 from .response import HttpResponse
-from .schema import Token, CurrentUser, BasePage, SortItem, PageResult
+from .schema import (
+    Token,
+    CurrentUser,
+    BasePage,
+    SortItem,
+    PageResult,
+    ExportJob,
+    ImportRowError,
+    ImportResult,
+)
 
-__all__ = [HttpResponse, Token, CurrentUser, BasePage, SortItem, PageResult]
+__all__ = [
+    HttpResponse,
+    Token,
+    CurrentUser,
+    BasePage,
+    SortItem,
+    PageResult,
+    ExportJob,
+    ImportRowError,
+    ImportResult,
+]
@@ -1,9 +1,12 @@
 """Common schema with data validation."""
 
+from datetime import datetime
 from typing import List, Any, Optional
 
 from pydantic import BaseModel
 
+from src.main.app.core.enums import ExportJobStatusEnum, ExportTypeEnum
+
 
 class PageResult(BaseModel):
     """Paginated query result container.
@@ -11,10 +14,16 @@ class PageResult(BaseModel):
     Attributes:
         records: List of items in current page (default: None)
         total: Total number of items across all pages (default: 0)
+        total_exact: False when total is a planner estimate
+        next_cursor: Cursor of the following page in keyset mode
+        prev_cursor: Cursor of the preceding page in keyset mode
     """
 
     records: List[Any] = None
     total: int = 0
+    total_exact: bool = True
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class Token(BaseModel):
@@ -64,9 +73,69 @@ class BasePage(BaseModel):
         current: Current page number (1-based).
         page_size: Number of items per page.
         count: Flag to request total count of items.
+        sort_str: JSON encoded list of sort items.
+        cursor: Opaque keyset cursor. When set (an empty string requests the
+            first page), `current` is ignored and rows are located by seeking
+            past the cursor position instead of using OFFSET.
     """
 
     current: int = 1
     page_size: int = 10
     count: bool = False
     sort_str: Optional[str] = None
+    cursor: Optional[str] = None
+
+
+class ExportJob(BaseModel):
+    """State of a background export job.
+
+    Attributes:
+        job_id: Unique identifier of the job.
+        status: Current state of the job.
+        file_name: Download file name of the export.
+        export_type: Output format of the export.
+        owner_id: ID of the user who submitted the job.
+        row_count: Number of exported rows, set once the job succeeded.
+        error: Failure message, set once the job failed.
+        create_time: Time the job was submitted.
+        finish_time: Time the job succeeded or failed.
+    """
+
+    job_id: str
+    status: ExportJobStatusEnum = ExportJobStatusEnum.PENDING
+    file_name: str
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX
+    owner_id: Optional[int] = None
+    row_count: Optional[int] = None
+    error: Optional[str] = None
+    create_time: datetime
+    finish_time: Optional[datetime] = None
+
+
+class ImportRowError(BaseModel):
+    """Validation failure of one imported row.
+
+    Attributes:
+        row: Row number in the uploaded sheet, the header being row 1.
+        err_msg: Validation error message of the row.
+    """
+
+    row: int
+    err_msg: str
+
+
+class ImportResult(BaseModel):
+    """Outcome of an Excel or CSV import.
+
+    Rows are only saved when every row is valid, otherwise nothing is saved
+    and `errors` lists all failing rows.
+
+    Attributes:
+        row_count: Number of non-blank rows read.
+        success_count: Number of rows saved.
+        errors: Validation failures of all invalid rows.
+    """
+
+    row_count: int = 0
+    success_count: int = 0
+    errors: List[ImportRowError] = []
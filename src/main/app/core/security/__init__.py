@@ -3,9 +3,14 @@
 from .security import (
     get_oauth2_scheme,
     decode_jwt_token,
+    decode_token,
+    verify_token,
+    revoke_token,
+    claim_token,
     get_current_user,
     create_token,
     verify_password,
+    password_needs_rehash,
     get_password_hash,
     validate_token,
     get_user_id,
@@ -14,9 +19,14 @@ from .security import (
 __all__ = [
     get_oauth2_scheme,
     decode_jwt_token,
+    decode_token,
+    verify_token,
+    revoke_token,
+    claim_token,
     get_current_user,
     create_token,
     verify_password,
+    password_needs_rehash,
     get_password_hash,
     validate_token,
     get_user_id,
@@ -0,0 +1,179 @@
+"""Password hashing run in a bounded thread pool off the event loop"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+import bcrypt
+
+from src.main.app.core.enums.enum import CommonErrorCode
+from src.main.app.core.exception import CustomException
+from src.main.app.core.metrics import (
+    PASSWORD_HASH_QUEUED,
+    PASSWORD_HASH_RUNNING,
+)
+
+try:
+    import argon2
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    argon2 = None
+
+BCRYPT = "bcrypt"
+ARGON2ID = "argon2id"
+ARGON2_PREFIX = "$argon2"
+# bcrypt only reads the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+T = TypeVar("T")
+# States of a job, a queued one is either run or abandoned by its caller
+_QUEUED = "queued"
+_RUNNING = "running"
+_ABANDONED = "abandoned"
+
+
+class _Job:
+    __slots__ = ("function", "args", "state")
+
+    def __init__(self, function: Callable, args: tuple):
+        self.function = function
+        self.args = args
+        self.state = _QUEUED
+
+
+class PasswordHasher:
+    """
+    Hash and verify passwords with bcrypt or argon2id.
+
+    A hash costs hundreds of milliseconds of CPU, so it runs in a pool of
+    `workers` threads, both libraries release the GIL while hashing. Calls
+    beyond the busy workers wait in the pool queue; once `max_queue` calls
+    are waiting new ones fail fast with SERVER_BUSY, 0 means unbounded.
+    Hashes of either scheme verify, `needs_rehash` tells whether a stored
+    hash should be replaced by one of the configured scheme.
+    """
+
+    def __init__(
+        self,
+        scheme: str = BCRYPT,
+        workers: int = 2,
+        max_queue: int = 0,
+        bcrypt_rounds: int = 12,
+    ):
+        if scheme not in (BCRYPT, ARGON2ID):
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        if scheme == ARGON2ID and argon2 is None:
+            raise ValueError(
+                "argon2id needs the argon2-cffi package, install the argon2 "
+                "extra"
+            )
+        self.scheme = scheme
+        self.workers = workers
+        self.max_queue = max_queue
+        self.bcrypt_rounds = bcrypt_rounds
+        self._argon2 = argon2.PasswordHasher() if argon2 is not None else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def hash(self, password: str) -> str:
+        """Return a hash of the password in the configured scheme."""
+        return await self._submit(self._hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """Return whether the password matches a bcrypt or argon2 hash."""
+        return await self._submit(self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Return whether a hash is of another scheme or cost than configured."""
+        if hashed.startswith(ARGON2_PREFIX):
+            return self.scheme != ARGON2ID or self._argon2.check_needs_rehash(
+                hashed
+            )
+        if self.scheme != BCRYPT:
+            return True
+        # $2b$12$... carries the cost after the second dollar sign
+        return hashed[4:6] != f"{self.bcrypt_rounds:02d}"
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue depth and throughput counters of the pool."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queued,
+                "running": self._running,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    async def _submit(self, function: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self._rejected += 1
+                raise CustomException(CommonErrorCode.SERVER_BUSY)
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+        PASSWORD_HASH_QUEUED.inc()
+        job = _Job(function, args)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._run, job)
+        finally:
+            # A caller cancelled before its job started leaves the queue,
+            # the job is then skipped
+            if self._dequeue(job, _ABANDONED):
+                PASSWORD_HASH_QUEUED.dec()
+
+    def _dequeue(self, job: _Job, state: str) -> bool:
+        with self._lock:
+            if job.state != _QUEUED:
+                return False
+            job.state = state
+            self._queued -= 1
+            if state == _RUNNING:
+                self._running += 1
+            return True
+
+    def _run(self, job: _Job):
+        if not self._dequeue(job, _RUNNING):
+            return None
+        PASSWORD_HASH_QUEUED.dec()
+        PASSWORD_HASH_RUNNING.inc()
+        try:
+            return job.function(*job.args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            PASSWORD_HASH_RUNNING.dec()
+
+    def _hash(self, password: str) -> str:
+        if self.scheme == ARGON2ID:
+            return self._argon2.hash(password)
+        return bcrypt.hashpw(
+            password.encode()[:BCRYPT_MAX_BYTES],
+            bcrypt.gensalt(self.bcrypt_rounds),
+        ).decode()
+
+    def _verify(self, password: str, hashed: str) -> bool:
+        if hashed.startswith(ARGON2_PREFIX):
+            if self._argon2 is None:
+                raise ValueError("argon2 hashes need the argon2-cffi package")
+            try:
+                return self._argon2.verify(hashed, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        try:
+            return bcrypt.checkpw(
+                password.encode()[:BCRYPT_MAX_BYTES], hashed.encode()
+            )
+        except ValueError:
+            return False
@@ -12,28 +12,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License."""Authentication utilities for FastAPI application."""
 
+import uuid
 from functools import wraps
 from datetime import datetime, timedelta
 from typing import Any, Optional, Callable, Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import ExpiredSignatureError, JWTError, jwt
-from passlib.context import CryptContext
 
 from src.main.app.core.config.config_manager import load_config
+from src.main.app.core.constant import TOKEN_CLAIMS
+from src.main.app.core.enums import TokenTypeEnum
 from src.main.app.core.schema import CurrentUser
+from src.main.app.core.security.password_hasher import PasswordHasher
+from src.main.app.core.security.token_cache import TokenCache
+from src.main.app.core.security.token_denylist import (
+    TokenDenylist,
+    TokenRevokedError,
+)
 
 # Configuration
 config = load_config()
 security_config = config.security
 server_config = config.server
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = PasswordHasher(
+    scheme=security_config.password_hash_scheme,
+    workers=security_config.password_hash_workers,
+    max_queue=security_config.password_hash_max_queue,
+    bcrypt_rounds=security_config.bcrypt_rounds,
+)
+token_cache = TokenCache(security_config.token_cache_size)
+token_denylist = TokenDenylist(
+    capacity=security_config.token_denylist_capacity,
+    error_rate=security_config.token_denylist_error_rate,
+    sync_interval=security_config.token_denylist_sync_interval,
+)
 
 
-def decode_jwt_token(token: str) -> dict[str, Any]:
-    """Decode and validate JWT token.
+def decode_token(token: str) -> dict[str, Any]:
+    """Decode a JWT token, reusing the claims of recently verified ones.
 
     Args:
         token: JWT token string
@@ -42,14 +61,84 @@ def decode_jwt_token(token: str) -> dict[str, Any]:
         Decoded token payload
 
     Raises:
-        HTTPException: If token is invalid or expired
+        ExpiredSignatureError: If the token has expired
+        JWTError: If the token is invalid
     """
-    try:
-        return jwt.decode(
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(
             token,
             security_config.secret_key,
             algorithms=[security_config.algorithm],
         )
+        token_cache.set(token, claims)
+    return claims
+
+
+async def verify_token(
+    token: str, token_type: TokenTypeEnum = TokenTypeEnum.access
+) -> dict[str, Any]:
+    """Decode a JWT token and check its type and that it was not revoked.
+
+    Args:
+        token: JWT token string
+        token_type: The expected token type
+
+    Returns:
+        Decoded token payload
+
+    Raises:
+        ExpiredSignatureError: If the token has expired
+        TokenRevokedError: If the token was revoked
+        JWTError: If the token is invalid or of another type
+    """
+    claims = decode_token(token)
+    if claims.get("type") != token_type.value:
+        raise JWTError(f"Expected a {token_type.value} token")
+    if await token_denylist.is_revoked(claims.get("jti")):
+        raise TokenRevokedError("Token has been revoked")
+    return claims
+
+
+async def revoke_token(claims: dict[str, Any]) -> None:
+    """Revoke a decoded token until it expires.
+
+    Args:
+        claims: Decoded token payload
+    """
+    if claims.get("jti") is not None:
+        await token_denylist.revoke(claims["jti"], claims["exp"])
+
+
+async def claim_token(claims: dict[str, Any]) -> bool:
+    """Revoke a decoded single-use token, unless it was revoked already.
+
+    Args:
+        claims: Decoded token payload
+
+    Returns:
+        Whether this call revoked the token, tokens without a JTI cannot
+        be revoked and always succeed
+    """
+    if claims.get("jti") is None:
+        return True
+    return await token_denylist.claim(claims["jti"], claims["exp"])
+
+
+def decode_jwt_token(token: str) -> dict[str, Any]:
+    """Decode and validate JWT token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        Decoded token payload
+
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    try:
+        return decode_token(token)
     except ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -77,15 +166,20 @@ def get_current_user() -> Callable[[], CurrentUser]:
         CurrentUser instance
     """
 
-    def current_user(
+    async def current_user(
+        request: Request,
         access_token: str = Depends(get_oauth2_scheme()),
     ) -> CurrentUser:
         security = load_config().security
         if not security.enable:
             user_id = 1
             return CurrentUser(user_id=user_id)
+        # Claims already verified by the JWT middleware for this request
+        claims = request.scope.get("state", {}).get(TOKEN_CLAIMS)
         try:
-            user_id = get_user_id(access_token)
+            if claims is None:
+                claims = await verify_token(access_token)
+            user_id = int(claims["sub"])
         except ExpiredSignatureError:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -121,7 +215,12 @@ def create_token(
         expires_delta
         or timedelta(minutes=security_config.refresh_token_expire_minutes)
     )
-    to_encode = {"exp": expire, "sub": str(subject), "type": token_type}
+    to_encode = {
+        "exp": expire,
+        "sub": str(subject),
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+    }
     return jwt.encode(
         to_encode,
         security_config.secret_key,
@@ -129,8 +228,8 @@ def create_token(
     )
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hashed version.
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hashed version in the hashing pool.
 
     Args:
         plain_password: Input password
@@ -139,11 +238,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if passwords match
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash should be replaced by one of the configured scheme.
+
+    Args:
+        hashed_password: Stored hashed password
+
+    Returns:
+        True if the hash uses another scheme or cost
+    """
+    return password_hasher.needs_rehash(hashed_password)
 
 
-def get_password_hash(password: str) -> str:
-    """Generate password hash.
+async def get_password_hash(password: str) -> str:
+    """Generate password hash in the hashing pool.
 
     Args:
         password: Plain text password
@@ -151,7 +262,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return await password_hasher.hash(password)
 
 
 def validate_token(token: str) -> bool:
@@ -0,0 +1,44 @@
+"""In-process LRU cache of verified JWT claims"""
+
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from src.main.app.core.cache.lru_cache import LRUCache
+
+
+class TokenCache:
+    """Bounded LRU cache of tokens whose signature was already verified.
+
+    Entries are keyed by the whole token, so a cached signature is only
+    ever reused with the exact header and payload it was verified for, and
+    each entry lives until the `exp` claim of its token.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        # token -> claims
+        self._entries = LRUCache(maxsize=maxsize)
+        # Sync dependencies run in the threadpool
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the claims of a verified token, None if missing or expired."""
+        with self._lock:
+            return self._entries.get(token)
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Store the claims of a verified token until it expires."""
+        expire_at = claims.get("exp")
+        if expire_at is None or self.maxsize <= 0:
+            return
+        ttl = float(expire_at) - time.time()
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries.set(token, claims, ttl)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
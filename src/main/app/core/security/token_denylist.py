@@ -0,0 +1,148 @@
+"""Denylist of revoked JWT IDs shared through the cache"""
+
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+
+from jose import JWTError
+from loguru import logger
+
+from src.main.app.core.cache.cache import Cache
+from src.main.app.core.cache.cache_manager import get_cache_client
+from src.main.app.core.cache.lru_cache import LRUCache
+from src.main.app.core.utils.bloom_filter import BloomFilter
+
+REVOKED_TOKEN_PREFIX = "revoked_token:"
+DENYLIST_VERSION_KEY = "revoked_token_version"
+
+
+class TokenRevokedError(JWTError):
+    """Raised for a token whose JTI was revoked."""
+
+
+class TokenDenylist:
+    """
+    Revoked token IDs, stored in the cache and mirrored in a Bloom filter.
+
+    Each revoked JTI is a cache key living until its token expires, so the
+    store never outgrows the live tokens. Lookups test the local filter
+    first: for the JTIs it has never seen, i.e. almost every request, no
+    store is touched. Filter hits are revoked tokens, known exactly when
+    revoked by this process, or rare false positives confirmed against the
+    store once and remembered.
+
+    Other processes announce revocations by changing a version key. It is
+    polled in the background every `sync_interval` seconds and a change
+    rebuilds the filter from the store, which also forgets expired JTIs.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5,
+        cache_factory: Callable[[], Awaitable[Cache]] = get_cache_client,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.cache_factory = cache_factory
+        self.bloom = BloomFilter(capacity, error_rate)
+        # jti -> expire timestamp, confirmed revoked until it expires
+        self._revoked = LRUCache(maxsize=capacity)
+        # Filter hits the store found not revoked, valid until a sync
+        self._false_positives: Dict[str, bool] = {}
+        self._cache: Optional[Cache] = None
+        self._version = None
+        self._last_sync = float("-inf")
+        self._sync_task: Optional[asyncio.Task] = None
+
+    async def _get_cache(self) -> Cache:
+        if self._cache is None:
+            self._cache = await self.cache_factory()
+        return self._cache
+
+    async def revoke(self, jti: str, expire_at: float) -> None:
+        """Revoke a token ID until the token expires."""
+        timeout = int(expire_at - time.time()) + 1
+        if timeout <= 0:
+            return
+        cache = await self._get_cache()
+        await cache.set(f"{REVOKED_TOKEN_PREFIX}{jti}", expire_at, timeout)
+        await cache.set(DENYLIST_VERSION_KEY, uuid.uuid4().hex)
+        self._remember(jti, expire_at)
+
+    async def claim(self, jti: str, expire_at: float) -> bool:
+        """
+        Revoke a token ID only if it is not revoked yet, returning whether
+        this call revoked it. Of concurrent claims in any process exactly
+        one succeeds, so a single-use token is accepted once.
+        """
+        timeout = int(expire_at - time.time()) + 1
+        if timeout <= 0:
+            return False
+        cache = await self._get_cache()
+        claimed = await cache.add(
+            f"{REVOKED_TOKEN_PREFIX}{jti}", expire_at, timeout
+        )
+        if claimed:
+            await cache.set(DENYLIST_VERSION_KEY, uuid.uuid4().hex)
+        self._remember(jti, expire_at)
+        return claimed
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        """Return whether a token ID was revoked."""
+        self.maybe_sync()
+        if jti is None or jti not in self.bloom:
+            return False
+        if jti in self._revoked:
+            return True
+        if jti in self._false_positives:
+            return False
+        cache = await self._get_cache()
+        expire_at = await cache.get(f"{REVOKED_TOKEN_PREFIX}{jti}")
+        if expire_at is None:
+            if len(self._false_positives) >= self.capacity:
+                self._false_positives.clear()
+            self._false_positives[jti] = True
+            return False
+        self._remember(jti, float(expire_at))
+        return True
+
+    def _remember(self, jti: str, expire_at: float) -> None:
+        self.bloom.add(jti)
+        self._false_positives.pop(jti, None)
+        ttl = expire_at - time.time()
+        if ttl > 0:
+            self._revoked.set(jti, expire_at, ttl)
+
+    def maybe_sync(self) -> None:
+        """Start a background sync with the store if the last one is due."""
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        self._sync_task = asyncio.create_task(self.sync())
+
+    async def sync(self) -> None:
+        """Rebuild the filter from the store if any process revoked since."""
+        self._last_sync = time.monotonic()
+        try:
+            cache = await self._get_cache()
+            version = await cache.get(DENYLIST_VERSION_KEY)
+            if version == self._version:
+                return
+            keys = await cache.keys(REVOKED_TOKEN_PREFIX)
+            bloom = BloomFilter(max(self.capacity, len(keys)), self.error_rate)
+            for key in keys:
+                bloom.add(key[len(REVOKED_TOKEN_PREFIX) :])
+        except Exception as e:
+            logger.warning(f"Token denylist sync failed: {e}")
+            return
+        # Keep revocations made while the keys were listed
+        for jti in self._revoked.keys():
+            bloom.add(jti)
+        self.bloom = bloom
+        self._false_positives.clear()
+        self._version = version
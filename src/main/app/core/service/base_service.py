@@ -1,11 +1,24 @@
 """Abstract service with common database operations."""
 
 from abc import ABC, abstractmethod
-from typing import List, TypeVar, Generic, Tuple, Dict
-
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from fastapi import UploadFile
+from pydantic import BaseModel
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.main.app.core.schema import SortItem
+from src.main.app.core.schema import ImportResult, SortItem
 
 T = TypeVar("T", bound=SQLModel)
 IDType = TypeVar("IDType", int, str)
@@ -24,6 +37,22 @@ class BaseService(Generic[T], ABC):
         """Save multiple data and return the count saved."""
         ...
 
+    @abstractmethod
+    async def import_data(
+        self,
+        *,
+        file: UploadFile,
+        schema: Type[BaseModel],
+        chunk_size: int = 1000,
+        db_session: Optional[AsyncSession] = None,
+    ) -> ImportResult:
+        """
+        Validate an uploaded Excel or CSV file against `schema` chunk by
+        chunk and batch insert its rows in the current transaction. All row
+        errors are collected; if there are any, nothing is saved.
+        """
+        ...
+
     @abstractmethod
     async def retrieve_by_id(self, *, id: IDType) -> T:
         """Return a record by its ID."""
@@ -65,6 +94,14 @@ class BaseService(Generic[T], ABC):
         """Update multiple records by their IDs."""
         ...
 
+    @abstractmethod
+    async def bulk_modify(
+        self, *, data_list: List[Union[T, Dict[str, Any]]]
+    ) -> List[int]:
+        """Update multiple records by ID, each with its own values, and
+        return the number of records updated per item."""
+        ...
+
     @abstractmethod
     async def remove_by_id(self, *, id: IDType) -> None:
         """Delete a record by its ID."""
@@ -1,11 +1,27 @@
 """Common service impl with frequently db operations"""
 
-from typing import TypeVar, List, Generic, Tuple, Dict
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from fastapi import UploadFile
+from pydantic import BaseModel as SchemaType
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
 from src.main.app.core.model import BaseModel
-from src.main.app.core.schema import SortItem
+from src.main.app.core.schema import ImportResult, ImportRowError, SortItem
 from src.main.app.core.service.base_service import BaseService
+from src.main.app.core.utils import excel_util
+from src.main.app.core.utils.validate_util import ValidateService
 
 T = TypeVar("T", bound=BaseModel)
 M = TypeVar("M", bound=SqlModelMapper)
@@ -22,6 +38,43 @@ class BaseServiceImpl(Generic[M, T], BaseService[T]):
     async def batch_save(self, *, data_list: List[T]) -> int:
         return await self.mapper.batch_insert(data_list=data_list)
 
+    async def import_data(
+        self,
+        *,
+        file: UploadFile,
+        schema: Type[SchemaType],
+        chunk_size: int = excel_util.IMPORT_CHUNK_SIZE,
+        db_session: Optional[AsyncSession] = None,
+    ) -> ImportResult:
+        db_session = db_session or self.mapper.db.session
+        result = ImportResult()
+        # A savepoint, so bad rows only undo the import, not the caller's
+        # other work in the transaction
+        async with db_session.begin_nested() as savepoint:
+            async for row_numbers, records in excel_util.read_import(
+                file.file, file.filename, chunk_size
+            ):
+                result.row_count += len(records)
+                create_list, err_msg = ValidateService.validate_records(
+                    schema, records
+                )
+                result.errors.extend(
+                    ImportRowError(row=row_numbers[index], err_msg=message)
+                    for index, message in err_msg.items()
+                )
+                # Keep validating to report every bad row
+                if result.errors:
+                    continue
+                # Plain dicts, batch_insert validates them into models anyway
+                result.success_count += await self.mapper.batch_insert(
+                    data_list=[create.model_dump() for create in create_list],
+                    db_session=db_session,
+                )
+            if result.errors:
+                await savepoint.rollback()
+                result.success_count = 0
+        return result
+
     async def retrieve_by_id(self, *, id: IDType) -> T:
         return await self.mapper.select_by_id(id=id)
 
@@ -70,6 +123,11 @@ class BaseServiceImpl(Generic[M, T], BaseService[T]):
         if len(ids) != affect_row:
             raise ValueError
 
+    async def bulk_modify(
+        self, *, data_list: List[Union[T, Dict[str, Any]]]
+    ) -> List[int]:
+        return await self.mapper.bulk_update(data_list=data_list)
+
     async def remove_by_id(self, *, id: IDType) -> None:
         affect_row: int = await self.mapper.delete_by_id(id=id)
         if affect_row != 1:
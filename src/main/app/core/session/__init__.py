@@ -1,6 +1,23 @@
 """Export session symbols"""
 
-from .db_engine import get_async_engine
+from .db_engine import (
+    dispose_engines,
+    get_async_engine,
+    get_engine,
+    get_replica_engines,
+    pool_stats,
+)
 from .db_session import db_session
+from .sql_profiler import assert_max_queries, capture_sql, profile_sql
 
-__all__ = [get_async_engine, db_session]
+__all__ = [
+    get_engine,
+    get_async_engine,
+    get_replica_engines,
+    dispose_engines,
+    pool_stats,
+    db_session,
+    profile_sql,
+    capture_sql,
+    assert_max_queries,
+]
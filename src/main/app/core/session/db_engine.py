@@ -1,42 +1,223 @@
 """Thread-safe async SQLAlchemy engine management."""
 
+import json
+import time
 from threading import Lock
-from typing import Dict
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from src.main.app.core.config import config_manager
+from src.main.app.core.config.database_config import DatabaseConfig
+from src.main.app.core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+
+
+class CheckoutWaits:
+    """Running totals of the time spent waiting for pooled connections,
+    also reported to the pool metrics of `database` when it is named."""
+
+    def __init__(self, database: Optional[str] = None):
+        self.database = database
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        if database is not None:
+            self._wait = DB_POOL_CHECKOUT_WAIT.labels(database)
+            self._checked_out = DB_POOL_CHECKED_OUT.labels(database)
+            self._overflow = DB_POOL_OVERFLOW.labels(database)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if self.database is not None:
+            self._wait.observe(seconds)
+
+    def report(self, pool: AsyncAdaptedQueuePool) -> None:
+        if self.database is not None:
+            self._checked_out.set(pool.checkedout())
+            self._overflow.set(max(pool.overflow(), 0))
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waits for a connection,
+    which includes opening one when the pool has none idle."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = CheckoutWaits()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.waits.add(time.perf_counter() - start)
+            self.waits.report(self)
 
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self.waits.report(self)
 
-# Global engine cache with thread safety
+    def recreate(self):
+        # The pool is replaced on dispose and invalidation, keep the totals
+        pool = super().recreate()
+        pool.waits = self.waits
+        return pool
+
+
+# Global engine cache with thread safety, one engine per url and options
 _engine_map: Dict[str, AsyncEngine] = {}
 _lock = Lock()
 
-async_engine: AsyncEngine
+
+def get_engine(
+    url: str, database_config: Optional[DatabaseConfig] = None
+) -> AsyncEngine:
+    """
+    Get or create the engine of a database url, shared by the process.
+
+    Args:
+        url: The database url.
+        database_config: The config of the pool options, the loaded
+            application config if omitted.
+
+    Returns:
+        AsyncEngine: The same engine for the same url and options.
+    """
+    database_config = database_config or config_manager.load_database_config()
+    options = _engine_options(url, database_config)
+    key = json.dumps([str(url), options], sort_keys=True, default=repr)
+    engine = _engine_map.get(key)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engine_map.get(key)
+        if engine is None:
+            engine = create_async_engine(url, **options)
+            if isinstance(engine.pool, TimedQueuePool):
+                database = engine.url.render_as_string(hide_password=True)
+                engine.pool.waits = CheckoutWaits(database)
+                DB_POOL_SIZE.labels(database).set(engine.pool.size())
+            _engine_map[key] = engine
+    return engine
 
 
 def get_async_engine() -> AsyncEngine:
     """
-    Get or create a cached async SQLAlchemy engine with thread-safe initialization.
+    Get or create the cached async SQLAlchemy engine of the primary database.
 
     Returns:
         AsyncEngine: Configured SQLAlchemy async engine based on application config.
     """
-    global async_engine
-    database_config = config_manager.load_config().database
-    if database_config.dialect.lower() == "sqlite":
-        async_engine = create_async_engine(
-            url=database_config.url,
-            echo=database_config.echo_sql,
-            pool_recycle=database_config.pool_recycle,
-            pool_pre_ping=True,
+    database_config = config_manager.load_database_config()
+    return get_engine(database_config.url, database_config)
+
+
+def get_replica_engines() -> List[Tuple[AsyncEngine, int]]:
+    """
+    Get or create the cached async engines of the configured read replicas.
+
+    Returns:
+        List[Tuple[AsyncEngine, int]]: Each replica engine with its weight.
+    """
+    database_config = config_manager.load_database_config()
+    urls = [
+        url.strip()
+        for url in database_config.replica_urls.split(",")
+        if url.strip()
+    ]
+    weights = [
+        int(weight)
+        for weight in database_config.replica_weights.split(",")
+        if weight.strip()
+    ]
+    weights += [1] * (len(urls) - len(weights))
+    return [
+        (get_engine(url, database_config), weight)
+        for url, weight in zip(urls, weights)
+    ]
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled connections of every engine, on shutdown.
+
+    The engines stay registered and open new connections if used again.
+    """
+    with _lock:
+        engines = list(_engine_map.values())
+    for engine in engines:
+        await engine.dispose()
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Report the connection pool usage of every engine.
+
+    Returns:
+        Dict[str, Dict[str, float]]: By url with the password hidden, the
+            pool size, the connections checked out and in overflow, and the
+            number of checkouts with their total and max wait in seconds.
+    """
+    stats = {}
+    with _lock:
+        engines = list(_engine_map.values())
+    for engine in engines:
+        pool = engine.pool
+        entry = stats.setdefault(
+            engine.url.render_as_string(hide_password=True),
+            {
+                "size": 0,
+                "checked_out": 0,
+                "overflow": 0,
+                "checkouts": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+            },
         )
-    else:
-        async_engine = create_async_engine(
-            url=database_config.url,
-            echo=database_config.echo_sql,
+        if isinstance(pool, TimedQueuePool):
+            entry["size"] += pool.size()
+            entry["checked_out"] += pool.checkedout()
+            entry["overflow"] += max(pool.overflow(), 0)
+            entry["checkouts"] += pool.waits.count
+            entry["wait_seconds_total"] += pool.waits.total
+            entry["wait_seconds_max"] = max(
+                entry["wait_seconds_max"], pool.waits.max
+            )
+    return stats
+
+
+def _engine_options(
+    url: str, database_config: DatabaseConfig
+) -> Dict[str, Any]:
+    """Engine options of a url, the dialect's overrides applied last."""
+    parsed_url = make_url(url)
+    options: Dict[str, Any] = {
+        "echo": database_config.echo_sql,
+        "pool_recycle": database_config.pool_recycle,
+        "pool_pre_ping": database_config.pool_pre_ping,
+        "query_cache_size": database_config.statement_cache_size,
+    }
+    pool_class = parsed_url.get_dialect(_is_async=True).get_pool_class(
+        parsed_url
+    )
+    # Single connection pools, e.g. of in-memory SQLite, take no sizing
+    if issubclass(pool_class, AsyncAdaptedQueuePool):
+        options.update(
+            poolclass=TimedQueuePool,
             pool_size=database_config.pool_size,
             max_overflow=database_config.max_overflow,
-            pool_recycle=database_config.pool_recycle,
-            pool_pre_ping=True,
+            pool_timeout=database_config.pool_timeout,
         )
-    return async_engine
+    options.update(
+        database_config.engine_options.get(parsed_url.get_backend_name(), {})
+    )
+    return options
@@ -2,10 +2,10 @@
 
 from contextlib import asynccontextmanager
 
-from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.main.app.core.config import config_manager
+from src.main.app.core.session.db_engine import get_engine
 
 try:
     from sqlalchemy.ext.asyncio import async_sessionmaker
@@ -17,14 +17,18 @@ except ImportError:
 async def db_session(
     *, env: str = None, db_url: str = None, engine=None
 ) -> AsyncSession:
-    """Creates a context with an open SQLAlchemy async session."""
+    """
+    Creates a context with an open SQLAlchemy async session.
+
+    Without an `engine` the shared engine of the url is used, its pooled
+    connections outlive the context.
+    """
     if engine is None:
         if db_url is None:
             db_url = config_manager.get_database_url(env=env)
-        engine = create_async_engine(db_url, echo=True)
+        engine = get_engine(db_url)
     async_session = async_sessionmaker(
         bind=engine, class_=AsyncSession, autocommit=False, autoflush=True
     )
     async with async_session() as session:
         yield session
-    await engine.dispose()
@@ -0,0 +1,100 @@
+"""Weighted round-robin routing of reads over healthy replicas."""
+
+import asyncio
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class Replica:
+    """A replica engine with its weight and last known health."""
+
+    __slots__ = ("engine", "weight", "current_weight", "healthy")
+
+    def __init__(self, engine: AsyncEngine, weight: int = 1):
+        self.engine = engine
+        self.weight = max(weight, 1)
+        self.current_weight = 0
+        self.healthy = True
+
+
+class ReplicaRouter:
+    """
+    Pick replicas with smooth weighted round-robin.
+
+    Replicas answering `SELECT 1` unsuccessfully are skipped until a later
+    health check sees them recover. Checks run in the background at most
+    once per `health_check_interval` seconds, triggered by `maybe_check`.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Tuple[AsyncEngine, int]] = (),
+        health_check_interval: float = 10,
+        health_check_timeout: float = 2,
+    ):
+        self.replicas: List[Replica] = [
+            Replica(engine, weight) for engine, weight in replicas
+        ]
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._last_check = time.monotonic()
+        self._check_task: Optional[asyncio.Task] = None
+
+    def pick(self) -> Optional[AsyncEngine]:
+        """Return the next healthy replica engine, or None if there is none."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        total = 0
+        chosen = healthy[0]
+        for replica in healthy:
+            replica.current_weight += replica.weight
+            total += replica.weight
+            if replica.current_weight > chosen.current_weight:
+                chosen = replica
+        chosen.current_weight -= total
+        return chosen.engine
+
+    def maybe_check(self) -> None:
+        """Start a background health check if the last one is due."""
+        if not self.replicas or (
+            self._check_task is not None and not self._check_task.done()
+        ):
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.health_check_interval:
+            return
+        self._last_check = now
+        self._check_task = asyncio.create_task(self.check_health())
+
+    async def check_health(self) -> None:
+        """Probe every replica and record whether it answered."""
+        await asyncio.gather(
+            *(self._check(replica) for replica in self.replicas)
+        )
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            await asyncio.wait_for(
+                self._ping(replica.engine), self.health_check_timeout
+            )
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(
+                    f"Replica {replica.engine.url!r} marked unhealthy: {e}"
+                )
+            replica.healthy = False
+            replica.current_weight = 0
+        else:
+            if not replica.healthy:
+                logger.info(f"Replica {replica.engine.url!r} is healthy again")
+            replica.healthy = True
+
+    @staticmethod
+    async def _ping(engine: AsyncEngine) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
@@ -0,0 +1,192 @@
+"""SQL statement profiling of requests and query budgets for tests"""
+
+import heapq
+import itertools
+import json
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_START = "sql_profiler_start"
+# Bound parameter styles of the supported drivers: ?, %s, $1::TYPE, :name
+_PARAM = r"(?:\?|%s|\$\d+(?:::\w+)?|:\w+|%\(\w+\)s)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_profile: ContextVar[Optional["SqlProfile"]] = ContextVar(
+    "sql_profile", default=None
+)
+# Profiles recording the statements of every context, see capture_sql
+_captures: List["SqlProfile"] = []
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so that executions differing only by the
+    length of an IN list or by whitespace share one shape."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PARAM_LIST.sub("(?)", shape)
+
+
+class SqlProfile:
+    """
+    Statements executed in a scope: their number, their total time, how
+    often each statement shape ran and the `slowest` ones.
+
+    A shape run `n_plus_one_threshold` times or more is reported as a
+    likely N+1, a query issued once per row of an earlier one.
+    """
+
+    def __init__(self, slowest: int = 3, n_plus_one_threshold: int = 3):
+        self.slowest_size = slowest
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self._slowest: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[shape] += 1
+        entry = (seconds, next(self._sequence), shape)
+        if len(self._slowest) < self.slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> List[Tuple[str, float]]:
+        """The slowest statements with their seconds, slowest first."""
+        return [
+            (shape, seconds)
+            for seconds, _, shape in sorted(self._slowest, reverse=True)
+        ]
+
+    @property
+    def repeated(self) -> Dict[str, int]:
+        """The shapes run at least `n_plus_one_threshold` times."""
+        return {
+            shape: count
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold
+        }
+
+    def server_timing(self) -> str:
+        """Return the profile as a Server-Timing header value."""
+        description = f"{self.count} statements"
+        repeated = self.repeated
+        if repeated:
+            description += f", {len(repeated)} repeated"
+        return f'db;dur={self.total_seconds * 1000:.2f};desc="{description}"'
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the profile as a JSON serializable dict."""
+        return {
+            "statements": self.count,
+            "db_ms": round(self.total_seconds * 1000, 2),
+            "n_plus_one": self.repeated,
+            "slowest": [
+                {"sql": shape, "ms": round(seconds * 1000, 2)}
+                for shape, seconds in self.slowest
+            ],
+        }
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, many):
+    if _profile.get() is not None or _captures:
+        conn.info.setdefault(QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, many):
+    starts = conn.info.get(QUERY_START)
+    if not starts:
+        return
+    seconds = time.perf_counter() - starts.pop()
+    profile = _profile.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+    for capture in _captures:
+        capture.record(statement, seconds)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement(exception_context) -> None:
+    connection = exception_context.connection
+    starts = connection.info.get(QUERY_START) if connection else None
+    if starts:
+        starts.pop()
+
+
+@contextmanager
+def profile_sql(
+    slowest: int = 3, n_plus_one_threshold: int = 3
+) -> Iterator[SqlProfile]:
+    """Profile the statements executed in the current context."""
+    profile = SqlProfile(slowest, n_plus_one_threshold)
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+def current_profile() -> Optional[SqlProfile]:
+    """Return the profile of the current context, if profiled."""
+    return _profile.get()
+
+
+@contextmanager
+def capture_sql(
+    slowest: int = 3, n_plus_one_threshold: int = 3
+) -> Iterator[SqlProfile]:
+    """
+    Profile the statements of every context and thread while open, e.g.
+    those of requests a test client serves from its own thread.
+    """
+    profile = SqlProfile(slowest, n_plus_one_threshold)
+    _captures.append(profile)
+    try:
+        yield profile
+    finally:
+        _captures.remove(profile)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[SqlProfile]:
+    """
+    Fail with the statements run if the block runs more than `limit`.
+
+    Example:
+        with assert_max_queries(2):
+            client.get("/v1/user/me")
+    """
+    with capture_sql() as profile:
+        yield profile
+    if profile.count > limit:
+        statements = "\n".join(
+            f"  {count}x {shape}" for shape, count in profile.shapes.items()
+        )
+        raise AssertionError(
+            f"Expected at most {limit} statements, {profile.count} were "
+            f"run:\n{statements}"
+        )
+
+
+def log_profile(profile: SqlProfile, label: str) -> None:
+    """Log a profile as one JSON line, a warning if it has a likely N+1."""
+    line = json.dumps({"request": label, **profile.summary()})
+    if profile.repeated:
+        logger.warning(f"SQL profile {line}")
+    else:
+        logger.info(f"SQL profile {line}")
@@ -0,0 +1,78 @@
+"""Opaque cursor utilities for keyset pagination."""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Tuple
+
+from src.main.app.core.enums.enum import CommonErrorCode
+from src.main.app.core.exception import CustomException
+
+NEXT = "next"
+PREV = "prev"
+
+
+def _encode_value(value: Any) -> Any:
+    """Tag values JSON cannot represent natively so they survive a round trip."""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Reverse of `_encode_value`."""
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$dec" in value:
+            return Decimal(value["$dec"])
+    return value
+
+
+def encode_cursor(keys: List[Tuple[str, Any]], direction: str = NEXT) -> str:
+    """Encode the seek position of a record into an opaque cursor.
+
+    Args:
+        keys: Ordered (field, value) pairs of the sort columns plus `id`.
+        direction: Either `NEXT` or `PREV`.
+
+    Returns:
+        A URL-safe base64 string without padding.
+    """
+    payload = {
+        "d": direction,
+        "k": [[field, _encode_value(value)] for field, value in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[List[Tuple[str, Any]], str]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: The opaque cursor string.
+
+    Returns:
+        Tuple of (ordered (field, value) pairs, direction).
+
+    Raises:
+        CustomException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = payload["d"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        keys = [(field, _decode_value(value)) for field, value in payload["k"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise CustomException(CommonErrorCode.INVALID_CURSOR) from e
+    return keys, direction
@@ -1,16 +1,50 @@
-"""Excel export utilities for Pydantic models."""
+"""Excel/CSV export and import utilities for Pydantic models."""
 
+import asyncio
+import csv
 import io
+import os
+import tempfile
+from concurrent.futures import Executor
 from datetime import datetime
-from typing import Type
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 
 import pandas as pd
+import xlsxwriter
 from loguru import logger
-from openpyxl.styles import Font
-from openpyxl.utils import get_column_letter
+from openpyxl import load_workbook
 from pydantic import BaseModel
 from starlette.responses import StreamingResponse
 
+from src.main.app.core.enums import ExportTypeEnum
+
+FONT_NAME = "Microsoft YaHei"
+MIN_COLUMN_WIDTH = 15
+# Max length of an Excel sheet name
+MAX_SHEET_NAME = 31
+READ_CHUNK_SIZE = 64 * 1024
+IMPORT_CHUNK_SIZE = 1000
+# Sheet rows are 1-based and the first one holds the header
+FIRST_DATA_ROW = 2
+MEDIA_TYPES = {
+    ExportTypeEnum.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportTypeEnum.CSV: "text/csv; charset=utf-8",
+}
+
 
 async def export_excel(
     schema: Type[BaseModel], file_name: str, data_list=None
@@ -18,37 +52,281 @@ async def export_excel(
     """
     Export a template or data as an Excel file with Microsoft YaHei font for all cells and auto-width headers.
     """
-    if data_list is None:
-        data_list = []
+
+    async def chunks():
+        if data_list:
+            yield data_list
+
+    return await stream_export(
+        schema=schema, file_name=file_name, chunks=chunks()
+    )
+
+
+async def stream_export(
+    schema: Type[BaseModel],
+    file_name: str,
+    chunks: AsyncIterable[Iterable[Any]],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+) -> StreamingResponse:
+    """
+    Stream chunks of rows as an Excel or CSV download.
+
+    Columns are the fields of `schema`, read as attributes of each row, so
+    rows can be the ORM models themselves. CSV is encoded and sent chunk by
+    chunk. Excel rows go into a constant memory workbook backed by temporary
+    files, which is zipped and sent in blocks once the last chunk is written.
+    Chunks are encoded and written in a thread, off the event loop.
+
+    Args:
+        schema: The model whose fields are exported.
+        file_name: Download file name without timestamp and extension.
+        chunks: Async iterable of row chunks, e.g. `mapper.select_stream()`.
+        export_type: Output format.
+    """
+    export_type = ExportTypeEnum(export_type)
     field_names = list(schema.model_fields.keys())
-    user_export_df = pd.DataFrame(columns=field_names)
-    if data_list:
-        data_dicts = [item.model_dump() for item in data_list]
-        user_export_df = pd.concat(
-            [user_export_df, pd.DataFrame(data_dicts)], ignore_index=True
-        )
+    filename = (
+        f"{file_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        f".{export_type.value}"
+    )
+    if export_type == ExportTypeEnum.CSV:
+        body = _stream_csv(field_names, chunks)
+    else:
+        body = _stream_xlsx(field_names, file_name, chunks)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_type],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def _row_values(row: Any, field_names: List[str]) -> List[Any]:
+    if isinstance(row, dict):
+        return [row.get(name) for name in field_names]
+    return [getattr(row, name, None) for name in field_names]
 
-    filename = f"{file_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-    stream = io.BytesIO()
 
+def _encode_csv(field_names: List[str], chunk: Iterable[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_row_values(row, field_names) for row in chunk)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def _stream_csv(
+    field_names: List[str], chunks: AsyncIterable[Iterable[Any]]
+):
+    buffer = io.StringIO()
+    # BOM so that Excel opens the file as UTF-8
+    buffer.write("\ufeff")
+    csv.writer(buffer).writerow(field_names)
+    yield buffer.getvalue().encode("utf-8")
     try:
-        with pd.ExcelWriter(stream, engine="openpyxl") as writer:
-            user_export_df.to_excel(writer, index=False, sheet_name=filename)
-            worksheet = writer.sheets[filename]
-            for row in worksheet.iter_rows():
-                for cell in row:
-                    cell.font = Font(name="Microsoft YaHei")
-            for idx, col in enumerate(user_export_df.columns, 1):
-                column_letter = get_column_letter(idx)
-                column_width = max(len(str(col)), 15)
-                worksheet.column_dimensions[column_letter].width = column_width
-
-        stream.seek(0)
-        return StreamingResponse(
-            stream,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        async for chunk in chunks:
+            yield await asyncio.to_thread(_encode_csv, field_names, chunk)
+    except Exception as e:
+        logger.error(f"Failed to export CSV: {e}")
+        raise
+
+
+async def write_export(
+    path: str,
+    schema: Type[BaseModel],
+    sheet_name: str,
+    chunks: AsyncIterable[Iterable[Any]],
+    export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+    executor: Optional[Executor] = None,
+) -> int:
+    """
+    Write chunks of rows to an Excel or CSV file.
+
+    Args:
+        path: Path of the file to write.
+        schema: The model whose fields are exported.
+        sheet_name: Name of the Excel sheet, truncated to 31 characters.
+        chunks: Async iterable of row chunks, e.g. `mapper.select_stream()`.
+        export_type: Output format.
+        executor: Runs the file writes, the loop's default one if None.
+
+    Returns:
+        The number of rows written, without the header.
+    """
+    field_names = list(schema.model_fields.keys())
+    if ExportTypeEnum(export_type) == ExportTypeEnum.CSV:
+        return await _write_csv(path, field_names, chunks, executor)
+    return await _write_xlsx(path, field_names, sheet_name, chunks, executor)
+
+
+async def _offload(executor: Optional[Executor], func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, partial(func, *args, **kwargs)
+    )
+
+
+async def _write_csv(
+    path: str,
+    field_names: List[str],
+    chunks: AsyncIterable[Iterable[Any]],
+    executor: Optional[Executor] = None,
+) -> int:
+    def write_rows(chunk: Iterable[Any]) -> int:
+        rows = [_row_values(row, field_names) for row in chunk]
+        writer.writerows(rows)
+        return len(rows)
+
+    row_count = 0
+    file = await _offload(
+        executor, open, path, "w", encoding="utf-8-sig", newline=""
+    )
+    try:
+        writer = csv.writer(file)
+        writer.writerow(field_names)
+        async for chunk in chunks:
+            row_count += await _offload(executor, write_rows, chunk)
+    finally:
+        await _offload(executor, file.close)
+    return row_count
+
+
+async def _write_xlsx(
+    path: str,
+    field_names: List[str],
+    sheet_name: str,
+    chunks: AsyncIterable[Iterable[Any]],
+    executor: Optional[Executor] = None,
+) -> int:
+    workbook = xlsxwriter.Workbook(
+        path,
+        {
+            "constant_memory": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "remove_timezone": True,
+        },
+    )
+    try:
+        worksheet = workbook.add_worksheet(sheet_name[:MAX_SHEET_NAME])
+        cell_format = workbook.add_format({"font_name": FONT_NAME})
+        header_format = workbook.add_format(
+            {"font_name": FONT_NAME, "bold": True}
         )
+        # One format and width per column instead of per cell
+        for index, name in enumerate(field_names):
+            width = max(len(name), MIN_COLUMN_WIDTH)
+            worksheet.set_column(index, index, width, cell_format)
+        worksheet.write_row(0, 0, field_names, header_format)
+
+        def write_rows(row_index: int, chunk: Iterable[Any]) -> int:
+            # Constant memory mode flushes rows to a temporary file
+            for row in chunk:
+                worksheet.write_row(row_index, 0, _row_values(row, field_names))
+                row_index += 1
+            return row_index
+
+        row_index = 1
+        async for chunk in chunks:
+            row_index = await _offload(executor, write_rows, row_index, chunk)
+    finally:
+        await _offload(executor, workbook.close)
+    return row_index - 1
+
+
+async def _stream_xlsx(
+    field_names: List[str],
+    sheet_name: str,
+    chunks: AsyncIterable[Iterable[Any]],
+):
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        await _write_xlsx(path, field_names, sheet_name, chunks)
+        file = await asyncio.to_thread(open, path, "rb")
+        try:
+            while True:
+                block = await asyncio.to_thread(file.read, READ_CHUNK_SIZE)
+                if not block:
+                    break
+                yield block
+        finally:
+            await asyncio.to_thread(file.close)
     except Exception as e:
         logger.error(f"Failed to export Excel: {e}")
         raise
+    finally:
+        os.remove(path)
+
+
+async def read_import(
+    file: BinaryIO, file_name: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> AsyncIterator[Tuple[List[int], List[Dict[str, Any]]]]:
+    """
+    Read an uploaded Excel or CSV file in chunks of records.
+
+    Files whose name ends with `.csv` are parsed with pandas' chunked CSV
+    reader, anything else as a workbook opened in openpyxl read-only mode,
+    so only one chunk of rows is held at a time. Empty cells become None
+    and blank rows are skipped. Parsing runs in a thread.
+
+    Args:
+        file: The uploaded file, e.g. `UploadFile.file`.
+        file_name: Name of the uploaded file.
+        chunk_size: Number of rows per chunk.
+
+    Yields:
+        The sheet row numbers of a chunk and its records keyed by header.
+    """
+    if (file_name or "").lower().endswith(".csv"):
+        frames = pd.read_csv(
+            file,
+            chunksize=chunk_size,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8-sig",
+        )
+    else:
+        frames = _read_xlsx_frames(file, chunk_size)
+    try:
+        while True:
+            frame = await asyncio.to_thread(next, frames, None)
+            if frame is None:
+                break
+            frame = _normalize_frame(frame)
+            if not frame.empty:
+                row_numbers = (frame.index + FIRST_DATA_ROW).tolist()
+                yield row_numbers, frame.to_dict(orient="records")
+    finally:
+        frames.close()
+
+
+def _read_xlsx_frames(
+    file: BinaryIO, chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            (index, str(name).strip())
+            for index, name in enumerate(header)
+            if name is not None
+        ]
+        start = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            frame = pd.DataFrame.from_records(chunk)
+            frame.index = range(start, start + len(chunk))
+            # Stray cells may make rows wider or narrower than the header
+            frame = frame.reindex(columns=[index for index, _ in columns])
+            frame.columns = [name for _, name in columns]
+            start += len(chunk)
+            yield frame
+    finally:
+        workbook.close()
+
+
+def _normalize_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.astype(object)
+    frame = frame.where(frame.notna() & (frame != ""), None)
+    return frame.dropna(how="all")
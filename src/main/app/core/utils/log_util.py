@@ -0,0 +1,235 @@
+"""Logging pipeline writing JSON lines in batches from a background thread"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from starlette.types import Scope
+
+_STOP = object()
+BATCH_SIZE = 512
+
+_request_scope: ContextVar[Optional[Scope]] = ContextVar(
+    "request_scope", default=None
+)
+
+
+class BatchedLogWriter:
+    """
+    Loguru sink handing records to a background thread, which encodes them
+    as JSON lines and writes them in batches, so log calls never wait on
+    file I/O and the event loop never stalls on it.
+
+    The queue holds at most `queue_size` records; records logged while it
+    is full are dropped and counted instead of blocking the caller, so are
+    batches the file could not take. Write errors go to stderr. Once the
+    file exceeds `rotation_bytes` it is renamed and zipped in another
+    thread, and archives older than `retention_days` are deleted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rotation_bytes: int = 10 * 2**20,
+        retention_days: int = 30,
+        queue_size: int = 10000,
+    ):
+        self.path = Path(path)
+        self.rotation_bytes = rotation_bytes
+        self.retention_days = retention_days
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._compressor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-compress"
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message) -> None:
+        """Queue the record of a loguru message, encoded by the writer."""
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Write the queued records, then stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._compressor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        # Opened on demand, so a failed open or rotation is retried
+        file = None
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            records = [record for record in batch if record is not _STOP]
+            lines = [to_json(record) for record in records]
+            dropped, self.dropped = self.dropped, 0
+            if dropped:
+                lines.append(_dropped_line(dropped))
+            try:
+                if file is None:
+                    file = self._open()
+                file.write("".join(lines))
+                file.flush()
+            except OSError:
+                # Counted, the next batch written reports them
+                self.dropped += len(records) + dropped
+                _report_error(f"Log writer dropped {len(records)} records")
+                _close(file)
+                file = None
+                continue
+            if file.tell() >= self.rotation_bytes:
+                _close(file)
+                file = None
+                try:
+                    self._rotate()
+                    file = self._open()
+                except OSError:
+                    _report_error("Log writer failed to rotate")
+        _close(file)
+
+    def _open(self):
+        return open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        archive = self.path.with_name(
+            f"{self.path.stem}.{stamp}{self.path.suffix}"
+        )
+        os.replace(self.path, archive)
+        self._compressor.submit(self._compress, archive)
+
+    def _compress(self, archive: Path) -> None:
+        with zipfile.ZipFile(
+            f"{archive}.zip", "w", compression=zipfile.ZIP_DEFLATED
+        ) as zip_file:
+            zip_file.write(archive, arcname=archive.name)
+        archive.unlink()
+        expire_before = time.time() - self.retention_days * 86400
+        for old in self.path.parent.glob(f"{self.path.stem}.*.zip"):
+            if old.stat().st_mtime < expire_before:
+                old.unlink()
+
+
+def to_json(record: Dict[str, Any]) -> str:
+    """Encode a loguru record as one compact JSON line."""
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        **record["extra"],
+    }
+    exception = record["exception"]
+    if exception is not None:
+        entry["exception"] = "".join(
+            traceback.format_exception(
+                exception.type, exception.value, exception.traceback
+            )
+        )
+    return json.dumps(entry, default=str, ensure_ascii=False) + "\n"
+
+
+def _close(file) -> None:
+    if file is None:
+        return
+    try:
+        file.close()
+    except OSError:
+        # Buffered lines failed to write, they are counted as dropped
+        pass
+
+
+def _report_error(message: str) -> None:
+    # The log itself is failing, stderr is all that is left
+    sys.stderr.write(f"{message}\n{traceback.format_exc()}")
+
+
+def _dropped_line(dropped: int) -> str:
+    return (
+        json.dumps(
+            {
+                "time": datetime.now().astimezone().isoformat(),
+                "level": "WARNING",
+                "message": f"Dropped {dropped} log records",
+            }
+        )
+        + "\n"
+    )
+
+
+def bind_request(scope: Scope):
+    """
+    Bind the request of `scope` to the records logged in the current
+    context, returns the token to pass to `unbind_request`.
+    """
+    return _request_scope.set(scope)
+
+
+def unbind_request(token) -> None:
+    _request_scope.reset(token)
+
+
+def add_request_context(record: Dict[str, Any]) -> None:
+    """
+    Loguru patcher adding the request_id, user_id and route template of
+    the bound request to a record. They are read from the scope when a
+    record is logged, so values set after binding, e.g. the user ID by
+    authentication, are included too.
+    """
+    scope = _request_scope.get()
+    if scope is None:
+        return
+    state = scope.get("state", {})
+    route = scope.get("route")
+    extra = record["extra"]
+    extra["request_id"] = state.get("request_id")
+    extra["user_id"] = state.get("user_id")
+    extra["route"] = route.path if route is not None else scope["path"]
+
+
+def setup_logging(server_config) -> BatchedLogWriter:
+    """
+    Write the application log as JSON lines to the configured file through
+    a `BatchedLogWriter`, with the request context on every record.
+    """
+    writer = BatchedLogWriter(
+        server_config.log_file_path,
+        rotation_bytes=server_config.log_rotation_bytes,
+        retention_days=server_config.log_retention_days,
+        queue_size=server_config.log_queue_size,
+    )
+    logger.configure(patcher=add_request_context)
+    logger.add(
+        writer,
+        level="DEBUG" if server_config.debug else "INFO",
+        # Records are encoded by the writer thread, keep formatting cheap
+        format="{message}",
+    )
+    return writer
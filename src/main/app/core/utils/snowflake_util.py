@@ -1,68 +1,124 @@
 """Snowflake utils to generate unique id"""
 
+import asyncio
 import os
+import threading
 import time
-from typing import Generator
+import uuid
+from typing import List, Optional
+
+from loguru import logger
 
 API_EPOCH = 1730438845
+# IDs stay below 2**53, the largest integer JavaScript clients read exactly
+# from JSON numbers, until 2^31 seconds after the epoch
+MAX_SAFE_ID = 2**53 - 1
 
 worker_id_bits = 5
-process_id_bits = 5
-max_worker_id = -1 ^ (-1 << worker_id_bits)
-max_process_id = -1 ^ (-1 << process_id_bits)
+datacenter_id_bits = 5
 sequence_bits = 12
-process_id_shift = sequence_bits + worker_id_bits
+max_worker_id = -1 ^ (-1 << worker_id_bits)
+max_datacenter_id = -1 ^ (-1 << datacenter_id_bits)
 worker_id_shift = sequence_bits
-timestamp_left_shift = sequence_bits + worker_id_bits + process_id_bits
+datacenter_id_shift = sequence_bits + worker_id_bits
+timestamp_left_shift = sequence_bits + worker_id_bits + datacenter_id_bits
 sequence_mask = -1 ^ (-1 << sequence_bits)
 
-
-def generator(
-    worker_id: int = 1,
-    process_id: int = os.getpid() % 31,
-    sleep=lambda x: time.sleep(x),
-) -> Generator[int, None, None]:
+WORKER_LEASE_PREFIX = "snowflake_worker:"
+# Extends a lease only while this process still holds it
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+# Frees a lease still held, or keeps it while IDs borrowed from the future
+# could still be issued again by its next holder
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if tonumber(ARGV[2]) > 0 then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return redis.call('del', KEYS[1])
+"""
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+class SnowflakeGenerator:
     """
-    Generates unique snowflake IDs.
-
-    :param worker_id: Worker ID (default: 1)
-    :param process_id: Process ID (default: current process ID modulo 31)
-    :param sleep: Sleep function (default: `time.sleep`)
-    :return: Generator of snowflake IDs
+    Thread-safe generator of 53-bit IDs: 31 bits of seconds since the
+    epoch, 5 bits of datacenter ID, 5 bits of worker ID and a 12-bit
+    sequence, 4096 IDs per second per worker. They fit JSON numbers.
+
+    It never sleeps. Once a second's sequence runs out, or when the clock
+    steps back, IDs are taken from the following seconds of a logical
+    clock that never decreases; the wall clock catches up with it once
+    the load drops or the clock moves forward again.
     """
-    assert 0 <= worker_id <= max_worker_id
-    assert 0 <= process_id <= max_process_id
-
-    last_timestamp = -1
-    sequence = 0
-
-    while True:
-        timestamp = int(time.time())
-
-        if last_timestamp > timestamp:
-            sleep(last_timestamp - timestamp)
-            continue
-
-        if last_timestamp == timestamp:
-            sequence = (sequence + 1) & sequence_mask
-            if sequence == 0:
-                sequence = -1 & sequence_mask
-                sleep(1)
-                continue
-        else:
-            sequence = 0
-
-        last_timestamp = timestamp
-
-        yield (
-            ((timestamp - API_EPOCH) << timestamp_left_shift)
-            | (process_id << process_id_shift)
-            | (worker_id << worker_id_shift)
-            | sequence
-        )
-
 
-global_generator = generator()
+    def __init__(self, worker_id: int = 0, datacenter_id: int = 0, clock=None):
+        self.clock = clock or _now
+        self._lock = threading.Lock()
+        self._last_timestamp = -1
+        self._sequence = 0
+        self.configure(worker_id, datacenter_id)
+
+    def configure(self, worker_id: int, datacenter_id: int) -> None:
+        """Switch to another worker and datacenter ID."""
+        if not 0 <= worker_id <= max_worker_id:
+            raise ValueError(f"Worker ID must be in 0..{max_worker_id}")
+        if not 0 <= datacenter_id <= max_datacenter_id:
+            raise ValueError(f"Datacenter ID must be in 0..{max_datacenter_id}")
+        with self._lock:
+            self.worker_id = worker_id
+            self.datacenter_id = datacenter_id
+            self._node = (datacenter_id << datacenter_id_shift) | (
+                worker_id << worker_id_shift
+            )
+
+    def next_id(self) -> int:
+        """Return a new unique ID."""
+        return self.next_ids(1)[0]
+
+    def next_ids(self, n: int) -> List[int]:
+        """Return `n` new unique IDs in ascending order."""
+        ids = []
+        with self._lock:
+            timestamp = max(self.clock(), self._last_timestamp)
+            if timestamp == self._last_timestamp:
+                sequence = self._sequence + 1
+            else:
+                sequence = 0
+            while len(ids) < n:
+                if sequence > sequence_mask:
+                    # Borrow the next second instead of waiting for it
+                    timestamp += 1
+                    sequence = 0
+                count = min(n - len(ids), sequence_mask + 1 - sequence)
+                prefix = ((timestamp - API_EPOCH) << timestamp_left_shift) | (
+                    self._node
+                )
+                ids.extend(
+                    prefix | s for s in range(sequence, sequence + count)
+                )
+                sequence += count
+            self._last_timestamp = timestamp
+            self._sequence = sequence - 1
+        return ids
+
+    def seconds_ahead(self) -> int:
+        """Seconds the logical clock runs ahead of the wall clock."""
+        return max(self._last_timestamp - self.clock(), 0)
+
+
+global_generator = SnowflakeGenerator(
+    worker_id=os.getpid() % (max_worker_id + 1)
+)
 
 
 def snowflake_id() -> int:
@@ -71,4 +127,108 @@ def snowflake_id() -> int:
 
     :return: Snowflake ID
     """
-    return next(global_generator)
+    return global_generator.next_id()
+
+
+def snowflake_ids(n: int) -> List[int]:
+    """
+    Returns `n` unique snowflake IDs allocated at once, for batch inserts.
+
+    :param n: Number of IDs
+    :return: Snowflake IDs in ascending order
+    """
+    if n <= 0:
+        return []
+    return global_generator.next_ids(n)
+
+
+class WorkerIdLease:
+    """
+    Leases a worker ID of a datacenter through Redis, so that processes
+    and pods never run with the same one.
+
+    Worker IDs are claimed with SET NX on a key that expires after `ttl`
+    seconds and is renewed every third of it. Renewing and releasing run
+    as scripts that check the lease token, so a lease taken over by
+    another process, e.g. after this one stalled past its TTL, is never
+    extended or deleted; a new one is acquired instead. While the
+    generator runs ahead of the clock the lease is held that much longer.
+    """
+
+    def __init__(
+        self,
+        datacenter_id: int = 0,
+        ttl: int = 60,
+        generator: SnowflakeGenerator = global_generator,
+        redis_factory=None,
+    ):
+        self.datacenter_id = datacenter_id
+        self.ttl = ttl
+        self.generator = generator
+        self.redis_factory = redis_factory
+        self.token = uuid.uuid4().hex
+        self.worker_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _get_redis(self):
+        if self.redis_factory is None:
+            from src.main.app.core.cache.redis_cache import RedisManager
+
+            self.redis_factory = RedisManager.get_instance
+        return await self.redis_factory()
+
+    def _key(self, worker_id: int) -> str:
+        return f"{WORKER_LEASE_PREFIX}{self.datacenter_id}:{worker_id}"
+
+    async def acquire(self) -> int:
+        """Claim a free worker ID and start renewing it."""
+        redis_client = await self._get_redis()
+        for worker_id in range(max_worker_id + 1):
+            if await redis_client.set(
+                self._key(worker_id), self.token, ex=self.ttl, nx=True
+            ):
+                self.worker_id = worker_id
+                self.generator.configure(worker_id, self.datacenter_id)
+                if self._task is None or self._task.done():
+                    self._task = asyncio.create_task(self._renew_forever())
+                return worker_id
+        raise RuntimeError(
+            f"All {max_worker_id + 1} worker IDs of datacenter "
+            f"{self.datacenter_id} are leased"
+        )
+
+    async def renew(self) -> None:
+        """Extend the lease, or acquire a new one if it was lost."""
+        redis_client = await self._get_redis()
+        ttl = self.ttl + self.generator.seconds_ahead()
+        if await redis_client.eval(
+            _RENEW_SCRIPT, 1, self._key(self.worker_id), self.token, ttl
+        ):
+            return
+        logger.warning(f"Snowflake worker ID {self.worker_id} lease was lost")
+        await self.acquire()
+
+    async def release(self) -> None:
+        """Stop renewing and free the worker ID."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.worker_id is None:
+            return
+        redis_client = await self._get_redis()
+        await redis_client.eval(
+            _RELEASE_SCRIPT,
+            1,
+            self._key(self.worker_id),
+            self.token,
+            self.generator.seconds_ahead(),
+        )
+        self.worker_id = None
+
+    async def _renew_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                await self.renew()
+            except Exception as e:
+                logger.warning(f"Snowflake worker ID renewal failed: {e}")
@@ -3,8 +3,11 @@
 This module provides utility functions for validating Pydantic models and formatting
 validation error messages. It supports Pydantic v2.x validation syntax."""
 
-from typing import Optional
-from pydantic import BaseModel, ValidationError
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 
 class ValidateService:
@@ -52,3 +55,37 @@ class ValidateService:
             message = error["msg"]  # Error description
             err_msg.append(f"Error in field '{field}': {message}")
         return ",".join(err_msg)
+
+    @staticmethod
+    def validate_records(
+        schema: Type[BaseModel], records: List[Mapping[str, Any]]
+    ) -> Tuple[List[BaseModel], Dict[int, str]]:
+        """Validate a list of records against a model in one call.
+
+        Args:
+            schema: The Pydantic model each record must satisfy.
+            records: Raw field values keyed by field name.
+
+        Returns:
+            Tuple[List[BaseModel], Dict[int, str]]: The validated models, empty
+            as soon as any record fails, and the error message of each failing
+            record keyed by its index in `records`.
+        """
+        try:
+            return _list_adapter(schema).validate_python(records), {}
+        except ValidationError as e:
+            err_msg = defaultdict(list)
+            for error in e.errors():
+                index, *loc = error["loc"]
+                field = " -> ".join(map(str, loc))
+                err_msg[index].append(
+                    f"Error in field '{field}': {error['msg']}"
+                )
+            return [], {
+                index: ",".join(messages) for index, messages in err_msg.items()
+            }
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
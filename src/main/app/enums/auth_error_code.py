@@ -10,3 +10,5 @@ class AuthErrorCode(CustomExceptionCode):
     TOKEN_EXPIRED = (20002, "Token has expired")
     OPENAPI_FORBIDDEN = (20003, "OpenAPI is not ready")
     MISSING_TOKEN = (20004, "Authentication token is missing")
+    INVALID_TOKEN = (20005, "Authentication token is invalid")
+    TOKEN_REVOKED = (20006, "Token has been revoked")
@@ -7,3 +7,5 @@ class BusinessErrorCode(CustomExceptionCode):
     """Business-related error codes."""
 
     USER_NAME_EXISTS = (30001, "Username already exists")
+    EXPORT_JOB_NOT_FOUND = (30002, "Export job not found")
+    EXPORT_JOB_NOT_READY = (30003, "Export job has not succeeded")
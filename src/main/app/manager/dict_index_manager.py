@@ -0,0 +1,242 @@
+"""In-memory dictionary index served without touching the database"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.cache.cache_manager import get_cache_client
+from src.main.app.core.cache.cache_tags import get_tag_versions
+from src.main.app.core.mapper import table_version
+from src.main.app.mapper.sys_dict_data_mapper import dictDataMapper
+from src.main.app.mapper.sys_dict_type_mapper import dictTypeMapper
+from src.main.app.model.sys_dict_data_model import DictDataModel
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+from src.main.app.schema.sys_dict_data_schema import (
+    DictDataLookup,
+    DictDataPage,
+)
+
+DICT_DATA_TABLE = DictDataModel.__tablename__
+DICT_TYPE_TABLE = DictTypeModel.__tablename__
+# Types last, `versions[1:]` below are those of the types table
+TABLES = (DICT_DATA_TABLE, DICT_TYPE_TABLE)
+# Seconds between checks of the shared tag versions for other workers' writes
+DICT_INDEX_TTL = 30
+# Rows updated within this window before a refresh are fetched again, so
+# rows of transactions committed after the refresh started are not missed
+REFRESH_OVERLAP = timedelta(minutes=5)
+DISABLED = 0
+
+
+def _sort_key(item: DictDataPage) -> Tuple[bool, int, int]:
+    return item.sort is None, item.sort or 0, item.id
+
+
+def _etag(payload) -> str:
+    digest = hashlib.blake2b(
+        json.dumps(payload, sort_keys=True).encode(), digest_size=16
+    )
+    return f'"{digest.hexdigest()}"'
+
+
+EMPTY_ETAG = _etag([])
+
+
+class DictIndexManager:
+    """
+    Keeps the rows of `sys_dict_data` grouped by dict type, the enabled ones
+    in sort order, and serves lookups by type from memory.
+
+    The index is tagged with the local write versions of both dict tables,
+    and every `ttl` seconds the shared cache tag versions are compared to
+    catch writes committed by other workers, neither touches the database.
+    Once one changed, only the rows modified since the last refresh are
+    loaded and patched in, removed rows are found by comparing ids; after a
+    rollback of dict writes all are loaded. Types
+    marked disabled in `sys_dict_type` look up as empty. Each type carries
+    an ETag of its content, recomputed only when its rows change.
+    """
+
+    def __init__(self, ttl: int = DICT_INDEX_TTL):
+        self.ttl = ttl
+        # Every row, disabled ones too, by id and by type
+        self._items: Dict[int, DictDataPage] = {}
+        self._members: Dict[str, Dict[int, DictDataPage]] = defaultdict(dict)
+        # Enabled rows of each type in sort order
+        self._groups: Dict[str, List[DictDataPage]] = {}
+        self._etags: Dict[str, str] = {}
+        self._disabled_types: Set[str] = set()
+        self._versions: Optional[Tuple[int, ...]] = None
+        self._rollbacks: Optional[Tuple[int, ...]] = None
+        self._tag_versions: Optional[Dict[str, str]] = None
+        self._expire_at = 0.0
+        self._watermark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    async def lookup(
+        self,
+        types: Iterable[str],
+        *,
+        db_session: Optional[AsyncSession] = None,
+    ) -> DictDataLookup:
+        """
+        Return the dict data of each type in sort order, with an ETag over
+        the requested types. The returned items must not be mutated.
+        """
+        await self.refresh(db_session=db_session)
+        items = {}
+        etags = {}
+        for type in dict.fromkeys(types):
+            if type in self._disabled_types or type not in self._groups:
+                items[type], etags[type] = [], EMPTY_ETAG
+            else:
+                items[type], etags[type] = self._groups[type], self._etags[type]
+        if len(etags) == 1:
+            etag = next(iter(etags.values()))
+        else:
+            etag = _etag(sorted(etags.items()))
+        return DictDataLookup(items=items, etag=etag)
+
+    async def refresh(
+        self, *, db_session: Optional[AsyncSession] = None
+    ) -> None:
+        """Bring the index up to date with the dict tables if it is stale."""
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            versions = self._local_versions()
+            tag_versions = await self._shared_versions()
+            if (
+                versions == self._versions
+                and tag_versions == self._tag_versions
+            ):
+                self._expire_at = time.monotonic() + self.ttl
+                return
+            rollbacks = self._local_rollbacks()
+            # Undone rows may not be read again by an incremental refresh
+            reload = rollbacks != self._rollbacks
+            started_at = datetime.now()
+            if reload or (
+                versions[1:] != self._versions[1:]
+                or tag_versions[DICT_TYPE_TABLE]
+                != self._tag_versions[DICT_TYPE_TABLE]
+            ):
+                # Read the primary, a lagging replica would miss the writes
+                # that changed the versions
+                self._disabled_types = set(
+                    await dictTypeMapper.select_disabled_types(
+                        use_primary=True, db_session=db_session
+                    )
+                )
+            if reload:
+                await self._load_all(db_session=db_session)
+            else:
+                await self._load_changes(db_session=db_session)
+            self._watermark = started_at - REFRESH_OVERLAP
+            self._versions = versions
+            self._rollbacks = rollbacks
+            self._tag_versions = tag_versions
+            self._expire_at = time.monotonic() + self.ttl
+
+    def _local_versions(self) -> Tuple[int, ...]:
+        return tuple(table_version.get_version(table) for table in TABLES)
+
+    def _local_rollbacks(self) -> Tuple[int, ...]:
+        return tuple(table_version.get_rollbacks(table) for table in TABLES)
+
+    async def _shared_versions(self) -> Dict[str, str]:
+        cache = await get_cache_client()
+        return await get_tag_versions(cache, TABLES)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._versions == self._local_versions()
+            and self._expire_at > time.monotonic()
+        )
+
+    async def _load_all(self, *, db_session: Optional[AsyncSession]) -> None:
+        rows = await dictDataMapper.select_modified_since(
+            use_primary=True, db_session=db_session
+        )
+        self._items.clear()
+        self._members.clear()
+        self._groups.clear()
+        self._etags.clear()
+        self._apply(rows, set())
+
+    async def _load_changes(
+        self, *, db_session: Optional[AsyncSession]
+    ) -> None:
+        ids = set(
+            await dictDataMapper.select_ids(
+                use_primary=True, db_session=db_session
+            )
+        )
+        removed_ids = self._items.keys() - ids
+        rows = list(
+            await dictDataMapper.select_modified_since(
+                since=self._watermark,
+                use_primary=True,
+                db_session=db_session,
+            )
+        )
+        # Rows inserted with an old update time are found by their id
+        missing_ids = ids - self._items.keys() - {row.id for row in rows}
+        if missing_ids:
+            rows.extend(
+                await dictDataMapper.select_by_ids(
+                    ids=list(missing_ids),
+                    use_primary=True,
+                    db_session=db_session,
+                )
+            )
+        self._apply(rows, removed_ids)
+
+    def _apply(self, rows: List[DictDataModel], removed_ids: Set[int]) -> None:
+        """Patch changed and removed rows into the index."""
+        changed_types: Set[str] = set()
+        for id in removed_ids:
+            item = self._items.pop(id)
+            del self._members[item.type][id]
+            changed_types.add(item.type)
+        for row in rows:
+            item = DictDataPage(**row.model_dump())
+            old = self._items.get(item.id)
+            if old == item:
+                continue
+            if old is not None:
+                del self._members[old.type][item.id]
+                changed_types.add(old.type)
+            self._items[item.id] = item
+            self._members[item.type][item.id] = item
+            changed_types.add(item.type)
+        for type in changed_types:
+            group = sorted(
+                (
+                    item
+                    for item in self._members[type].values()
+                    if item.status != DISABLED
+                ),
+                key=_sort_key,
+            )
+            if group:
+                self._groups[type] = group
+                self._etags[type] = _etag(
+                    [item.model_dump(mode="json") for item in group]
+                )
+            else:
+                self._groups.pop(type, None)
+                self._etags.pop(type, None)
+            if not self._members[type]:
+                del self._members[type]
+
+
+dictIndexManager = DictIndexManager()
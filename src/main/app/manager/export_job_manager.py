@@ -0,0 +1,246 @@
+"""Runs large exports as background jobs writing to a spool directory"""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterable, Callable, Iterable, Optional, Set, Type
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src.main.app.core.config import config_manager
+from src.main.app.core.enums import ExportJobStatusEnum, ExportTypeEnum
+from src.main.app.core.schema import ExportJob
+from src.main.app.core.utils import excel_util
+
+SPOOL_DIR_NAME = "fast_web_export"
+JOB_SUFFIX = ".json"
+# State file key naming the process running the job, as `host:pid`
+WORKER_KEY = "worker"
+
+ChunksFactory = Callable[[], AsyncIterable[Iterable[Any]]]
+
+
+class ExportJobManager:
+    """
+    Runs export jobs in a bounded pool of asyncio tasks.
+
+    At most `max_workers` jobs write at a time, the others wait. Rows are
+    fetched on the event loop and written to the file by a pool of as many
+    threads. Each job writes its file and a JSON state file to the spool
+    directory, so status and download requests can be served by any worker
+    process sharing it. Finished jobs and their files are removed after
+    `ttl` seconds.
+    """
+
+    def __init__(self, spool_dir: str, max_workers: int, ttl: int):
+        self.spool_dir = spool_dir
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._job_ids: Set[str] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="export"
+        )
+        self._worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def submit(
+        self,
+        *,
+        schema: Type[BaseModel],
+        file_name: str,
+        chunks_factory: ChunksFactory,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        owner_id: Optional[int] = None,
+    ) -> ExportJob:
+        """
+        Queue an export and return its pending job.
+
+        Args:
+            schema: The model whose fields are exported.
+            file_name: Download file name without timestamp and extension.
+            chunks_factory: Returns the row chunks once the job starts, e.g.
+                `lambda: mapper.select_stream(**filters)`.
+            export_type: Output format.
+            owner_id: ID of the user who may read the job.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._sweep()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        export_type = ExportTypeEnum(export_type)
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        job = ExportJob(
+            job_id=uuid.uuid4().hex,
+            file_name=f"{file_name}_{timestamp}.{export_type.value}",
+            export_type=export_type,
+            owner_id=owner_id,
+            create_time=datetime.now(),
+        )
+        self._job_ids.add(job.job_id)
+        self._save(job)
+        task = asyncio.create_task(
+            self._run(job, schema, file_name, chunks_factory)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def recover(self) -> None:
+        """
+        Fail the unfinished jobs of dead processes on this host, so they are
+        reported and expire instead of staying pending forever. Call it on
+        startup; jobs of other hosts are left to them.
+        """
+        if not os.path.isdir(self.spool_dir):
+            return
+        for name in os.listdir(self.spool_dir):
+            if not name.endswith(JOB_SUFFIX):
+                continue
+            state = self._load_state(name[: -len(JOB_SUFFIX)])
+            if state is None:
+                continue
+            try:
+                job = ExportJob.model_validate(state)
+            except ValueError:
+                continue
+            if job.finish_time is not None or self._is_alive(
+                job.job_id, state.get(WORKER_KEY)
+            ):
+                continue
+            logger.warning(f"Export job {job.job_id} abandoned by its worker")
+            job.status = ExportJobStatusEnum.FAILED
+            job.error = "Export interrupted"
+            job.finish_time = datetime.now()
+            self._remove(self.get_file_path(job))
+            self._save(job)
+
+    def get_job(
+        self, job_id: str, owner_id: Optional[int] = None
+    ) -> Optional[ExportJob]:
+        """Return a job, None if it is unknown, expired or not the owner's."""
+        try:
+            job_id = uuid.UUID(hex=job_id).hex
+        except ValueError:
+            return None
+        job = self._load(job_id)
+        if job is None or job.owner_id not in (None, owner_id):
+            return None
+        return job
+
+    def get_file_path(self, job: ExportJob) -> str:
+        """Return the path of the file a job writes."""
+        return os.path.join(
+            self.spool_dir, f"{job.job_id}.{job.export_type.value}"
+        )
+
+    async def _run(
+        self,
+        job: ExportJob,
+        schema: Type[BaseModel],
+        sheet_name: str,
+        chunks_factory: ChunksFactory,
+    ) -> None:
+        async with self._semaphore:
+            job.status = ExportJobStatusEnum.RUNNING
+            self._save(job)
+            path = self.get_file_path(job)
+            try:
+                job.row_count = await excel_util.write_export(
+                    path=path,
+                    schema=schema,
+                    sheet_name=sheet_name,
+                    chunks=chunks_factory(),
+                    export_type=job.export_type,
+                    executor=self._executor,
+                )
+                job.status = ExportJobStatusEnum.SUCCEEDED
+            except Exception as e:
+                logger.error(f"Export job {job.job_id} failed: {e}")
+                job.status = ExportJobStatusEnum.FAILED
+                job.error = str(e)
+                self._remove(path)
+            job.finish_time = datetime.now()
+            self._save(job)
+            self._job_ids.discard(job.job_id)
+
+    def _is_alive(self, job_id: str, worker: Optional[str]) -> bool:
+        if worker is None:
+            # Saved before workers were recorded
+            return False
+        host, _, pid = worker.rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit():
+            return True
+        if int(pid) == os.getpid():
+            # A previous process with the same PID ran it
+            return job_id in self._job_ids
+        if os.name == "nt":
+            # Signal 0 would terminate the process on Windows
+            return True
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{job_id}{JOB_SUFFIX}")
+
+    def _load_state(self, job_id: str) -> Optional[dict]:
+        try:
+            with open(self._job_path(job_id), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, job_id: str) -> Optional[ExportJob]:
+        state = self._load_state(job_id)
+        try:
+            return None if state is None else ExportJob.model_validate(state)
+        except ValueError:
+            return None
+
+    def _save(self, job: ExportJob) -> None:
+        # Replace atomically so readers never see a partial state file
+        path = self._job_path(job.job_id)
+        state = {**job.model_dump(mode="json"), WORKER_KEY: self._worker}
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(f"{path}.tmp", path)
+
+    def _sweep(self) -> None:
+        """Remove finished jobs older than the TTL with their files."""
+        expire_before = datetime.now() - timedelta(seconds=self.ttl)
+        for name in os.listdir(self.spool_dir):
+            if not name.endswith(JOB_SUFFIX):
+                continue
+            job = self._load(name[: -len(JOB_SUFFIX)])
+            if job is None or job.finish_time is None:
+                continue
+            if job.finish_time < expire_before:
+                self._remove(self.get_file_path(job))
+                self._remove(self._job_path(job.job_id))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+server_config = config_manager.load_server_config()
+exportJobManager = ExportJobManager(
+    spool_dir=server_config.export_spool_dir
+    or os.path.join(tempfile.gettempdir(), SPOOL_DIR_NAME),
+    max_workers=server_config.export_max_workers,
+    ttl=server_config.export_job_ttl,
+)
@@ -0,0 +1,192 @@
+"""In-memory menu hierarchy served from a table-versioned cache"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.mapper import table_version
+from src.main.app.mapper.sys_menu_mapper import menuMapper
+from src.main.app.model.sys_menu_model import MenuModel
+from src.main.app.schema.sys_menu_schema import MenuPage, MenuTree
+
+MENU_TABLE = MenuModel.__tablename__
+# Seconds before the index is checked for writes made by other processes
+MENU_TREE_TTL = 60
+# Menus updated within this window before a refresh are fetched again, so
+# rows of transactions committed after the refresh started are not missed
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def _sort_key(menu: MenuPage) -> Tuple[bool, int, int]:
+    return menu.sort is None, menu.sort or 0, menu.id
+
+
+class MenuTreeManager:
+    """
+    Keeps every menu of `sys_menu` in a parent/child index with children in
+    sort order, and serves the whole tree or any subtree from it.
+
+    The index is tagged with the menu table version. Once a mapper write
+    bumps the version (or the TTL runs out), only the menus modified since
+    the last refresh are loaded and patched into the index, removed menus are
+    found by comparing ids; after a rollback of menu writes all are loaded.
+    Materialized trees are rebuilt lazily after a patch and shared until the
+    next one.
+    """
+
+    def __init__(self, ttl: int = MENU_TREE_TTL):
+        self.ttl = ttl
+        self._menus: Dict[int, MenuPage] = {}
+        self._children: Dict[Optional[int], List[int]] = defaultdict(list)
+        self._version: Optional[int] = None
+        self._rollbacks = 0
+        self._expire_at = 0.0
+        self._watermark: Optional[datetime] = None
+        self._trees: Optional[Dict[int, MenuTree]] = None
+        self._roots: Optional[List[MenuTree]] = None
+        self._lock = asyncio.Lock()
+
+    async def get_tree(
+        self,
+        *,
+        id: Optional[int] = None,
+        db_session: Optional[AsyncSession] = None,
+    ) -> List[MenuTree]:
+        """
+        Return the menu forest, or the subtree rooted at `id`.
+
+        Menus whose parent is the root id, None or a missing menu are roots.
+        The returned trees are shared by all callers and must not be mutated.
+        """
+        await self.refresh(db_session=db_session)
+        if self._roots is None:
+            self._materialize()
+        if id is None:
+            return self._roots
+        tree = self._trees.get(id)
+        return [tree] if tree is not None else []
+
+    async def refresh(
+        self, *, db_session: Optional[AsyncSession] = None
+    ) -> None:
+        """Bring the index up to date with the menu table if it is stale."""
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            version = table_version.get_version(MENU_TABLE)
+            rollbacks = table_version.get_rollbacks(MENU_TABLE)
+            started_at = datetime.now()
+            if self._watermark is None or rollbacks != self._rollbacks:
+                await self._load_all(db_session=db_session)
+            else:
+                await self._load_changes(db_session=db_session)
+            self._watermark = started_at - REFRESH_OVERLAP
+            self._version = version
+            self._rollbacks = rollbacks
+            self._expire_at = time.monotonic() + self.ttl
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._version == table_version.get_version(MENU_TABLE)
+            and self._expire_at > time.monotonic()
+        )
+
+    async def _load_all(self, *, db_session: Optional[AsyncSession]) -> None:
+        # Read the primary, a lagging replica would miss the menu changes
+        # that bumped the table version
+        menu_list = await menuMapper.select_modified_since(
+            use_primary=True, db_session=db_session
+        )
+        self._menus.clear()
+        self._children.clear()
+        self._apply(menu_list, set())
+
+    async def _load_changes(
+        self, *, db_session: Optional[AsyncSession]
+    ) -> None:
+        ids = set(
+            await menuMapper.select_ids(use_primary=True, db_session=db_session)
+        )
+        removed_ids = self._menus.keys() - ids
+        menu_list = list(
+            await menuMapper.select_modified_since(
+                since=self._watermark,
+                use_primary=True,
+                db_session=db_session,
+            )
+        )
+        # Rows inserted with an old update time are found by their id
+        missing_ids = ids - self._menus.keys() - {m.id for m in menu_list}
+        if missing_ids:
+            menu_list.extend(
+                await menuMapper.select_by_ids(
+                    ids=list(missing_ids),
+                    use_primary=True,
+                    db_session=db_session,
+                )
+            )
+        self._apply(menu_list, removed_ids)
+
+    def _apply(self, menu_list: List[MenuModel], removed_ids: Set[int]) -> None:
+        """Patch changed and removed menus into the index."""
+        changed_parents: Set[Optional[int]] = set()
+        for id in removed_ids:
+            menu = self._menus.pop(id)
+            self._children[menu.parent_id].remove(id)
+        for menu_model in menu_list:
+            menu = MenuPage(**menu_model.model_dump())
+            old = self._menus.get(menu.id)
+            if old == menu:
+                continue
+            if old is None or old.parent_id != menu.parent_id:
+                if old is not None:
+                    self._children[old.parent_id].remove(menu.id)
+                self._children[menu.parent_id].append(menu.id)
+            self._menus[menu.id] = menu
+            changed_parents.add(menu.parent_id)
+        for parent_id in changed_parents:
+            self._children[parent_id].sort(
+                key=lambda id: _sort_key(self._menus[id])
+            )
+        if removed_ids or changed_parents:
+            self._trees = None
+            self._roots = None
+
+    def _materialize(self) -> None:
+        trees: Dict[int, MenuTree] = {}
+
+        def build(id: int, path: Set[int]) -> MenuTree:
+            if id not in trees:
+                # A parent cycle is cut where it closes
+                path.add(id)
+                children = [
+                    build(child_id, path)
+                    for child_id in self._children.get(id, ())
+                    if child_id not in path
+                ]
+                path.discard(id)
+                trees[id] = MenuTree(
+                    **self._menus[id].model_dump(), children=children
+                )
+            return trees[id]
+
+        root_ids = [
+            id
+            for parent_id, child_ids in self._children.items()
+            if parent_id not in self._menus
+            for id in child_ids
+        ]
+        root_ids.sort(key=lambda id: _sort_key(self._menus[id]))
+        self._roots = [build(id, set()) for id in root_ids]
+        for id in self._menus:
+            build(id, set())
+        self._trees = trees
+
+
+menuTreeManager = MenuTreeManager()
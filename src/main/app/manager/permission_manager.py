@@ -0,0 +1,120 @@
+"""Resolves and caches the roles, permissions and menus of a user"""
+
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.cache.versioned_cache import VersionedCache
+from src.main.app.core.config import config_manager
+from src.main.app.mapper.sys_menu_mapper import menuMapper
+from src.main.app.mapper.sys_user_role_mapper import userRoleMapper
+from src.main.app.model.sys_menu_model import MenuModel
+from src.main.app.model.sys_role_menu_model import RoleMenuModel
+from src.main.app.model.sys_role_model import RoleModel
+from src.main.app.model.sys_user_role_model import UserRoleModel
+from src.main.app.schema.sys_menu_schema import MenuPage
+from src.main.app.schema.sys_user_schema import UserInfo
+
+ADMIN_ROLE = "admin"
+ADMIN_PERMISSION = "*.*.*"
+
+# Tables whose writes change the resolved permissions of some user
+PERMISSION_TABLES = (
+    UserRoleModel.__tablename__,
+    RoleModel.__tablename__,
+    RoleMenuModel.__tablename__,
+    MenuModel.__tablename__,
+)
+
+
+class UserPermission(NamedTuple):
+    """The resolved RBAC state of a user, shared between requests."""
+
+    roles: Set[str]
+    role_models: List[RoleModel]
+    permissions: List[str]
+    menus: List[MenuPage]
+
+
+class PermissionManager:
+    """
+    Loads the user -> role -> menu chain with a single joined query and keeps
+    the result in a versioned LRU cache, evicted by writes to any of the
+    permission tables.
+    """
+
+    def __init__(self, ttl: int, maxsize: int):
+        self.cache = VersionedCache(PERMISSION_TABLES, ttl=ttl, maxsize=maxsize)
+
+    async def get_user_permission(
+        self, *, user_id: int, db_session: Optional[AsyncSession] = None
+    ) -> UserPermission:
+        """
+        Return the roles, permissions and menus of a user.
+
+        The returned value is shared by all callers and must not be mutated.
+        """
+        user_permission = self.cache.get(user_id)
+        if user_permission is not None:
+            return user_permission
+
+        versions = self.cache.versions()
+        if UserInfo.is_admin(user_id):
+            user_permission = await self._load_admin(db_session=db_session)
+        else:
+            user_permission = await self._load_user(
+                user_id=user_id, db_session=db_session
+            )
+        self.cache.set(user_id, user_permission, versions=versions)
+        return user_permission
+
+    def evict(self, user_id: Optional[int] = None) -> None:
+        """Drop the cached permissions of a user, of all users if None."""
+        if user_id is None:
+            self.cache.clear()
+        else:
+            self.cache.delete(user_id)
+
+    @staticmethod
+    async def _load_admin(
+        *, db_session: Optional[AsyncSession]
+    ) -> UserPermission:
+        # Cached under the current table versions, a lagging replica could
+        # pin stale rows to them
+        menu_list, _ = await menuMapper.select_by_parent_id(
+            use_primary=True, db_session=db_session
+        )
+        return UserPermission(
+            roles={ADMIN_ROLE},
+            role_models=[],
+            permissions=[ADMIN_PERMISSION],
+            menus=[MenuPage(**menu.model_dump()) for menu in menu_list],
+        )
+
+    @staticmethod
+    async def _load_user(
+        *, user_id: int, db_session: Optional[AsyncSession]
+    ) -> UserPermission:
+        rows = await userRoleMapper.select_role_menus_by_userid(
+            user_id=user_id, use_primary=True, db_session=db_session
+        )
+        role_map: Dict[int, RoleModel] = {}
+        menu_map: Dict[int, MenuPage] = {}
+        for role, menu in rows:
+            role_map.setdefault(role.id, role)
+            if menu is not None and menu.id not in menu_map:
+                menu_map[menu.id] = MenuPage(**menu.model_dump())
+        menus = list(menu_map.values())
+        return UserPermission(
+            roles={role.name for role in role_map.values()},
+            role_models=list(role_map.values()),
+            permissions=[menu.permission for menu in menus if menu.permission],
+            menus=menus,
+        )
+
+
+security_config = config_manager.load_security_config()
+permissionManager = PermissionManager(
+    ttl=security_config.permission_cache_ttl,
+    maxsize=security_config.permission_cache_size,
+)
@@ -1,11 +1,45 @@
 """DictData mapper"""
 
+from datetime import datetime
+from typing import List, Optional, Union
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
 from src.main.app.model.sys_dict_data_model import DictDataModel
 
 
 class DictDataMapper(SqlModelMapper[DictDataModel]):
-    pass
+    async def select_ids(
+        self,
+        *,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[int]:
+        db_session = db_session or self._read_session(use_primary)
+        result = await db_session.exec(select(DictDataModel.id))
+        return result.all()
+
+    async def select_modified_since(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[DictDataModel]:
+        """
+        Select dict data updated at or after `since`, all rows if None.
+        """
+        db_session = db_session or self._read_session(use_primary)
+        query = select(DictDataModel)
+        if since is not None:
+            query = query.where(
+                (DictDataModel.update_time >= since)
+                | (DictDataModel.update_time.is_(None))
+            )
+        result = await db_session.exec(query)
+        return result.all()
 
 
 dictDataMapper = DictDataMapper(DictDataModel)
@@ -1,11 +1,29 @@
 """DictType mapper"""
 
+from typing import List, Union
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
 from src.main.app.model.sys_dict_type_model import DictTypeModel
 
 
 class DictTypeMapper(SqlModelMapper[DictTypeModel]):
-    pass
+    async def select_disabled_types(
+        self,
+        *,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[str]:
+        """
+        Select the type codes of the disabled dict types.
+        """
+        db_session = db_session or self._read_session(use_primary)
+        result = await db_session.exec(
+            select(DictTypeModel.type).where(DictTypeModel.status == 0)
+        )
+        return result.all()
 
 
 dictTypeMapper = DictTypeMapper(DictTypeModel)
@@ -1,11 +1,45 @@
 """Menu mapper"""
 
+from datetime import datetime
+from typing import List, Optional, Union
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
 from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
 from src.main.app.model.sys_menu_model import MenuModel
 
 
 class MenuMapper(SqlModelMapper[MenuModel]):
-    pass
+    async def select_ids(
+        self,
+        *,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[int]:
+        db_session = db_session or self._read_session(use_primary)
+        result = await db_session.exec(select(MenuModel.id))
+        return result.all()
+
+    async def select_modified_since(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[MenuModel]:
+        """
+        Select menus updated at or after `since`, all menus if None.
+        """
+        db_session = db_session or self._read_session(use_primary)
+        query = select(MenuModel)
+        if since is not None:
+            query = query.where(
+                (MenuModel.update_time >= since)
+                | (MenuModel.update_time.is_(None))
+            )
+        result = await db_session.exec(query)
+        return result.all()
 
 
 menuMapper = MenuMapper(MenuModel)
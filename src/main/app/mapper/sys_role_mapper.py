@@ -14,12 +14,25 @@ class RoleMapper(SqlModelMapper[RoleModel]):
         self,
         *,
         user_ids: List[int],
+        use_primary: bool = False,
         db_session: Union[AsyncSession, None] = None,
     ) -> Union[RoleModel, None]:
-        db_session = db_session or self.db.session
+        db_session = db_session or self._read_session(use_primary)
         query = select(RoleModel).where(RoleModel.id.in_(user_ids))
         result = await db_session.exec(query)
         return result.all()
 
+    async def select_by_role_ids(
+        self,
+        *,
+        role_ids: List[int],
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[RoleModel]:
+        db_session = db_session or self._read_session(use_primary)
+        query = select(RoleModel).where(RoleModel.id.in_(role_ids))
+        result = await db_session.exec(query)
+        return result.all()
+
 
 roleMapper = RoleMapper(RoleModel)
@@ -13,10 +13,11 @@ class RoleMenuMapper(SqlModelMapper[RoleMenuModel]):
         self,
         *,
         role_ids: List[int],
+        use_primary: bool = False,
         db_session: Union[AsyncSession, None] = None,
-    ) -> Union[RoleMenuModel, None]:
-        db_session = db_session or self.db.session
-        query = select(RoleMenuModel).where(RoleMenuModel.id.in_(role_ids))
+    ) -> List[RoleMenuModel]:
+        db_session = db_session or self._read_session(use_primary)
+        query = select(RoleMenuModel).where(RoleMenuModel.role_id.in_(role_ids))
         result = await db_session.exec(query)
         return result.all()
 
@@ -1,22 +1,54 @@
 """UserRole mapper"""
 
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
+from src.main.app.model.sys_menu_model import MenuModel
+from src.main.app.model.sys_role_menu_model import RoleMenuModel
+from src.main.app.model.sys_role_model import RoleModel
 from src.main.app.model.sys_user_role_model import UserRoleModel
 
 
 class UserRoleMapper(SqlModelMapper[UserRoleModel]):
     async def select_by_userid(
-        self, *, user_id: int, db_session: Union[AsyncSession, None] = None
+        self,
+        *,
+        user_id: int,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
     ) -> Union[UserRoleModel, None]:
-        db_session = db_session or self.db.session
+        db_session = db_session or self._read_session(use_primary)
         query = select(UserRoleModel).where(UserRoleModel.user_id == user_id)
         result = await db_session.exec(query)
         return result.all()
 
+    async def select_role_menus_by_userid(
+        self,
+        *,
+        user_id: int,
+        use_primary: bool = False,
+        db_session: Union[AsyncSession, None] = None,
+    ) -> List[Tuple[RoleModel, Optional[MenuModel]]]:
+        """
+        Select the user's roles joined with their menus in one round trip.
+
+        Returns one (role, menu) row per role menu, roles without menus
+        appear once with a None menu.
+        """
+        db_session = db_session or self._read_session(use_primary)
+        query = (
+            select(RoleModel, MenuModel)
+            .select_from(UserRoleModel)
+            .join(RoleModel, RoleModel.id == UserRoleModel.role_id)
+            .outerjoin(RoleMenuModel, RoleMenuModel.role_id == RoleModel.id)
+            .outerjoin(MenuModel, MenuModel.id == RoleMenuModel.menu_id)
+            .where(UserRoleModel.user_id == user_id)
+        )
+        result = await db_session.exec(query)
+        return result.all()
+
 
 userRoleMapper = UserRoleMapper(UserRoleModel)
@@ -1,7 +1,7 @@
 """DictData schema"""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 from src.main.app.core.schema import BasePage
 
@@ -170,3 +170,14 @@ class DictDataDetail(BaseModel):
     comment: Optional[str] = None
     # 创建时间
     create_time: Optional[datetime] = None
+
+
+class DictDataLookup(BaseModel):
+    """
+    按字典类型查询的字典数据
+    """
+
+    # 字典类型到按排序排列的字典数据
+    items: Dict[str, List[DictDataPage]]
+    # 内容版本, 用作 ETag
+    etag: str
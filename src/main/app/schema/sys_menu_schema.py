@@ -41,6 +41,15 @@ class MenuPage(BaseModel):
     comment: Optional[str] = None
 
 
+class MenuTree(MenuPage):
+    """
+    系统菜单树节点
+    """
+
+    # 子菜单
+    children: List["MenuTree"] = []
+
+
 class MenuQuery(BasePage):
     """
     系统菜单查询参数
@@ -16,6 +16,14 @@ class LoginForm(BaseModel):
     password: str
 
 
+class RefreshTokenForm(BaseModel):
+    """
+    Refresh token form schema
+    """
+
+    refresh_token: str
+
+
 class UserPage(BaseModel):
     """
     用户信息分页信息
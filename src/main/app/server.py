@@ -6,26 +6,40 @@ handler、jwt, openapi...
 import os
 import subprocess
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
-from src.main.app.core import exception
+from src.main.app.core import exception, metrics
+from src.main.app.core.cache.redis_cache import RedisManager
 from src.main.app.core.config import config_manager
 from src.main.app.core.constant import RESOURCE_DIR
+from src.main.app.core.mapper import table_version
 from src.main.app.core.middleware.db_session_middleware import (
     SQLAlchemyMiddleware,
+    db,
 )
-from src.main.app.core.middleware.jwt_middleware import jwt_middleware
+from src.main.app.core.middleware.jwt_middleware import JWTMiddleware
+from src.main.app.core.middleware.log_middleware import AccessLogMiddleware
+from src.main.app.core.middleware.metrics_middleware import MetricsMiddleware
 from src.main.app.core.openapi import offline
-from src.main.app.core.session.db_engine import get_async_engine
+from src.main.app.core.session.db_engine import (
+    dispose_engines,
+    get_async_engine,
+    get_replica_engines,
+)
+from src.main.app.core.utils import log_util, snowflake_util
 from src.main.app import router
+from src.main.app.manager.dict_index_manager import dictIndexManager
+from src.main.app.manager.export_job_manager import exportJobManager
 
 # Load config
 server_config = config_manager.load_server_config()
 security_config = config_manager.load_security_config()
+database_config = config_manager.load_database_config()
 
 
 # Setup timezone
@@ -36,18 +50,73 @@ else:
     os.environ["TZ"] = server_config.linux_tz
     time.tzset()
 
-# Setup log
-logger.add(
-    server_config.log_file_path,
-    rotation="10 MB",
-    retention="30 days",
-    compression="zip",
-    level="DEBUG" if server_config.debug else "INFO",
-    format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-)
+# Setup log, JSON lines written in batches by a background thread
+log_writer = log_util.setup_logging(server_config)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Give this process a snowflake worker ID no other process runs with
+    lease = None
+    if server_config.snowflake_worker_id >= 0:
+        snowflake_util.global_generator.configure(
+            server_config.snowflake_worker_id,
+            server_config.snowflake_datacenter_id,
+        )
+    elif database_config.enable_redis:
+        # Fails startup rather than risk running with a taken worker ID
+        lease = snowflake_util.WorkerIdLease(
+            datacenter_id=server_config.snowflake_datacenter_id,
+            ttl=server_config.snowflake_lease_ttl,
+        )
+        await lease.acquire()
+    elif server_config.workers > 1:
+        raise RuntimeError(
+            f"{server_config.workers} workers need Redis to lease distinct "
+            f"snowflake worker IDs, enable it or run one worker per process "
+            f"with its own snowflake_worker_id"
+        )
+    else:
+        logger.warning(
+            f"Snowflake worker ID "
+            f"{snowflake_util.global_generator.worker_id} is not leased, "
+            f"other processes writing the same database may use it too"
+        )
+    # Share table versions, writes then invalidate the in-process caches
+    # of every worker
+    if database_config.enable_redis:
+        await table_version.start_sharing(
+            await RedisManager.get_instance(),
+            database_config.cache_invalidation_channel,
+        )
+    # Preload the dictionary index, lookups then never wait on the database
+    try:
+        async with db():
+            await dictIndexManager.refresh()
+    except Exception as e:
+        logger.warning(f"Dictionary index not preloaded: {e}")
+    # Fail the export jobs dead workers left unfinished
+    exportJobManager.recover()
+    try:
+        yield
+    finally:
+        await table_version.stop_sharing()
+        if lease is not None:
+            try:
+                await lease.release()
+            except Exception as e:
+                logger.warning(f"Snowflake worker ID not released: {e}")
+        # Close the pooled connections of this worker's engines
+        await dispose_engines()
+        metrics.mark_process_dead()
+        # Last, so the teardown is logged: the writer thread is a daemon
+        # and would lose the queued records at exit
+        log_writer.stop()
+
 
 # Setup fastapi instance
 app = FastAPI(
+    lifespan=lifespan,
     docs_url=None,
     redoc_url=None,
     title=server_config.name,
@@ -56,7 +125,22 @@ app = FastAPI(
 )
 
 # Register middleware
-app.add_middleware(SQLAlchemyMiddleware, custom_engine=get_async_engine())
+app.add_middleware(
+    SQLAlchemyMiddleware,
+    custom_engine=get_async_engine(),
+    replicas=get_replica_engines(),
+    health_check_interval=database_config.replica_health_interval,
+    profile_sql=database_config.sql_profile,
+    slowest=database_config.sql_profile_slowest,
+    n_plus_one_threshold=database_config.sql_n_plus_one_threshold,
+    exclude_paths=[
+        f"{server_config.api_version}/probe",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/static",
+    ],
+)
 origins = [
     origin.strip() for origin in security_config.backend_cors_origins.split(",")
 ]
@@ -67,7 +151,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.middleware("http")(jwt_middleware)
+app.add_middleware(JWTMiddleware)
+# Outside authentication, so rejected requests are logged with their ID
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=server_config.access_log_sample_rate,
+    slow_ms=server_config.access_log_slow_ms,
+)
+# Outermost, so rejected requests and middleware time are measured too
+app.add_middleware(MetricsMiddleware)
 
 # Register exception handler
 exception.register_exception_handlers(app)
@@ -1,19 +1,27 @@
 """DictData domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import SortEnum, ExportTypeEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.dict_index_manager import dictIndexManager
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_dict_data_mapper import DictDataMapper
 from src.main.app.model.sys_dict_data_model import DictDataModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_dict_data_schema import (
+    DictDataLookup,
     DictDataQuery,
     DictDataPage,
     DictDataDetail,
@@ -40,9 +48,17 @@ class DictDataServiceImpl(
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_dict_data_by_page(
-        self, dict_data_query: DictDataQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        dict_data_query: DictDataQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = [{"field": "sort", "order": SortEnum.ascending}]
+        sort_str = dict_data_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -93,17 +109,38 @@ class DictDataServiceImpl(
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_dict_data_by_page(
+        self, dict_data_query: DictDataQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(dict_data_query)
         records, total = await self.mapper.select_by_ordered_page(
             current=dict_data_query.current,
-            pageSize=dict_data_query.pageSize,
+            page_size=dict_data_query.page_size,
+            count=dict_data_query.count,
+            sort_list=sort_list,
+            cursor=dict_data_query.cursor,
             **filters,
         )
-        if total == 0:
+        if total == 0 and dict_data_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in DictDataModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if dict_data_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=dict_data_query.page_size,
+                sort_list=sort_list,
+                cursor=dict_data_query.cursor,
+            )
         records = [DictDataPage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
     async def get_dict_data_detail(
         self, *, id: int, current_user: CurrentUser
@@ -113,24 +150,43 @@ class DictDataServiceImpl(
             return None
         return DictDataDetail(**dict_data_do.model_dump())
 
+    async def get_dict_data_by_types(
+        self, *, types: List[str], current_user: CurrentUser
+    ) -> DictDataLookup:
+        return await dictIndexManager.lookup(types)
+
     async def export_dict_data_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        dict_data_list: List[DictDataModel] = await self.retrieve_by_ids(
-            ids=ids
+        return await excel_util.stream_export(
+            schema=DictDataPage,
+            file_name="dict_data_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
         )
-        if dict_data_list is None or len(dict_data_list) == 0:
-            return None
-        dict_data_page_list = [
-            DictDataPage(**dict_data.model_dump())
-            for dict_data in dict_data_list
-        ]
-        return await excel_util.export_excel(
+
+    async def create_dict_data_export_job(
+        self,
+        *,
+        dict_data_query: DictDataQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(dict_data_query)
+        return await exportJobManager.submit(
             schema=DictDataPage,
             file_name="dict_data_data_export",
-            data_list=dict_data_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_dict_data(
@@ -155,36 +211,7 @@ class DictDataServiceImpl(
         await self.batch_save(data_list=dict_data_list)
         return [dict_data.id for dict_data in dict_data_list]
 
-    @staticmethod
     async def import_dict_data(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[DictDataCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        dict_data_records = import_df.to_dict(orient="records")
-        if dict_data_records is None or len(dict_data_records) == 0:
-            return None
-        for record in dict_data_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        dict_data_create_list = []
-        for dict_data_record in dict_data_records:
-            try:
-                dict_data_create = DictDataCreate(**dict_data_record)
-                dict_data_create_list.append(dict_data_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in dict_data_record.items()
-                    if k in DictDataCreate.model_fields
-                }
-                dict_data_create = DictDataCreate.model_construct(**valid_data)
-                dict_data_create.err_msg = ValidateService.get_validate_err_msg(
-                    e
-                )
-                dict_data_create_list.append(dict_data_create)
-                return dict_data_create_list
-
-        return dict_data_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=DictDataCreate)
@@ -1,18 +1,25 @@
 """DictType domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
+from src.main.app.core.cache.cached import cached
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_dict_type_mapper import DictTypeMapper
 from src.main.app.model.sys_dict_type_model import DictTypeModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_dict_type_schema import (
     DictTypeQuery,
     DictTypePage,
@@ -40,9 +47,17 @@ class DictTypeServiceImpl(
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_dict_type_by_page(
-        self, dict_type_query: DictTypeQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        dict_type_query: DictTypeQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = None
+        sort_str = dict_type_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -74,18 +89,40 @@ class DictTypeServiceImpl(
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_dict_type_by_page(
+        self, dict_type_query: DictTypeQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(dict_type_query)
         records, total = await self.mapper.select_by_ordered_page(
             current=dict_type_query.current,
-            pageSize=dict_type_query.pageSize,
+            page_size=dict_type_query.page_size,
+            count=dict_type_query.count,
+            sort_list=sort_list,
+            cursor=dict_type_query.cursor,
             **filters,
         )
-        if total == 0:
+        if total == 0 and dict_type_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in DictTypeModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if dict_type_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=dict_type_query.page_size,
+                sort_list=sort_list,
+                cursor=dict_type_query.cursor,
+            )
         records = [DictTypePage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
+    @cached(DictTypeModel.__tablename__)
     async def get_dict_type_detail(
         self, *, id: int, current_user: CurrentUser
     ) -> Optional[DictTypeDetail]:
@@ -95,23 +132,37 @@ class DictTypeServiceImpl(
         return DictTypeDetail(**dict_type_do.model_dump())
 
     async def export_dict_type_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        dict_type_list: List[DictTypeModel] = await self.retrieve_by_ids(
-            ids=ids
+        return await excel_util.stream_export(
+            schema=DictTypePage,
+            file_name="dict_type_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
         )
-        if dict_type_list is None or len(dict_type_list) == 0:
-            return None
-        dict_type_page_list = [
-            DictTypePage(**dict_type.model_dump())
-            for dict_type in dict_type_list
-        ]
-        return await excel_util.export_excel(
+
+    async def create_dict_type_export_job(
+        self,
+        *,
+        dict_type_query: DictTypeQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(dict_type_query)
+        return await exportJobManager.submit(
             schema=DictTypePage,
             file_name="dict_type_data_export",
-            data_list=dict_type_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_dict_type(
@@ -136,36 +187,7 @@ class DictTypeServiceImpl(
         await self.batch_save(data_list=dict_type_list)
         return [dict_type.id for dict_type in dict_type_list]
 
-    @staticmethod
     async def import_dict_type(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[DictTypeCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        dict_type_records = import_df.to_dict(orient="records")
-        if dict_type_records is None or len(dict_type_records) == 0:
-            return None
-        for record in dict_type_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        dict_type_create_list = []
-        for dict_type_record in dict_type_records:
-            try:
-                dict_type_create = DictTypeCreate(**dict_type_record)
-                dict_type_create_list.append(dict_type_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in dict_type_record.items()
-                    if k in DictTypeCreate.model_fields
-                }
-                dict_type_create = DictTypeCreate.model_construct(**valid_data)
-                dict_type_create.err_msg = ValidateService.get_validate_err_msg(
-                    e
-                )
-                dict_type_create_list.append(dict_type_create)
-                return dict_type_create_list
-
-        return dict_type_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=DictTypeCreate)
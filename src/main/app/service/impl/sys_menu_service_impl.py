@@ -1,23 +1,32 @@
 """Menu domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
+from src.main.app.core.cache.cached import cached
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import SortEnum, ExportTypeEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.menu_tree_manager import menuTreeManager
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_menu_mapper import MenuMapper
 from src.main.app.model.sys_menu_model import MenuModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_menu_schema import (
     MenuQuery,
     MenuPage,
     MenuDetail,
     MenuCreate,
+    MenuTree,
 )
 from src.main.app.core.service.impl.base_service_impl import BaseServiceImpl
 from src.main.app.service.sys_menu_service import MenuService
@@ -38,9 +47,17 @@ class MenuServiceImpl(BaseServiceImpl[MenuMapper, MenuModel], MenuService):
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_menu_by_page(
-        self, menu_query: MenuQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        menu_query: MenuQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = [{"field": "sort", "order": SortEnum.ascending}]
+        sort_str = menu_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -83,16 +100,45 @@ class MenuServiceImpl(BaseServiceImpl[MenuMapper, MenuModel], MenuService):
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_menu_by_page(
+        self, menu_query: MenuQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(menu_query)
         records, total = await self.mapper.select_by_ordered_page(
-            current=menu_query.current, pageSize=menu_query.pageSize, **filters
+            current=menu_query.current,
+            page_size=menu_query.page_size,
+            count=menu_query.count,
+            sort_list=sort_list,
+            cursor=menu_query.cursor,
+            **filters,
         )
-        if total == 0:
+        if total == 0 and menu_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in MenuModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if menu_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=menu_query.page_size,
+                sort_list=sort_list,
+                cursor=menu_query.cursor,
+            )
         records = [MenuPage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+
+    async def get_menu_tree(
+        self, *, id: Optional[int] = None, current_user: CurrentUser
+    ) -> List[MenuTree]:
+        return await menuTreeManager.get_tree(id=id)
 
+    @cached(MenuModel.__tablename__)
     async def get_menu_detail(
         self, *, id: int, current_user: CurrentUser
     ) -> Optional[MenuDetail]:
@@ -102,18 +148,37 @@ class MenuServiceImpl(BaseServiceImpl[MenuMapper, MenuModel], MenuService):
         return MenuDetail(**menu_do.model_dump())
 
     async def export_menu_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        menu_list: List[MenuModel] = await self.retrieve_by_ids(ids=ids)
-        if menu_list is None or len(menu_list) == 0:
-            return None
-        menu_page_list = [MenuPage(**menu.model_dump()) for menu in menu_list]
-        return await excel_util.export_excel(
+        return await excel_util.stream_export(
+            schema=MenuPage,
+            file_name="menu_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
+        )
+
+    async def create_menu_export_job(
+        self,
+        *,
+        menu_query: MenuQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(menu_query)
+        return await exportJobManager.submit(
             schema=MenuPage,
             file_name="menu_data_export",
-            data_list=menu_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_menu(
@@ -133,34 +198,7 @@ class MenuServiceImpl(BaseServiceImpl[MenuMapper, MenuModel], MenuService):
         await self.batch_save(data_list=menu_list)
         return [menu.id for menu in menu_list]
 
-    @staticmethod
     async def import_menu(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[MenuCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        menu_records = import_df.to_dict(orient="records")
-        if menu_records is None or len(menu_records) == 0:
-            return None
-        for record in menu_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        menu_create_list = []
-        for menu_record in menu_records:
-            try:
-                menu_create = MenuCreate(**menu_record)
-                menu_create_list.append(menu_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in menu_record.items()
-                    if k in MenuCreate.model_fields
-                }
-                menu_create = MenuCreate.model_construct(**valid_data)
-                menu_create.err_msg = ValidateService.get_validate_err_msg(e)
-                menu_create_list.append(menu_create)
-                return menu_create_list
-
-        return menu_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=MenuCreate)
@@ -1,18 +1,24 @@
 """RoleMenu domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_role_menu_mapper import RoleMenuMapper
 from src.main.app.model.sys_role_menu_model import RoleMenuModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_role_menu_schema import (
     RoleMenuQuery,
     RoleMenuPage,
@@ -40,9 +46,17 @@ class RoleMenuServiceImpl(
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_role_menu_by_page(
-        self, role_menu_query: RoleMenuQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        role_menu_query: RoleMenuQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = None
+        sort_str = role_menu_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -68,17 +82,38 @@ class RoleMenuServiceImpl(
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_role_menu_by_page(
+        self, role_menu_query: RoleMenuQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(role_menu_query)
         records, total = await self.mapper.select_by_ordered_page(
             current=role_menu_query.current,
-            pageSize=role_menu_query.pageSize,
+            page_size=role_menu_query.page_size,
+            count=role_menu_query.count,
+            sort_list=sort_list,
+            cursor=role_menu_query.cursor,
             **filters,
         )
-        if total == 0:
+        if total == 0 and role_menu_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in RoleMenuModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if role_menu_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=role_menu_query.page_size,
+                sort_list=sort_list,
+                cursor=role_menu_query.cursor,
+            )
         records = [RoleMenuPage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
     async def get_role_menu_detail(
         self, *, id: int, current_user: CurrentUser
@@ -89,23 +124,37 @@ class RoleMenuServiceImpl(
         return RoleMenuDetail(**role_menu_do.model_dump())
 
     async def export_role_menu_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        role_menu_list: List[RoleMenuModel] = await self.retrieve_by_ids(
-            ids=ids
+        return await excel_util.stream_export(
+            schema=RoleMenuPage,
+            file_name="role_menu_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
         )
-        if role_menu_list is None or len(role_menu_list) == 0:
-            return None
-        role_menu_page_list = [
-            RoleMenuPage(**role_menu.model_dump())
-            for role_menu in role_menu_list
-        ]
-        return await excel_util.export_excel(
+
+    async def create_role_menu_export_job(
+        self,
+        *,
+        role_menu_query: RoleMenuQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(role_menu_query)
+        return await exportJobManager.submit(
             schema=RoleMenuPage,
             file_name="role_menu_data_export",
-            data_list=role_menu_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_role_menu(
@@ -130,36 +179,7 @@ class RoleMenuServiceImpl(
         await self.batch_save(data_list=role_menu_list)
         return [role_menu.id for role_menu in role_menu_list]
 
-    @staticmethod
     async def import_role_menu(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[RoleMenuCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        role_menu_records = import_df.to_dict(orient="records")
-        if role_menu_records is None or len(role_menu_records) == 0:
-            return None
-        for record in role_menu_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        role_menu_create_list = []
-        for role_menu_record in role_menu_records:
-            try:
-                role_menu_create = RoleMenuCreate(**role_menu_record)
-                role_menu_create_list.append(role_menu_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in role_menu_record.items()
-                    if k in RoleMenuCreate.model_fields
-                }
-                role_menu_create = RoleMenuCreate.model_construct(**valid_data)
-                role_menu_create.err_msg = ValidateService.get_validate_err_msg(
-                    e
-                )
-                role_menu_create_list.append(role_menu_create)
-                return role_menu_create_list
-
-        return role_menu_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=RoleMenuCreate)
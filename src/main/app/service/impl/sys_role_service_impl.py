@@ -1,18 +1,24 @@
 """Role domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportTypeEnum, SortEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_role_mapper import RoleMapper
 from src.main.app.model.sys_role_model import RoleModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_role_schema import (
     RoleQuery,
     RolePage,
@@ -38,9 +44,17 @@ class RoleServiceImpl(BaseServiceImpl[RoleMapper, RoleModel], RoleService):
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_role_by_page(
-        self, role_query: RoleQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        role_query: RoleQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = [{"field": "sort", "order": SortEnum.ascending}]
+        sort_str = role_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -73,15 +87,38 @@ class RoleServiceImpl(BaseServiceImpl[RoleMapper, RoleModel], RoleService):
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_role_by_page(
+        self, role_query: RoleQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(role_query)
         records, total = await self.mapper.select_by_ordered_page(
-            current=role_query.current, pageSize=role_query.pageSize, **filters
+            current=role_query.current,
+            page_size=role_query.page_size,
+            count=role_query.count,
+            sort_list=sort_list,
+            cursor=role_query.cursor,
+            **filters,
         )
-        if total == 0:
+        if total == 0 and role_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in RoleModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if role_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=role_query.page_size,
+                sort_list=sort_list,
+                cursor=role_query.cursor,
+            )
         records = [RolePage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
     async def get_role_detail(
         self, *, id: int, current_user: CurrentUser
@@ -92,18 +129,37 @@ class RoleServiceImpl(BaseServiceImpl[RoleMapper, RoleModel], RoleService):
         return RoleDetail(**role_do.model_dump())
 
     async def export_role_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        role_list: List[RoleModel] = await self.retrieve_by_ids(ids=ids)
-        if role_list is None or len(role_list) == 0:
-            return None
-        role_page_list = [RolePage(**role.model_dump()) for role in role_list]
-        return await excel_util.export_excel(
+        return await excel_util.stream_export(
+            schema=RolePage,
+            file_name="role_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
+        )
+
+    async def create_role_export_job(
+        self,
+        *,
+        role_query: RoleQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(role_query)
+        return await exportJobManager.submit(
             schema=RolePage,
             file_name="role_data_export",
-            data_list=role_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_role(
@@ -123,34 +179,7 @@ class RoleServiceImpl(BaseServiceImpl[RoleMapper, RoleModel], RoleService):
         await self.batch_save(data_list=role_list)
         return [role.id for role in role_list]
 
-    @staticmethod
     async def import_role(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[RoleCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        role_records = import_df.to_dict(orient="records")
-        if role_records is None or len(role_records) == 0:
-            return None
-        for record in role_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        role_create_list = []
-        for role_record in role_records:
-            try:
-                role_create = RoleCreate(**role_record)
-                role_create_list.append(role_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in role_record.items()
-                    if k in RoleCreate.model_fields
-                }
-                role_create = RoleCreate.model_construct(**valid_data)
-                role_create.err_msg = ValidateService.get_validate_err_msg(e)
-                role_create_list.append(role_create)
-                return role_create_list
-
-        return role_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=RoleCreate)
@@ -1,18 +1,24 @@
 """UserRole domain service impl"""
 
 from __future__ import annotations
-import io
-from typing import Optional, List
-from typing import Union
-import pandas as pd
+import json
+from typing import Optional, List, Any, Dict, Tuple
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_user_role_mapper import UserRoleMapper
 from src.main.app.model.sys_user_role_model import UserRoleModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.schema.sys_user_role_schema import (
     UserRoleQuery,
     UserRolePage,
@@ -40,9 +46,17 @@ class UserRoleServiceImpl(
         super().__init__(mapper=mapper)
         self.mapper = mapper
 
-    async def get_user_role_by_page(
-        self, user_role_query: UserRoleQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        user_role_query: UserRoleQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
+        sort_list = None
+        sort_str = user_role_query.sort_str
+        if sort_str is not None:
+            sort_list = json.loads(sort_str)
         eq = {}
         ne = {}
         gt = {}
@@ -68,17 +82,38 @@ class UserRoleServiceImpl(
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    async def get_user_role_by_page(
+        self, user_role_query: UserRoleQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(user_role_query)
         records, total = await self.mapper.select_by_ordered_page(
             current=user_role_query.current,
-            pageSize=user_role_query.pageSize,
+            page_size=user_role_query.page_size,
+            count=user_role_query.count,
+            sort_list=sort_list,
+            cursor=user_role_query.cursor,
             **filters,
         )
-        if total == 0:
+        if total == 0 and user_role_query.count:
             return PageResult(records=[], total=total)
-        if "sort" in UserRoleModel.model_fields and total > 1:
-            records.sort(key=lambda x: x["sort"])
+        next_cursor, prev_cursor = None, None
+        if user_role_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=user_role_query.page_size,
+                sort_list=sort_list,
+                cursor=user_role_query.cursor,
+            )
         records = [UserRolePage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
     async def get_user_role_detail(
         self, *, id: int, current_user: CurrentUser
@@ -89,23 +124,37 @@ class UserRoleServiceImpl(
         return UserRoleDetail(**user_role_do.model_dump())
 
     async def export_user_role_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        user_role_list: List[UserRoleModel] = await self.retrieve_by_ids(
-            ids=ids
+        return await excel_util.stream_export(
+            schema=UserRolePage,
+            file_name="user_role_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
         )
-        if user_role_list is None or len(user_role_list) == 0:
-            return None
-        user_role_page_list = [
-            UserRolePage(**user_role.model_dump())
-            for user_role in user_role_list
-        ]
-        return await excel_util.export_excel(
+
+    async def create_user_role_export_job(
+        self,
+        *,
+        user_role_query: UserRoleQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(user_role_query)
+        return await exportJobManager.submit(
             schema=UserRolePage,
             file_name="user_role_data_export",
-            data_list=user_role_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_user_role(
@@ -130,36 +179,7 @@ class UserRoleServiceImpl(
         await self.batch_save(data_list=user_role_list)
         return [user_role.id for user_role in user_role_list]
 
-    @staticmethod
     async def import_user_role(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[UserRoleCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        user_role_records = import_df.to_dict(orient="records")
-        if user_role_records is None or len(user_role_records) == 0:
-            return None
-        for record in user_role_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        user_role_create_list = []
-        for user_role_record in user_role_records:
-            try:
-                user_role_create = UserRoleCreate(**user_role_record)
-                user_role_create_list.append(user_role_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in user_role_record.items()
-                    if k in UserRoleCreate.model_fields
-                }
-                user_role_create = UserRoleCreate.model_construct(**valid_data)
-                user_role_create.err_msg = ValidateService.get_validate_err_msg(
-                    e
-                )
-                user_role_create_list.append(user_role_create)
-                return user_role_create_list
-
-        return user_role_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=UserRoleCreate)
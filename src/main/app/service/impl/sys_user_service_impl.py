@@ -2,36 +2,41 @@
 
 from __future__ import annotations
 
-import io
 import json
 from datetime import timedelta, datetime
-from typing import Optional, List, Set, Tuple
-from typing import Union
+from typing import Optional, List, Set, Tuple, Any, Dict
 
-import pandas as pd
 from fastapi import UploadFile
+from jose import ExpiredSignatureError, JWTError
 from starlette.responses import StreamingResponse
 
 from src.main.app.core import security
+from src.main.app.core.cache.cached import cached
 from src.main.app.core.config import config_manager
 from src.main.app.core.constant import FilterOperators
-from src.main.app.core.enums import TokenTypeEnum
-from src.main.app.core.schema import PageResult, Token, CurrentUser
+from src.main.app.core.enums import TokenTypeEnum, ExportTypeEnum
+from src.main.app.core.security.token_denylist import TokenRevokedError
+from src.main.app.core.schema import (
+    PageResult,
+    Token,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+    SortItem,
+)
 from src.main.app.core.service.impl.base_service_impl import BaseServiceImpl
+from src.main.app.core.mapper.impl.counter import is_exact
 from src.main.app.core.utils import excel_util
-from src.main.app.core.utils.validate_util import ValidateService
 from src.main.app.enums import AuthErrorCode
 from src.main.app.exception import AuthException
-from src.main.app.mapper.sys_menu_mapper import menuMapper
-from src.main.app.mapper.sys_role_mapper import roleMapper
-from src.main.app.mapper.sys_role_menu_mapper import roleMenuMapper
+from src.main.app.manager.permission_manager import (
+    UserPermission,
+    permissionManager,
+)
+from src.main.app.manager.export_job_manager import exportJobManager
 from src.main.app.mapper.sys_user_mapper import UserMapper
-from src.main.app.mapper.sys_user_role_mapper import userRoleMapper
-from src.main.app.model.sys_menu_model import MenuModel
-from src.main.app.model.sys_role_menu_model import RoleMenuModel
 from src.main.app.model.sys_role_model import RoleModel
 from src.main.app.model.sys_user_model import UserModel
-from src.main.app.model.sys_user_role_model import UserRoleModel
 from src.main.app.schema.sys_menu_schema import MenuPage
 from src.main.app.schema.sys_user_schema import (
     UserQuery,
@@ -39,7 +44,6 @@ from src.main.app.schema.sys_user_schema import (
     UserDetail,
     UserCreate,
     LoginForm,
-    UserInfo,
 )
 from src.main.app.service.sys_user_service import UserService
 
@@ -68,7 +72,9 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
             minutes=security_config.access_token_expire_minutes
         )
         access_token = security.create_token(
-            subject=user_id, token_type=TokenTypeEnum.access
+            subject=user_id,
+            token_type=TokenTypeEnum.access,
+            expires_delta=access_token_expires,
         )
 
         # generate refresh token
@@ -110,13 +116,69 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
         username: str = login_form.username
 
         user_record = await self.mapper.get_user_by_username(username=username)
-        if user_record is None or not security.verify_password(
+        if user_record is None or not await security.verify_password(
             login_form.password, user_record.password
         ):
             raise AuthException(AuthErrorCode.AUTH_FAILED)
-        user_record.status
+        if security.password_needs_rehash(user_record.password):
+            # Upgrade the stored hash while the plain password is at hand
+            await self.mapper.update_by_id(
+                data=UserModel(
+                    id=user_record.id,
+                    password=await security.get_password_hash(
+                        login_form.password
+                    ),
+                )
+            )
         return await self.generate_tokens(user_id=user_record.id)
 
+    async def refresh_tokens(self, *, refresh_token: str) -> Token:
+        """
+        Rotate a refresh token: revoke it and issue a new token pair.
+
+        Args:
+            refresh_token (str): The refresh token to rotate.
+
+        Returns:
+            Token: The new access token and refresh token.
+        """
+        try:
+            claims = await security.verify_token(
+                refresh_token, TokenTypeEnum.refresh
+            )
+        except ExpiredSignatureError:
+            raise AuthException(AuthErrorCode.TOKEN_EXPIRED)
+        except TokenRevokedError:
+            raise AuthException(AuthErrorCode.TOKEN_REVOKED)
+        except JWTError:
+            raise AuthException(AuthErrorCode.INVALID_TOKEN)
+        # A refresh token is used once, of concurrent or replayed uses
+        # only the first claim succeeds
+        if not await security.claim_token(claims):
+            raise AuthException(AuthErrorCode.TOKEN_REVOKED)
+        return await self.generate_tokens(user_id=int(claims["sub"]))
+
+    async def logout(
+        self, *, access_token: str, refresh_token: Optional[str] = None
+    ) -> None:
+        """
+        Revoke the access token and, if given, the refresh token.
+
+        Args:
+            access_token (str): The access token of the session.
+            refresh_token (Optional[str]): The refresh token of the session.
+        """
+        for token in (access_token, refresh_token):
+            if token is None:
+                continue
+            try:
+                claims = security.decode_token(token)
+            except JWTError:
+                # Expired or invalid tokens are unusable already
+                continue
+            await security.revoke_token(claims)
+
+    @cached(UserModel.__tablename__)
     async def find_by_id(self, id: int) -> Optional[UserPage]:
         """
         Retrieve a user by ID.
@@ -130,9 +192,13 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
         user_record = await self.mapper.select_by_id(id=id)
         return UserPage(**user_record.model_dump()) if user_record else None
 
-    async def get_user_by_page(
-        self, user_query: UserQuery, current_user: CurrentUser
-    ) -> PageResult:
+    @staticmethod
+    def _get_query_spec(
+        user_query: UserQuery,
+    ) -> Tuple[Optional[List[SortItem]], Dict[str, Dict[str, Any]]]:
+        """
+        Return the sort list and the filters of a page query.
+        """
         sort_list = None
         sort_str = user_query.sort_str
         if sort_str is not None:
@@ -171,18 +237,41 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
             FilterOperators.BETWEEN: between,
             FilterOperators.LIKE: like,
         }
+        return sort_list, filters
+
+    @cached(UserModel.__tablename__)
+    async def get_user_by_page(
+        self, user_query: UserQuery, current_user: CurrentUser
+    ) -> PageResult:
+        sort_list, filters = self._get_query_spec(user_query)
         records, total = await self.mapper.select_by_ordered_page(
             current=user_query.current,
             page_size=user_query.page_size,
             count=user_query.count,
             sort_list=sort_list,
+            cursor=user_query.cursor,
             **filters,
         )
         if total == 0 and user_query.count:
             return PageResult(records=[], total=total)
+        next_cursor, prev_cursor = None, None
+        if user_query.cursor is not None:
+            next_cursor, prev_cursor = self.mapper.get_page_cursors(
+                data_list=records,
+                page_size=user_query.page_size,
+                sort_list=sort_list,
+                cursor=user_query.cursor,
+            )
         records = [UserPage(**record.model_dump()) for record in records]
-        return PageResult(records=records, total=total)
+        return PageResult(
+            records=records,
+            total=total,
+            total_exact=is_exact(total),
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
 
+    @cached(UserModel.__tablename__)
     async def get_user_detail(
         self, *, id: int, current_user: CurrentUser
     ) -> Optional[UserDetail]:
@@ -192,18 +281,37 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
         return UserDetail(**user_do.model_dump())
 
     async def export_user_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]:
         if ids is None or len(ids) == 0:
             return None
-        user_list: List[UserModel] = await self.retrieve_by_ids(ids=ids)
-        if user_list is None or len(user_list) == 0:
-            return None
-        user_page_list = [UserPage(**user.model_dump()) for user in user_list]
-        return await excel_util.export_excel(
+        return await excel_util.stream_export(
+            schema=UserPage,
+            file_name="user_data_export",
+            chunks=self.mapper.select_stream(ids=ids),
+            export_type=export_type,
+        )
+
+    async def create_user_export_job(
+        self,
+        *,
+        user_query: UserQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob:
+        sort_list, filters = self._get_query_spec(user_query)
+        return await exportJobManager.submit(
             schema=UserPage,
             file_name="user_data_export",
-            data_list=user_page_list,
+            chunks_factory=lambda: self.mapper.select_stream(
+                sort_list=sort_list, **filters
+            ),
+            export_type=export_type,
+            owner_id=current_user.user_id,
         )
 
     async def create_user(
@@ -223,67 +331,18 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
         await self.batch_save(data_list=user_list)
         return [user.id for user in user_list]
 
-    @staticmethod
     async def import_user(
-        *, file: UploadFile, current_user: CurrentUser
-    ) -> Union[List[UserCreate], None]:
-        contents = await file.read()
-        import_df = pd.read_excel(io.BytesIO(contents))
-        import_df = import_df.fillna("")
-        user_records = import_df.to_dict(orient="records")
-        if user_records is None or len(user_records) == 0:
-            return None
-        for record in user_records:
-            for key, value in record.items():
-                if value == "":
-                    record[key] = None
-        user_create_list = []
-        for user_record in user_records:
-            try:
-                user_create = UserCreate(**user_record)
-                user_create_list.append(user_create)
-            except Exception as e:
-                valid_data = {
-                    k: v
-                    for k, v in user_record.items()
-                    if k in UserCreate.model_fields
-                }
-                user_create = UserCreate.model_construct(**valid_data)
-                user_create.err_msg = ValidateService.get_validate_err_msg(e)
-                user_create_list.append(user_create)
-                return user_create_list
-
-        return user_create_list
+        self, *, file: UploadFile, current_user: CurrentUser
+    ) -> ImportResult:
+        return await self.import_data(file=file, schema=UserCreate)
 
     async def get_roles(self, id: int) -> Tuple[Set[str], List[RoleModel]]:
         """
         Get user's roles by user ID.
         Returns a set of role names and a list of role models.
         """
-        roles: Set[str] = set()
-        role_models: List[RoleModel] = []
-
-        # Admin gets automatic 'admin' role
-        if UserInfo.is_admin(id):
-            roles.add("admin")
-        else:
-            # Get roles from database for non-admin users
-            user_roles: List[UserRoleModel] = userRoleMapper.select_by_userid(
-                user_id=id
-            )
-            if not user_roles:
-                return roles, role_models
-
-            role_ids = [user_role.role_id for user_role in user_roles]
-            role_models = roleMapper.select_by_role_ids(role_ids=role_ids)
-            if not role_models:
-                return roles, role_models
-
-            # Extract role names from role models
-            role_names = [role.name for role in role_models]
-            roles.update(role_names)
-
-        return roles, role_models
+        user_permission = await self.get_user_permission(id=id)
+        return user_permission.roles, user_permission.role_models
 
     async def get_menus(
         self, id: int, role_models: List[RoleModel] = None
@@ -292,32 +351,12 @@ class UserServiceImpl(BaseServiceImpl[UserMapper, UserModel], UserService):
         Get accessible menus for user based on their roles.
         Returns a list of menu pages.
         """
-        menus: List[MenuPage] = []
-
-        # Admin gets all menus
-        if UserInfo.is_admin(id):
-            menu_list, total_count = await menuMapper.select_by_parent_id()
-            if total_count == 0:
-                return menus
-            menus = [MenuPage(**menu.model_dump()) for menu in menu_list]
-            return menus
-
-        # Return empty if no roles provided for non-admin
-        if not role_models:
-            return menus
-
-        # Get menus associated with user's roles
-        role_ids = [role_model.id for role_model in role_models]
-        role_menu_records: List[RoleMenuModel] = (
-            roleMenuMapper.select_by_role_ids(role_ids=role_ids)
-        )
-        if not role_menu_records:
-            return menus
+        user_permission = await self.get_user_permission(id=id)
+        return user_permission.menus
 
-        # Convert menu models to menu pages
-        menu_id_list = [
-            role_menu_record.menu_id for role_menu_record in role_menu_records
-        ]
-        menu_list: List[MenuModel] = menuMapper.select_by_ids(ids=menu_id_list)
-        menus = [MenuPage(**menu.model_dump()) for menu in menu_list]
-        return menus
+    async def get_user_permission(self, id: int) -> UserPermission:
+        """
+        Get user's roles, permissions and menus, resolved with one joined
+        query and cached until the permission tables change.
+        """
+        return await permissionManager.get_user_permission(user_id=id)
@@ -6,8 +6,15 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_dict_data_model import DictDataModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_dict_data_schema import (
+    DictDataLookup,
     DictDataQuery,
     DictDataDetail,
     DictDataCreate,
@@ -26,11 +33,29 @@ class DictDataService(BaseService[DictDataModel], ABC):
         self, *, id: int, current_user: CurrentUser
     ) -> Optional[DictDataDetail]: ...
 
+    @abstractmethod
+    async def get_dict_data_by_types(
+        self, *, types: List[str], current_user: CurrentUser
+    ) -> DictDataLookup: ...
+
     @abstractmethod
     async def export_dict_data_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_dict_data_export_job(
+        self,
+        *,
+        dict_data_query: DictDataQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_dict_data(
         self, *, dict_data_create: DictDataCreate, current_user: CurrentUser
@@ -47,4 +72,4 @@ class DictDataService(BaseService[DictDataModel], ABC):
     @abstractmethod
     async def import_dict_data(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[DictDataCreate]: ...
+    ) -> ImportResult: ...
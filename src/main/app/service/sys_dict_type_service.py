@@ -6,7 +6,13 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_dict_type_model import DictTypeModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_dict_type_schema import (
     DictTypeQuery,
     DictTypeDetail,
@@ -28,9 +34,22 @@ class DictTypeService(BaseService[DictTypeModel], ABC):
 
     @abstractmethod
     async def export_dict_type_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_dict_type_export_job(
+        self,
+        *,
+        dict_type_query: DictTypeQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_dict_type(
         self, *, dict_type_create: DictTypeCreate, current_user: CurrentUser
@@ -47,4 +66,4 @@ class DictTypeService(BaseService[DictTypeModel], ABC):
     @abstractmethod
     async def import_dict_type(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[DictTypeCreate]: ...
+    ) -> ImportResult: ...
@@ -6,11 +6,18 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_menu_model import MenuModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_menu_schema import (
     MenuQuery,
     MenuDetail,
     MenuCreate,
+    MenuTree,
 )
 from src.main.app.core.service.base_service import BaseService
 
@@ -21,6 +28,11 @@ class MenuService(BaseService[MenuModel], ABC):
         self, *, menu_query: MenuQuery, current_user: CurrentUser
     ) -> PageResult: ...
 
+    @abstractmethod
+    async def get_menu_tree(
+        self, *, id: Optional[int] = None, current_user: CurrentUser
+    ) -> List[MenuTree]: ...
+
     @abstractmethod
     async def get_menu_detail(
         self, *, id: int, current_user: CurrentUser
@@ -28,9 +40,22 @@ class MenuService(BaseService[MenuModel], ABC):
 
     @abstractmethod
     async def export_menu_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_menu_export_job(
+        self,
+        *,
+        menu_query: MenuQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_menu(
         self, *, menu_create: MenuCreate, current_user: CurrentUser
@@ -44,4 +69,4 @@ class MenuService(BaseService[MenuModel], ABC):
     @abstractmethod
     async def import_menu(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[MenuCreate]: ...
+    ) -> ImportResult: ...
@@ -6,7 +6,13 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_role_menu_model import RoleMenuModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_role_menu_schema import (
     RoleMenuQuery,
     RoleMenuDetail,
@@ -28,9 +34,22 @@ class RoleMenuService(BaseService[RoleMenuModel], ABC):
 
     @abstractmethod
     async def export_role_menu_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_role_menu_export_job(
+        self,
+        *,
+        role_menu_query: RoleMenuQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_role_menu(
         self, *, role_menu_create: RoleMenuCreate, current_user: CurrentUser
@@ -47,4 +66,4 @@ class RoleMenuService(BaseService[RoleMenuModel], ABC):
     @abstractmethod
     async def import_role_menu(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[RoleMenuCreate]: ...
+    ) -> ImportResult: ...
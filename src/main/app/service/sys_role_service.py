@@ -6,7 +6,13 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_role_model import RoleModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_role_schema import (
     RoleQuery,
     RoleDetail,
@@ -28,9 +34,22 @@ class RoleService(BaseService[RoleModel], ABC):
 
     @abstractmethod
     async def export_role_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_role_export_job(
+        self,
+        *,
+        role_query: RoleQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_role(
         self, *, role_create: RoleCreate, current_user: CurrentUser
@@ -44,4 +63,4 @@ class RoleService(BaseService[RoleModel], ABC):
     @abstractmethod
     async def import_role(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[RoleCreate]: ...
+    ) -> ImportResult: ...
@@ -6,7 +6,13 @@ from typing import Optional, List
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 from src.main.app.model.sys_user_role_model import UserRoleModel
-from src.main.app.core.schema import PageResult, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.schema.sys_user_role_schema import (
     UserRoleQuery,
     UserRoleDetail,
@@ -28,9 +34,22 @@ class UserRoleService(BaseService[UserRoleModel], ABC):
 
     @abstractmethod
     async def export_user_role_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_user_role_export_job(
+        self,
+        *,
+        user_role_query: UserRoleQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_user_role(
         self, *, user_role_create: UserRoleCreate, current_user: CurrentUser
@@ -47,4 +66,4 @@ class UserRoleService(BaseService[UserRoleModel], ABC):
     @abstractmethod
     async def import_user_role(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[UserRoleCreate]: ...
+    ) -> ImportResult: ...
@@ -8,8 +8,16 @@ from typing import Optional, List, Tuple, Set
 from fastapi import UploadFile
 from starlette.responses import StreamingResponse
 
-from src.main.app.core.schema import PageResult, Token, CurrentUser
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.schema import (
+    PageResult,
+    Token,
+    CurrentUser,
+    ExportJob,
+    ImportResult,
+)
 from src.main.app.core.service.base_service import BaseService
+from src.main.app.manager.permission_manager import UserPermission
 from src.main.app.model.sys_role_model import RoleModel
 from src.main.app.model.sys_user_model import UserModel
 from src.main.app.schema.sys_menu_schema import MenuPage
@@ -26,6 +34,14 @@ class UserService(BaseService[UserModel], ABC):
     @abstractmethod
     async def login(self, *, login_form: LoginForm) -> Token: ...
 
+    @abstractmethod
+    async def refresh_tokens(self, *, refresh_token: str) -> Token: ...
+
+    @abstractmethod
+    async def logout(
+        self, *, access_token: str, refresh_token: Optional[str] = None
+    ) -> None: ...
+
     @abstractmethod
     async def find_by_id(self, *, id: int) -> UserPage: ...
 
@@ -41,9 +57,22 @@ class UserService(BaseService[UserModel], ABC):
 
     @abstractmethod
     async def export_user_page(
-        self, *, ids: List[int], current_user: CurrentUser
+        self,
+        *,
+        ids: List[int],
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
     ) -> Optional[StreamingResponse]: ...
 
+    @abstractmethod
+    async def create_user_export_job(
+        self,
+        *,
+        user_query: UserQuery,
+        export_type: ExportTypeEnum = ExportTypeEnum.XLSX,
+        current_user: CurrentUser,
+    ) -> ExportJob: ...
+
     @abstractmethod
     async def create_user(
         self, *, user_create: UserCreate, current_user: CurrentUser
@@ -57,7 +86,7 @@ class UserService(BaseService[UserModel], ABC):
     @abstractmethod
     async def import_user(
         self, *, file: UploadFile, current_user: CurrentUser
-    ) -> List[UserCreate]: ...
+    ) -> ImportResult: ...
 
     @abstractmethod
     async def get_roles(self, id: int) -> Tuple[Set[str], List[RoleModel]]: ...
@@ -66,3 +95,6 @@ class UserService(BaseService[UserModel], ABC):
     async def get_menus(
         self, id: int, role_models: List[RoleModel]
     ) -> List[MenuPage]: ...
+
+    @abstractmethod
+    async def get_user_permission(self, id: int) -> UserPermission: ...
@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+
+
+def _users(start: int, stop: int, nickname: str = "n"):
+    return [
+        {
+            "username": f"user{index}",
+            "password": "x",
+            "nickname": nickname,
+            "avatar_url": None,
+            "status": 1,
+            "remark": None,
+        }
+        for index in range(start, stop)
+    ]
+
+
+async def _insert_and_upsert():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        # Far more bound parameters than SQLite accepts in one statement
+        row_count = await userMapper.batch_insert(
+            data_list=_users(0, 5000), batch_size=1500, db_session=session
+        )
+        ids = await userMapper.batch_insert(
+            data_list=[UserModel(**user) for user in _users(5000, 5003)],
+            returning=True,
+            db_session=session,
+        )
+        await session.commit()
+        statement = select(UserModel.id).where(
+            UserModel.username.in_(["user5000", "user5001", "user5002"])
+        )
+        inserted_ids = sorted((await session.exec(statement)).all())
+
+        upserted_ids = await userMapper.batch_insert(
+            data_list=_users(4999, 5002, nickname="renamed"),
+            returning=True,
+            upsert=True,
+            conflict_keys=["username"],
+            update_fields=["nickname"],
+            db_session=session,
+        )
+        await session.commit()
+        count = (await session.exec(select(func.count(UserModel.id)))).one()
+        statement = select(UserModel.username).where(
+            UserModel.nickname == "renamed"
+        )
+        renamed = sorted((await session.exec(statement)).all())
+    await engine.dispose()
+    return row_count, ids, inserted_ids, upserted_ids, count, renamed
+
+
+def test_batch_insert_chunks_returns_ids_and_upserts():
+    row_count, ids, inserted_ids, upserted_ids, count, renamed = asyncio.run(
+        _insert_and_upsert()
+    )
+    assert row_count == 5000
+    assert sorted(ids) == inserted_ids and len(set(ids)) == 3
+    # Existing rows keep their IDs and only the listed fields change
+    assert upserted_ids[1:] == ids[:2]
+    assert count == 5003
+    assert renamed == ["user4999", "user5000", "user5001"]
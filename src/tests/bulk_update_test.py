@@ -0,0 +1,61 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+
+
+async def _update_users(single_statement: bool):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            UserModel(
+                id=index,
+                username=f"user{index}",
+                password="x",
+                nickname="n",
+                status=0,
+            )
+            for index in range(1, 5)
+        )
+        await session.commit()
+        if not single_statement:
+            # Take the executemany path used where UPDATE has no RETURNING
+            session.get_bind().dialect.update_returning = False
+        counts = await userMapper.bulk_update(
+            data_list=[
+                UserModel(id=1, nickname="one"),
+                {"id": 2, "status": 2, "remark": None},
+                {"id": 3, "nickname": "three", "status": 3},
+                {"id": 99, "nickname": "missing"},
+                {"id": 4},
+            ],
+            batch_size=2,
+            db_session=session,
+        )
+        await session.commit()
+        statement = select(
+            UserModel.id, UserModel.nickname, UserModel.status
+        ).order_by(UserModel.id)
+        rows = [tuple(row) for row in (await session.exec(statement)).all()]
+    await engine.dispose()
+    return counts, rows
+
+
+def test_bulk_update_applies_per_row_values():
+    for single_statement in (True, False):
+        counts, rows = asyncio.run(_update_users(single_statement))
+        assert counts == [1, 1, 1, 0, 0]
+        assert rows == [
+            (1, "one", 0),
+            (2, "n", 2),
+            (3, "three", 3),
+            (4, "n", 0),
+        ]
@@ -0,0 +1,95 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from src.main.app.core.cache.page_cache import PageCache
+from src.main.app.core.cache.redis_cache import RedisCache
+from src.main.app.core.cache.serializer import JsonSerializer
+from src.main.app.core.cache.tiered_cache import TieredCache
+
+
+def _requests(tier: str, result: str) -> float:
+    labels = {"tier": tier, "result": result}
+    return REGISTRY.get_sample_value("cache_requests_total", labels) or 0
+
+
+def _snapshot():
+    return {
+        (tier, result): _requests(tier, result)
+        for tier in ("local", "redis")
+        for result in ("hit", "miss")
+    }
+
+
+def _since(before):
+    return {key: _requests(*key) - value for key, value in before.items()}
+
+
+async def _exercise(cache):
+    await cache.set_many({"dict:a": {"n": 1}, "dict:b": [1, 2], "other": 3})
+    values = await cache.get_many(["dict:a", "dict:b", "missing"])
+    counts = [await cache.incr("hits"), await cache.incr("hits", 2)]
+    deleted = await cache.delete_by_prefix("dict:")
+    remaining = await cache.get_many(["dict:a", "other"])
+    removed = await cache.delete_many(["other", "missing"])
+    return values, counts, deleted, remaining, removed
+
+
+def _assert_batch_semantics(result):
+    values, counts, deleted, remaining, removed = result
+    assert values == {"dict:a": {"n": 1}, "dict:b": [1, 2]}
+    assert counts == [1, 3]
+    assert deleted == 2
+    assert remaining == {"other": 3}
+    assert removed == 1
+
+
+def test_page_cache_batches_keep_python_values():
+    _assert_batch_semantics(asyncio.run(_exercise(PageCache())))
+
+
+async def _redis_round_trips(server):
+    cache = RedisCache(server.client(), JsonSerializer())
+    result = await _exercise(cache)
+    round_trips = server.round_trips
+    await cache.set_many({f"key{i}": i for i in range(100)}, timeout=60)
+    await cache.get_many([f"key{i}" for i in range(100)])
+    return result, round_trips, server.round_trips - round_trips
+
+
+def test_redis_cache_batches_take_one_round_trip(redis_server):
+    result, exercise_trips, batch_trips = asyncio.run(
+        _redis_round_trips(redis_server)
+    )
+    _assert_batch_semantics(result)
+    # mset, mget, 2 incrby, scan plus unlink, mget, del
+    assert exercise_trips == 8
+    assert batch_trips == 2
+
+
+async def _tiered_batches(server):
+    caches = []
+    for _ in range(2):
+        client = server.client()
+        caches.append(TieredCache(RedisCache(client, JsonSerializer()), client))
+    first, second = caches
+    await first.set_many({"dict:a": 1, "dict:b": 2})
+    await asyncio.gather(first.get("warmup"), second.get("warmup"))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    before = _snapshot()
+    seen = [await second.get_many(["dict:a", "dict:b"])]
+    await first.delete_by_prefix("dict:")
+    for _ in range(5):
+        await asyncio.sleep(0)
+    seen.append(await second.get_many(["dict:a", "dict:b"]))
+    requests = _since(before)
+    await asyncio.gather(first.close(), second.close())
+    return seen, requests
+
+
+def test_tiered_cache_invalidates_batches_on_every_worker(redis_server):
+    seen, requests = asyncio.run(_tiered_batches(redis_server))
+    assert seen == [{"dict:a": 1, "dict:b": 2}, {}]
+    assert requests[("redis", "hit")] == 2
+    assert requests[("redis", "miss")] == 2
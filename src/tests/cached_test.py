@@ -0,0 +1,137 @@
+import asyncio
+import os
+import tempfile
+import uuid
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.cache.cache_manager import get_cache_client
+from src.main.app.core.cache.cache_tags import TAG_PREFIX, invalidate_tags
+from src.main.app.core.cache.cached import cached
+from src.main.app.core.middleware.db_session_middleware import (
+    SQLAlchemyMiddleware,
+    db,
+)
+from src.main.app.mapper.sys_dict_type_mapper import dictTypeMapper
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+from src.main.app.service.impl.sys_dict_type_service_impl import (
+    DictTypeServiceImpl,
+)
+
+
+async def _cache_by_arguments():
+    calls = 0
+
+    @cached("cached_test", ttl=60)
+    async def load(id: int, current_user=None) -> Dict[str, int]:
+        nonlocal calls
+        calls += 1
+        return {"id": id, "calls": calls}
+
+    results = [
+        await load(1),
+        await load(1, current_user="someone"),
+        await load(2),
+    ]
+    await invalidate_tags("cached_test")
+    results.append(await load(1))
+    return results
+
+
+def test_results_are_keyed_by_arguments_and_tag_versions():
+    assert asyncio.run(_cache_by_arguments()) == [
+        {"id": 1, "calls": 1},
+        {"id": 1, "calls": 1},
+        {"id": 2, "calls": 2},
+        {"id": 1, "calls": 3},
+    ]
+
+
+async def _invalidate_on_commit(tmp_dir: str):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'cached.db')}"
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[DictTypeModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        session.add(DictTypeModel(id=1, name="old", type="t"))
+        await session.commit()
+    SQLAlchemyMiddleware(None, custom_engine=engine)
+    service = DictTypeServiceImpl(mapper=dictTypeMapper)
+
+    async def name():
+        detail = await service.get_dict_type_detail(id=1, current_user=None)
+        return detail.name
+
+    names = []
+    async with db():
+        names.append(await name())
+    async with AsyncSession(engine) as session:
+        # Written behind the mapper's back, the cached entry stays
+        await session.merge(DictTypeModel(id=1, name="hidden", type="t"))
+        await session.commit()
+    async with db(commit_on_exit=True):
+        names.append(await name())
+        await dictTypeMapper.update_by_id(data=DictTypeModel(id=1, name="new"))
+        # The request reads its own uncommitted write around the cache
+        names.append(await name())
+    async with db():
+        names.append(await name())
+    await engine.dispose()
+    return names
+
+
+def test_mapper_writes_invalidate_cached_results_after_commit():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names = asyncio.run(_invalidate_on_commit(tmp_dir))
+    assert names == ["old", "old", "new", "new"]
+
+
+async def _read_primary_after_writes(tmp_dir: str):
+    engines = []
+    for name in ("primary", "replica"):
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(tmp_dir, f'{name}.db')}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[DictTypeModel.__table__]
+            )
+        async with AsyncSession(engine) as session:
+            session.add(DictTypeModel(id=1, name="old", type="t"))
+            await session.commit()
+        engines.append(engine)
+    primary, replica = engines
+    SQLAlchemyMiddleware(None, custom_engine=primary, replicas=[(replica, 1)])
+    service = DictTypeServiceImpl(mapper=dictTypeMapper)
+    # A fresh version of the table's tag, last written long ago
+    cache = await get_cache_client()
+    await cache.set(
+        f"{TAG_PREFIX}{DictTypeModel.__tablename__}", uuid.uuid4().hex
+    )
+
+    async def name():
+        async with db():
+            detail = await service.get_dict_type_detail(id=1, current_user=None)
+            return detail.name
+
+    names = [await name()]
+    async with db(commit_on_exit=True):
+        await dictTypeMapper.update_by_id(data=DictTypeModel(id=1, name="new"))
+    # The replica has not caught up, the entry is built from the primary
+    names += [await name(), await name()]
+    SQLAlchemyMiddleware(None, custom_engine=primary)
+    for engine in engines:
+        await engine.dispose()
+    return names
+
+
+def test_results_cached_right_after_a_write_are_read_from_the_primary():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names = asyncio.run(_read_primary_after_writes(tmp_dir))
+    assert names == ["old", "new", "new"]
@@ -0,0 +1,199 @@
+"""Fixtures, with an in-memory stand-in for the redis.asyncio client used
+by the caches"""
+
+import asyncio
+import time
+from collections import defaultdict
+
+import pytest
+
+
+class FakeRedisServer:
+    """Keys and pub/sub channels shared by the clients of one test."""
+
+    def __init__(self):
+        self.data = {}
+        # key -> monotonic time its timeout runs out, reported by PTTL only
+        self.expire_at = {}
+        self.channels = defaultdict(list)
+        self.gets = 0
+        self.round_trips = 0
+
+    def client(self, decode_responses=True) -> "FakeRedis":
+        """Return a new client, e.g. one per simulated worker."""
+        return FakeRedis(self, decode_responses)
+
+
+class FakePubSub:
+    def __init__(self, server: FakeRedisServer):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.channels[channel].append(self.queue)
+        self.queue.put_nowait({"type": "subscribe", "data": 1})
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        for queues in self.server.channels.values():
+            if self.queue in queues:
+                queues.remove(self.queue)
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis"):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def setex(self, key, timeout, value):
+        self.commands.append((self.client._set, key, value, timeout))
+
+    def get(self, key):
+        self.commands.append((self.client._get, key))
+
+    def mget(self, keys):
+        self.commands.append((self.client._mget, keys))
+
+    def pttl(self, key):
+        self.commands.append((self.client._pttl, key))
+
+    async def execute(self):
+        await self.client._round_trip()
+        return [command(*args) for command, *args in self.commands]
+
+
+class FakeRedis:
+    """The subset of the redis.asyncio client used by the caches.
+
+    Values are stored as Redis would return them to a client decoding
+    responses, and returned as bytes unless `decode_responses`. Every
+    command counts as one round trip. Timeouts are reported by PTTL but
+    keys never expire.
+    """
+
+    def __init__(self, server: FakeRedisServer, decode_responses=True):
+        self.server = server
+        self.decode_responses = decode_responses
+
+    def _reply(self, value):
+        if self.decode_responses or value is None:
+            return value
+        return value.encode()
+
+    async def _round_trip(self):
+        self.server.round_trips += 1
+        await asyncio.sleep(0)
+
+    def _set(self, key, value, timeout=None):
+        self.server.data[key] = value if isinstance(value, str) else str(value)
+        if timeout:
+            self.server.expire_at[key] = time.monotonic() + timeout
+        else:
+            self.server.expire_at.pop(key, None)
+        return True
+
+    def _get(self, key):
+        self.server.gets += 1
+        return self._reply(self.server.data.get(key))
+
+    def _mget(self, keys):
+        return [self._reply(self.server.data.get(key)) for key in keys]
+
+    def _pttl(self, key):
+        if key not in self.server.data:
+            return -2
+        expire_at = self.server.expire_at.get(key)
+        if expire_at is None:
+            return -1
+        return max(int((expire_at - time.monotonic()) * 1000), 0)
+
+    async def get(self, key):
+        await self._round_trip()
+        return self._get(key)
+
+    async def mget(self, keys):
+        await self._round_trip()
+        return self._mget(keys)
+
+    async def pttl(self, key):
+        await self._round_trip()
+        return self._pttl(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        await self._round_trip()
+        if nx and key in self.server.data:
+            return None
+        return self._set(key, value, ex)
+
+    async def setex(self, key, timeout, value):
+        await self._round_trip()
+        return self._set(key, value, timeout)
+
+    async def mset(self, mapping):
+        await self._round_trip()
+        for key, value in mapping.items():
+            self._set(key, value)
+        return True
+
+    async def incrby(self, key, amount):
+        await self._round_trip()
+        value = int(self.server.data.get(key, 0)) + amount
+        self.server.data[key] = str(value)
+        return value
+
+    async def delete(self, *keys):
+        await self._round_trip()
+        for key in keys:
+            self.server.expire_at.pop(key, None)
+        return sum(self.server.data.pop(key, None) is not None for key in keys)
+
+    unlink = delete
+
+    async def exists(self, key):
+        await self._round_trip()
+        return int(key in self.server.data)
+
+    async def scan_iter(self, match, count=None):
+        await self._round_trip()
+        for key in list(self.server.data):
+            if key.startswith(match.rstrip("*")):
+                yield self._reply(key)
+
+    async def eval(self, script, numkeys, key, token, seconds):
+        """Run the token guarded EXPIRE or DEL scripts of the leases, keys
+        never expire here."""
+        await self._round_trip()
+        if self.server.data.get(key) != token:
+            return 0
+        if "'del'" in script and int(seconds) <= 0:
+            del self.server.data[key]
+            self.server.expire_at.pop(key, None)
+        return 1
+
+    async def publish(self, channel, message):
+        await self._round_trip()
+        queues = self.server.channels[channel]
+        for queue in queues:
+            queue.put_nowait({"type": "message", "data": message})
+        return len(queues)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self.server)
+
+
+@pytest.fixture
+def redis_server() -> FakeRedisServer:
+    """A fake Redis server, connect to it with `redis_server.client()`."""
+    return FakeRedisServer()
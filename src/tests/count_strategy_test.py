@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.enums import CountStrategyEnum
+from src.main.app.core.mapper.impl.counter import (
+    EstimatedCounter,
+    ExactCounter,
+    is_exact,
+)
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+
+
+def _user(index: int) -> UserModel:
+    return UserModel(
+        id=index, username=f"user{index}", password="x", nickname="n"
+    )
+
+
+async def _count_around_writes():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    totals = []
+    async with AsyncSession(engine) as session:
+        await userMapper.batch_insert(
+            data_list=[_user(index) for index in range(1, 6)],
+            db_session=session,
+        )
+        await session.commit()
+
+        async def count():
+            _, total = await userMapper.select_by_page(
+                count=True,
+                count_strategy=CountStrategyEnum.CACHED,
+                db_session=session,
+            )
+            totals.append(total)
+
+        await count()
+        # A write outside the mapper is not seen until the entry expires
+        session.add_all([_user(6), _user(7)])
+        await session.commit()
+        await count()
+        # A write through the mapper invalidates the cached total
+        await userMapper.delete_by_id(id=1, db_session=session)
+        await session.commit()
+        await count()
+    await engine.dispose()
+    return totals
+
+
+def test_cached_count_is_invalidated_by_mapper_writes():
+    assert asyncio.run(_count_around_writes()) == [5, 5, 6]
+
+
+async def _estimated_totals(estimates):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    # Statistics are read on PostgreSQL and MySQL only
+    engine.sync_engine.dialect.name = "postgresql"
+    counter = EstimatedCounter(threshold=10, exact_counter=ExactCounter())
+
+    async def estimate(query, dialect, db_session):
+        result = estimates.pop(0)
+        if isinstance(result, Exception):
+            await db_session.exec(text("SELECT * FROM missing_table"))
+        return result
+
+    counter._estimate = estimate
+    totals = []
+    async with AsyncSession(engine) as session:
+        session.add_all([_user(1), _user(2)])
+        await session.flush()
+        for _ in range(3):
+            total = await counter.count(
+                query=select(UserModel), db_session=session
+            )
+            totals.append((int(total), is_exact(total)))
+    await engine.dispose()
+    return totals
+
+
+def test_estimated_count_reports_whether_it_fell_back_to_exact():
+    # An estimate, one below the threshold, then a failed lookup whose
+    # savepoint keeps the transaction and its flushed rows usable
+    assert asyncio.run(_estimated_totals([1000, 5, Exception()])) == [
+        (1000, False),
+        (2, True),
+        (2, True),
+    ]
+
+
+async def _explain_bound_values():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    query = select(UserModel.id).where(
+        UserModel.nickname == bindparam("eq_nickname"),
+        UserModel.create_time < datetime.now(),
+    )
+    async with AsyncSession(engine) as session:
+        session.add(_user(1))
+        await session.flush()
+        # Values are bound, not rendered as literals into the statement
+        plan = await EstimatedCounter._explain(
+            "",
+            query.params(eq_nickname="n'; DROP TABLE sys_user; --"),
+            SimpleNamespace(name="postgresql"),
+            session,
+        )
+        total = await ExactCounter().count(
+            query=select(UserModel), db_session=session
+        )
+    await engine.dispose()
+    return plan, int(total)
+
+
+def test_explain_binds_the_query_parameters():
+    assert asyncio.run(_explain_bound_values()) == (None, 1)
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import tempfile
+
+from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
+
+from src.main.app.core.config.database_config import DatabaseConfig
+from src.main.app.core.session.db_engine import (
+    TimedQueuePool,
+    dispose_engines,
+    get_engine,
+    pool_stats,
+)
+
+
+def _config(**kwargs) -> DatabaseConfig:
+    options = dict(
+        pool_size=2,
+        max_overflow=0,
+        pool_recycle=1800,
+        echo_sql=False,
+        pool_pre_ping=False,
+        enable_redis=False,
+        cache_host="",
+        cache_port=0,
+        cache_pass="",
+        db_num=0,
+        dialect="sqlite",
+        url="sqlite+aiosqlite://",
+    )
+    options.update(kwargs)
+    return DatabaseConfig(**options)
+
+
+def test_engines_are_shared_by_url_and_options():
+    config = _config()
+    memory = get_engine("sqlite+aiosqlite://", config)
+    assert get_engine("sqlite+aiosqlite://", _config()) is memory
+    # In-memory SQLite keeps its single connection pool, unsized
+    assert isinstance(memory.pool, StaticPool)
+    echoing = get_engine("sqlite+aiosqlite://", _config(echo_sql=True))
+    assert echoing is not memory
+
+
+async def _checkouts(url: str):
+    engine = get_engine(
+        url, _config(engine_options={"sqlite": {"pool_size": 3}})
+    )
+    async with engine.connect() as first, engine.connect() as second:
+        await first.execute(text("select 1"))
+        await second.execute(text("select 1"))
+        during = pool_stats()[url]
+    await dispose_engines()
+    async with engine.connect() as conn:
+        await conn.execute(text("select 1"))
+    after = pool_stats()[url]
+    await dispose_engines()
+    return engine, during, after
+
+
+def test_pool_stats_report_connections_in_use_and_checkout_waits():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'engine.db')}"
+        engine, during, after = asyncio.run(_checkouts(url))
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 3
+    assert during["checked_out"] == 2
+    assert during["checkouts"] == 2
+    # Disposing replaced the pool, the totals carried over
+    assert after["checked_out"] == 0
+    assert after["checkouts"] == 3
+    assert after["wait_seconds_max"] >= after["wait_seconds_total"] / 3 > 0
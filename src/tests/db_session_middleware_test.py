@@ -0,0 +1,127 @@
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_async_sqlalchemy.exceptions import MissingSessionError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from starlette.responses import StreamingResponse
+
+from src.main.app.core.middleware.db_session_middleware import (
+    create_middleware_and_session_proxy,
+)
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+
+engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+SQLAlchemyMiddleware, db = create_middleware_and_session_proxy()
+app = FastAPI()
+app.add_middleware(
+    SQLAlchemyMiddleware, custom_engine=engine, exclude_paths=["/probe"]
+)
+events = Counter()
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _count_checkout(*args):
+    events["checkout"] += 1
+
+
+def _count_commit(session):
+    events["commit"] += 1
+
+
+@app.get("/none")
+async def none():
+    return "ok"
+
+
+@app.get("/read")
+async def read():
+    return len((await db.session.exec(select(DictTypeModel))).all())
+
+
+@app.get("/write")
+async def write():
+    db.session.add(DictTypeModel(name="n", type="t"))
+    return "ok"
+
+
+@app.get("/fail")
+async def fail():
+    db.session.add(DictTypeModel(name="n", type="t"))
+    await db.session.flush()
+    raise RuntimeError("boom")
+
+
+@app.get("/conflict")
+async def conflict():
+    # Both rows are only flushed by the commit, which the unique type fails
+    db.session.add(DictTypeModel(name="a", type="conflict"))
+    db.session.add(DictTypeModel(name="b", type="conflict"))
+    return {"ok": True}
+
+
+@app.get("/stream")
+async def stream():
+    async def body():
+        yield str(await read()).encode()
+
+    return StreamingResponse(body())
+
+
+@app.get("/probe")
+async def probe():
+    try:
+        db.session
+    except MissingSessionError:
+        return "no session"
+
+
+@pytest.fixture(scope="module")
+def client():
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[DictTypeModel.__table__]
+            )
+
+    event.listen(Session, "after_commit", _count_commit)
+    with TestClient(app, raise_server_exceptions=False) as test_client:
+        test_client.portal.call(create_tables)
+        yield test_client
+    event.remove(Session, "after_commit", _count_commit)
+
+
+def _events(client, path):
+    events.clear()
+    response = client.get(path)
+    return response, dict(events)
+
+
+def test_session_is_opened_lazily_and_committed_only_after_writes(client):
+    assert _events(client, "/none")[1] == {}
+    assert _events(client, "/read")[1] == {"checkout": 1}
+    assert _events(client, "/write")[1] == {"checkout": 1, "commit": 1}
+    assert _events(client, "/fail")[0].status_code == 500
+    assert client.get("/read").json() == 1
+    # The session stays available while the response body is streamed
+    assert client.get("/stream").text == "1"
+    response, probe_events = _events(client, "/probe")
+    assert response.json() == "no session" and probe_events == {}
+
+
+def test_failed_commit_answers_500_instead_of_the_success_response(client):
+    rows = client.get("/read").json()
+    response, conflict_events = _events(client, "/conflict")
+    assert response.status_code == 500
+    assert response.json()["code"] == -1
+    assert "commit" not in conflict_events
+    assert client.get("/read").json() == rows
@@ -0,0 +1,102 @@
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.manager.dict_index_manager import DictIndexManager
+from src.main.app.mapper.sys_dict_data_mapper import dictDataMapper
+from src.main.app.mapper.sys_dict_type_mapper import dictTypeMapper
+from src.main.app.model.sys_dict_data_model import DictDataModel
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+
+
+def _data(id: int, type: str, sort: int, status: int = 1) -> DictDataModel:
+    return DictDataModel(
+        id=id, type=type, label=f"label{id}", sort=sort, status=status
+    )
+
+
+def _labels(lookup):
+    return {
+        type: [item.label for item in items]
+        for type, items in lookup.items.items()
+    }
+
+
+async def _lookups_around_writes():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[DictTypeModel.__table__, DictDataModel.__table__],
+        )
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+    manager = DictIndexManager()
+    seen = []
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            [
+                DictTypeModel(id=1, name="Gender", type="gender", status=1),
+                DictTypeModel(id=2, name="Color", type="color", status=0),
+                _data(1, "gender", 2),
+                _data(2, "gender", 1),
+                _data(3, "color", 1),
+            ]
+        )
+        await session.commit()
+
+        first = await manager.lookup(["gender"], db_session=session)
+        seen.append(_labels(first))
+        statements.clear()
+        again = await manager.lookup(["gender"], db_session=session)
+        seen.append(again.etag == first.etag)
+        both = await manager.lookup(
+            ["gender", "color", "unknown"], db_session=session
+        )
+        seen.append(_labels(both))
+        seen.append(len(statements))
+
+        # Put 1 first and add a disabled row, the types stay untouched
+        await dictDataMapper.update_by_id(
+            data=DictDataModel(id=1, sort=0), db_session=session
+        )
+        await dictDataMapper.insert(
+            data=_data(4, "gender", 3, status=0), db_session=session
+        )
+        await session.commit()
+        statements.clear()
+        patched = await manager.lookup(["gender"], db_session=session)
+        seen.append(_labels(patched))
+        seen.append(patched.etag != first.etag)
+        seen.append(any("sys_dict_type" in sql for sql in statements))
+
+        await dictTypeMapper.update_by_id(
+            data=DictTypeModel(id=2, status=1), db_session=session
+        )
+        await session.commit()
+        seen.append(
+            _labels(await manager.lookup(["color"], db_session=session))
+        )
+    await engine.dispose()
+    return seen
+
+
+def test_dict_index_serves_lookups_from_memory_and_patches_writes():
+    seen = asyncio.run(_lookups_around_writes())
+    assert seen == [
+        {"gender": ["label2", "label1"]},
+        True,
+        {"gender": ["label2", "label1"], "color": [], "unknown": []},
+        0,
+        {"gender": ["label1", "label2"]},
+        True,
+        False,
+        {"color": ["label3"]},
+    ]
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportJobStatusEnum
+from src.main.app.core.schema import ExportJob
+from src.main.app.manager.export_job_manager import ExportJobManager
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+from src.main.app.schema.sys_user_schema import UserPage
+
+
+async def _run_jobs(spool_dir: str):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    manager = ExportJobManager(spool_dir=spool_dir, max_workers=1, ttl=60)
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            UserModel(
+                id=index,
+                username=f"user{index}",
+                password="x",
+                nickname="n",
+                status=index % 2,
+            )
+            for index in range(1, 8)
+        )
+        await session.commit()
+
+        async def broken_chunks():
+            raise RuntimeError("boom")
+            yield []
+
+        job = await manager.submit(
+            schema=UserPage,
+            file_name="user_data_export",
+            chunks_factory=lambda: userMapper.select_stream(
+                db_session=session, **{FilterOperators.EQ: {"status": 1}}
+            ),
+            export_type="csv",
+            owner_id=1,
+        )
+        failed_job = await manager.submit(
+            schema=UserPage,
+            file_name="user_data_export",
+            chunks_factory=broken_chunks,
+            owner_id=1,
+        )
+        assert job.status == ExportJobStatusEnum.PENDING
+        await asyncio.gather(*manager._tasks)
+    await engine.dispose()
+    return manager, job.job_id, failed_job.job_id
+
+
+def test_export_job_lifecycle(tmp_path):
+    manager, job_id, failed_job_id = asyncio.run(_run_jobs(str(tmp_path)))
+
+    job = manager.get_job(job_id, owner_id=1)
+    assert job.status == ExportJobStatusEnum.SUCCEEDED
+    assert job.row_count == 4
+    assert job.file_name.endswith(".csv")
+    assert os.path.exists(manager.get_file_path(job))
+    # Other users and malformed ids see nothing
+    assert manager.get_job(job_id, owner_id=2) is None
+    assert manager.get_job("../etc/passwd", owner_id=1) is None
+
+    failed_job = manager.get_job(failed_job_id, owner_id=1)
+    assert failed_job.status == ExportJobStatusEnum.FAILED
+    assert failed_job.error == "boom"
+    assert not os.path.exists(manager.get_file_path(failed_job))
+
+
+def test_recover_fails_the_jobs_of_dead_workers(tmp_path):
+    manager = ExportJobManager(spool_dir=str(tmp_path), max_workers=1, ttl=60)
+    dead = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    host = socket.gethostname()
+    workers = {
+        "dead": f"{host}:{int(dead.stdout)}",
+        "alive": f"{host}:{os.getppid()}",
+        "remote": f"{host}-other:1",
+    }
+    for name, worker in workers.items():
+        job = ExportJob(
+            job_id=name,
+            status=ExportJobStatusEnum.RUNNING,
+            file_name=f"{name}.csv",
+            create_time=datetime.now(),
+        )
+        (tmp_path / f"{name}.xlsx").write_bytes(b"partial")
+        (tmp_path / f"{name}.json").write_text(
+            json.dumps({**job.model_dump(mode="json"), "worker": worker})
+        )
+
+    manager.recover()
+
+    dead_job = manager._load("dead")
+    assert dead_job.status == ExportJobStatusEnum.FAILED
+    assert dead_job.finish_time is not None
+    assert not (tmp_path / "dead.xlsx").exists()
+    assert manager._load("alive").status == ExportJobStatusEnum.RUNNING
+    assert manager._load("remote").status == ExportJobStatusEnum.RUNNING
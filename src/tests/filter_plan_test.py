@@ -0,0 +1,56 @@
+from src.main.app.core.constant import FilterOperators
+from src.main.app.core.mapper.impl.filter_plan import (
+    FilterPlan,
+    FilterPlanCache,
+)
+from src.main.app.model.sys_user_model import UserModel
+
+
+def test_filter_shape_reuses_plan_and_binds_values():
+    plans = FilterPlanCache(UserModel)
+    first, first_params = plans.get(
+        {
+            FilterOperators.EQ: {"status": 1},
+            FilterOperators.BETWEEN: {"id": (1, 10)},
+        }
+    )
+    second, second_params = plans.get(
+        {
+            FilterOperators.BETWEEN: {"id": (5, 20)},
+            FilterOperators.EQ: {"status": 0},
+        }
+    )
+    assert first is second
+    assert first_params == {
+        "eq_status": 1,
+        "between_id_start": 1,
+        "between_id_end": 10,
+    }
+    assert second_params == {
+        "eq_status": 0,
+        "between_id_start": 5,
+        "between_id_end": 20,
+    }
+
+    # None compares with IS NULL and yields a different shape
+    null_plan, null_params = plans.get({FilterOperators.EQ: {"status": None}})
+    assert null_plan is not first
+    assert null_params == {}
+    assert "IS NULL" in str(null_plan.statement)
+
+
+def test_derived_statements_are_bounded():
+    plan = FilterPlan(UserModel, (), derived_maxsize=2)
+    built = []
+
+    def builder(key):
+        def build(statement):
+            built.append(key)
+            return statement.limit(len(built))
+
+        return build
+
+    for key in ("a", "b", "a", "c", "a", "b"):
+        plan.derive(key, builder(key))
+    # b was least recently used when c came in
+    assert built == ["a", "b", "c", "b"]
@@ -0,0 +1,91 @@
+import asyncio
+import io
+
+import xlsxwriter
+from fastapi import UploadFile
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+from src.main.app.schema.sys_user_schema import UserCreate
+from src.main.app.service.impl.sys_user_service_impl import UserServiceImpl
+
+
+def _xlsx(rows) -> bytes:
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer)
+    worksheet = workbook.add_worksheet()
+    for index, row in enumerate(rows):
+        worksheet.write_row(index, 0, row)
+    workbook.close()
+    return buffer.getvalue()
+
+
+async def _import_twice():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    service = UserServiceImpl(mapper=userMapper)
+    async with AsyncSession(engine) as session:
+        valid_file = _xlsx(
+            [
+                ["username", "password", "nickname", "status", "err_msg"],
+                ["user1", "x", "n1", 1],
+                ["user2", "x", "n2", ""],
+                [],
+                ["user3", "x", "n3"],
+            ]
+        )
+        valid = await service.import_data(
+            file=UploadFile(io.BytesIO(valid_file), filename="user.xlsx"),
+            schema=UserCreate,
+            chunk_size=2,
+            db_session=session,
+        )
+        await session.commit()
+
+        # Work of the caller the failed import must not undo
+        session.add(
+            UserModel(id=100, username="other", password="x", nickname="o")
+        )
+        await session.flush()
+        # Rows 2 and 3 are inserted before row 4 fails, then rolled back
+        invalid_file = (
+            "username,password,nickname,status\n"
+            "user4,x,n4,\n"
+            "user5,x,n5,1\n"
+            "user6,x,,1\n"
+            "user7,x,n7,2\n"
+            "user8,x,n8,status\n"
+        ).encode("utf-8-sig")
+        invalid = await service.import_data(
+            file=UploadFile(io.BytesIO(invalid_file), filename="user.csv"),
+            schema=UserCreate,
+            chunk_size=2,
+            db_session=session,
+        )
+        await session.commit()
+        statement = select(UserModel.username).order_by(UserModel.username)
+        usernames = (await session.exec(statement)).all()
+        count = (await session.exec(select(func.count(UserModel.id)))).one()
+    await engine.dispose()
+    return valid, invalid, usernames, count
+
+
+def test_import_saves_all_rows_or_reports_every_error():
+    valid, invalid, usernames, count = asyncio.run(_import_twice())
+
+    assert (valid.row_count, valid.success_count, valid.errors) == (3, 3, [])
+    assert usernames == ["other", "user1", "user2", "user3"]
+    assert count == 4
+
+    assert invalid.row_count == 5
+    assert invalid.success_count == 0
+    assert [error.row for error in invalid.errors] == [4, 6]
+    assert "nickname" in invalid.errors[0].err_msg
+    assert "status" in invalid.errors[1].err_msg
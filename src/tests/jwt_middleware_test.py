@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.main.app.core.enums import TokenTypeEnum
+from src.main.app.core.middleware import jwt_middleware
+from src.main.app.core.middleware.jwt_middleware import JWTMiddleware
+from src.main.app.core.schema import CurrentUser
+from src.main.app.core.security import security
+from src.main.app.enums.auth_error_code import AuthErrorCode
+
+API = jwt_middleware.server_config.api_version
+app = FastAPI()
+app.add_middleware(JWTMiddleware)
+
+
+@app.get(API + "/me")
+async def me(
+    request: Request,
+    current_user: CurrentUser = Depends(security.get_current_user()),
+):
+    return [current_user.user_id, request.state.user_id]
+
+
+@app.get(API + "/probe/liveness")
+async def liveness():
+    return "ok"
+
+
+def test_token_is_decoded_once_and_reused(monkeypatch):
+    monkeypatch.setattr(jwt_middleware.security_config, "enable", True)
+    decode_calls = []
+    decode = security.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decode_calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    security.token_cache.clear()
+    client = TestClient(app)
+
+    def get(path, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return client.get(API + path, headers=headers)
+
+    assert get("/probe/liveness").json() == "ok"
+    assert get("/me").json()["code"] == AuthErrorCode.MISSING_TOKEN.code
+    assert (
+        get("/me", "x.y.z").json()["code"] == AuthErrorCode.INVALID_TOKEN.code
+    )
+    expired = security.create_token(
+        7, expires_delta=timedelta(days=-1), token_type=TokenTypeEnum.access
+    )
+    assert (
+        get("/me", expired).json()["code"] == AuthErrorCode.TOKEN_EXPIRED.code
+    )
+
+    decode_calls.clear()
+    token = security.create_token(7, token_type=TokenTypeEnum.access)
+    for _ in range(3):
+        assert get("/me", token).json() == [7, 7]
+    assert decode_calls == [token]
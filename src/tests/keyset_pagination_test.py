@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.exception import CustomException
+from src.main.app.mapper.sys_dict_data_mapper import dictDataMapper
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_dict_data_model import DictDataModel
+from src.main.app.model.sys_user_model import UserModel
+
+PAGE_SIZE = 4
+SORT_LIST = [{"field": "nickname", "order": "asc"}]
+
+
+async def _walk_pages():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        for index in range(1, 11):
+            session.add(
+                UserModel(
+                    id=index,
+                    username=f"user{index}",
+                    password="x",
+                    nickname=f"nick{index % 3}",
+                )
+            )
+        await session.commit()
+
+        expected, _ = await userMapper.select_by_ordered_page(
+            current=1, page_size=100, db_session=session
+        )
+        expected_sorted = sorted(expected, key=lambda u: (u.nickname, -u.id))
+
+        forward, cursor, pages = [], "", []
+        while cursor is not None:
+            records, _ = await userMapper.select_by_ordered_page(
+                page_size=PAGE_SIZE,
+                sort_list=SORT_LIST,
+                cursor=cursor,
+                db_session=session,
+            )
+            forward.extend(record.id for record in records)
+            pages.append((cursor, [record.id for record in records]))
+            cursor, _ = userMapper.get_page_cursors(
+                data_list=records,
+                page_size=PAGE_SIZE,
+                sort_list=SORT_LIST,
+                cursor=cursor,
+            )
+
+        # Step back from the second page to the first one
+        second_cursor, second_ids = pages[1]
+        second, _ = await userMapper.select_by_ordered_page(
+            page_size=PAGE_SIZE,
+            sort_list=SORT_LIST,
+            cursor=second_cursor,
+            db_session=session,
+        )
+        _, prev_cursor = userMapper.get_page_cursors(
+            data_list=second,
+            page_size=PAGE_SIZE,
+            sort_list=SORT_LIST,
+            cursor=second_cursor,
+        )
+        previous, _ = await userMapper.select_by_ordered_page(
+            page_size=PAGE_SIZE,
+            sort_list=SORT_LIST,
+            cursor=prev_cursor,
+            db_session=session,
+        )
+
+        with pytest.raises(CustomException):
+            await userMapper.select_by_ordered_page(
+                page_size=PAGE_SIZE, cursor=second_cursor, db_session=session
+            )
+    await engine.dispose()
+    return (
+        [user.id for user in expected_sorted],
+        forward,
+        pages,
+        [record.id for record in previous],
+    )
+
+
+def test_keyset_pagination_walks_forward_and_back():
+    expected, forward, pages, previous = asyncio.run(_walk_pages())
+    assert forward == expected
+    assert previous == pages[0][1]
+
+
+async def _walk_null_sorted(order):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[DictDataModel.__table__]
+        )
+    sort_list = [{"field": "sort", "order": order}]
+    async with AsyncSession(engine) as session:
+        for index, sort in enumerate([1, 2, None, None, None, None], 1):
+            session.add(DictDataModel(id=index, sort=sort, label=str(index)))
+        await session.commit()
+
+        forward, cursor, pages = [], "", []
+        while cursor is not None:
+            records, _ = await dictDataMapper.select_by_ordered_page(
+                page_size=2,
+                sort_list=sort_list,
+                cursor=cursor,
+                db_session=session,
+            )
+            forward.extend(record.id for record in records)
+            if records:
+                pages.append((cursor, records))
+            cursor, _ = dictDataMapper.get_page_cursors(
+                data_list=records,
+                page_size=2,
+                sort_list=sort_list,
+                cursor=cursor,
+            )
+
+        # Step back from the last page, which starts on a NULL
+        last_cursor, last_records = pages[-1]
+        _, cursor = dictDataMapper.get_page_cursors(
+            data_list=last_records,
+            page_size=2,
+            sort_list=sort_list,
+            cursor=last_cursor,
+        )
+        backward = []
+        while cursor is not None:
+            records, _ = await dictDataMapper.select_by_ordered_page(
+                page_size=2,
+                sort_list=sort_list,
+                cursor=cursor,
+                db_session=session,
+            )
+            backward[:0] = [record.id for record in records]
+            _, cursor = dictDataMapper.get_page_cursors(
+                data_list=records,
+                page_size=2,
+                sort_list=sort_list,
+                cursor=cursor,
+            )
+    await engine.dispose()
+    return forward, backward
+
+
+@pytest.mark.parametrize(
+    "order, expected",
+    [("asc", [1, 2, 6, 5, 4, 3]), ("desc", [2, 1, 6, 5, 4, 3])],
+)
+def test_keyset_pagination_reaches_null_sort_values(order, expected):
+    forward, backward = asyncio.run(_walk_null_sorted(order))
+    assert forward == expected
+    assert backward == expected[:-2]
@@ -0,0 +1,133 @@
+import json
+import os
+import time
+import zipfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+
+from src.main.app.core.middleware.log_middleware import AccessLogMiddleware
+from src.main.app.core.utils.log_util import (
+    BatchedLogWriter,
+    add_request_context,
+)
+
+logger.configure(patcher=add_request_context)
+
+
+def _app(sample_rate: float, slow_ms: float = 1000) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        AccessLogMiddleware, sample_rate=sample_rate, slow_ms=slow_ms
+    )
+
+    @app.get("/items/{id}")
+    async def get_item(id: int):
+        logger.info("loading item")
+        return id
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def _read(path) -> list:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def _log_requests(tmp_path, app: FastAPI, *paths: str):
+    path = tmp_path / "app.log"
+    sink = logger.add(BatchedLogWriter(str(path)), format="{message}")
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        responses = [client.get(p) for p in paths]
+    finally:
+        # Removing the sink stops the writer after the queued records
+        logger.remove(sink)
+    return responses, _read(path)
+
+
+def test_records_are_json_lines_with_the_request_context(tmp_path):
+    responses, records = _log_requests(tmp_path, _app(1.0), "/items/7")
+
+    request_id = responses[0].headers["x-request-id"]
+    loading, access = records
+    assert loading["message"] == "loading item"
+    assert loading["request_id"] == request_id
+    assert loading["route"] == "/items/{id}"
+    assert loading["user_id"] is None
+    assert access["message"] == "GET /items/7 200"
+    assert access["status"] == 200
+    assert access["request_id"] == request_id
+
+
+def test_access_lines_are_sampled_but_errors_and_slow_requests_kept(
+    tmp_path,
+):
+    _, records = _log_requests(
+        tmp_path, _app(0.0), "/items/1", "/items/2", "/fail"
+    )
+    assert [r["message"] for r in records if "status" in r] == ["GET /fail 500"]
+
+    _, records = _log_requests(tmp_path, _app(0.0, slow_ms=0), "/items/3")
+    assert records[-1]["message"] == "GET /items/3 200"
+
+
+def test_rotated_files_are_zipped_and_expired_ones_removed(tmp_path):
+    path = tmp_path / "app.log"
+    expired = tmp_path / "app.2000-01-01_00-00-00_000000.log.zip"
+    expired.write_bytes(b"")
+    os.utime(expired, (0, 0))
+    writer = BatchedLogWriter(str(path), rotation_bytes=1000)
+    sink = logger.add(writer, format="{message}")
+    for i in range(100):
+        logger.info(f"line {i}")
+    logger.remove(sink)
+
+    archives = sorted(tmp_path.glob("app.*.log.zip"))
+    assert archives and expired not in archives
+    lines = []
+    for archive in archives:
+        with zipfile.ZipFile(archive) as zip_file:
+            (name,) = zip_file.namelist()
+            lines += zip_file.read(name).decode().splitlines()
+    lines += path.read_text().splitlines()
+    messages = [json.loads(line)["message"] for line in lines]
+    assert messages == [f"line {i}" for i in range(100)]
+    assert not list(tmp_path.glob("app.*.log"))
+
+
+class FailingOnceWriter(BatchedLogWriter):
+    def __init__(self, path: str):
+        self.failed = False
+        super().__init__(path)
+
+    def _open(self):
+        if not self.failed:
+            self.failed = True
+            raise OSError("disk full")
+        return super()._open()
+
+
+def test_batches_the_file_refused_are_reported_and_counted(tmp_path, capsys):
+    path = tmp_path / "app.log"
+    writer = FailingOnceWriter(str(path))
+    sink = logger.add(writer, format="{message}")
+    logger.info("lost")
+    deadline = time.monotonic() + 5
+    while writer.dropped == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    logger.info("kept")
+    logger.remove(sink)
+
+    assert [r["message"] for r in _read(path)] == [
+        "kept",
+        "Dropped 1 log records",
+    ]
+    stderr = capsys.readouterr().err
+    assert "Log writer dropped 1 records" in stderr
+    assert "OSError: disk full" in stderr
@@ -0,0 +1,155 @@
+import asyncio
+import json
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.mapper import table_version
+from src.main.app.manager.menu_tree_manager import (
+    MENU_TABLE,
+    MenuTreeManager,
+)
+from src.main.app.mapper.sys_menu_mapper import menuMapper
+from src.main.app.model.sys_menu_model import MenuModel
+
+
+def _menu(id: int, parent_id: int, sort: int, **fields) -> MenuModel:
+    return MenuModel(
+        id=id, name=f"menu{id}", parent_id=parent_id, sort=sort, **fields
+    )
+
+
+def _shape(trees):
+    return [(tree.id, _shape(tree.children)) for tree in trees]
+
+
+async def _engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[MenuModel.__table__]
+        )
+    return engine
+
+
+async def _trees_around_writes():
+    engine = await _engine()
+    manager = MenuTreeManager()
+    shapes = []
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            [
+                _menu(1, 0, 2),
+                _menu(2, 0, 1),
+                _menu(3, 1, 2),
+                _menu(4, 1, 1),
+                _menu(5, 2, 1),
+            ]
+        )
+        await session.commit()
+
+        whole = await manager.get_tree(db_session=session)
+        shapes.append(_shape(whole))
+        assert await manager.get_tree(db_session=session) is whole
+        shapes.append(_shape(await manager.get_tree(id=1, db_session=session)))
+
+        # Move 5 under 1 ahead of 4, remove 3 and add 6 under 2
+        await menuMapper.update_by_id(
+            data=MenuModel(id=5, name="menu5", parent_id=1, sort=0),
+            db_session=session,
+        )
+        await menuMapper.delete_by_id(id=3, db_session=session)
+        await menuMapper.insert(data=_menu(6, 2, 1), db_session=session)
+        await session.commit()
+        shapes.append(_shape(await manager.get_tree(db_session=session)))
+    await engine.dispose()
+    return shapes
+
+
+def test_menu_tree_is_sorted_and_patched_after_writes():
+    whole, subtree, patched = asyncio.run(_trees_around_writes())
+    assert whole == [(2, [(5, [])]), (1, [(4, []), (3, [])])]
+    assert subtree == [(1, [(4, []), (3, [])])]
+    assert patched == [(2, [(6, [])]), (1, [(5, []), (4, [])])]
+
+
+async def _trees_around_a_rollback():
+    engine = await _engine()
+    manager = MenuTreeManager()
+    shapes = []
+    async with AsyncSession(engine) as session:
+        # Old enough for an incremental refresh to skip them
+        old = datetime(2000, 1, 1)
+        session.add_all([_menu(1, 0, 1, update_time=old), _menu(2, 0, 2)])
+        await session.commit()
+        shapes.append(_shape(await manager.get_tree(db_session=session)))
+
+        await menuMapper.update_by_id(data=_menu(1, 2, 1), db_session=session)
+        shapes.append(_shape(await manager.get_tree(db_session=session)))
+        await session.rollback()
+        shapes.append(_shape(await manager.get_tree(db_session=session)))
+    await engine.dispose()
+    return shapes
+
+
+def test_rolled_back_writes_leave_the_tree():
+    before, uncommitted, rolled_back = asyncio.run(_trees_around_a_rollback())
+    assert before == [(1, []), (2, [])]
+    assert uncommitted == [(2, [(1, [])])]
+    assert rolled_back == before
+
+
+async def _trees_around_another_workers_write(server):
+    await table_version.start_sharing(server.client(), "invalidation")
+    engine = await _engine()
+    manager = MenuTreeManager()
+    shapes = []
+    try:
+        async with AsyncSession(engine) as session:
+            session.add(_menu(1, 0, 1))
+            await session.commit()
+            shapes.append(_shape(await manager.get_tree(db_session=session)))
+
+            # Written and announced by another worker, this one's version
+            # is only bumped by the message
+            connection = await session.connection()
+            await connection.execute(
+                text(
+                    "INSERT INTO sys_menu (id, name, parent_id, sort, "
+                    "create_time, update_time) VALUES (2, 'menu2', 1, 1, "
+                    "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                )
+            )
+            await session.commit()
+            shapes.append(_shape(await manager.get_tree(db_session=session)))
+            message = {
+                "node": "other",
+                "keys": [],
+                "prefix": None,
+                "tables": [MENU_TABLE],
+            }
+            await server.client().publish("invalidation", json.dumps(message))
+            await asyncio.sleep(0.01)
+            shapes.append(_shape(await manager.get_tree(db_session=session)))
+
+            # This worker's own announcements are not applied twice
+            version = table_version.get_version(MENU_TABLE)
+            await table_version.publish_versions([MENU_TABLE])
+            await asyncio.sleep(0.01)
+            shapes.append(table_version.get_version(MENU_TABLE) - version)
+    finally:
+        await table_version.stop_sharing()
+        await engine.dispose()
+    return shapes
+
+
+def test_writes_announced_by_other_workers_refresh_the_tree(redis_server):
+    before, unannounced, announced, own = asyncio.run(
+        _trees_around_another_workers_write(redis_server)
+    )
+    assert before == unannounced == [(1, [])]
+    assert announced == [(1, [(2, [])])]
+    assert own == 0
@@ -0,0 +1,96 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.main.app.core import metrics
+from src.main.app.core.cache.page_cache import PageCache
+from src.main.app.core.middleware.metrics_middleware import MetricsMiddleware
+
+engine = create_async_engine("sqlite+aiosqlite://")
+app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/items/{id}")
+async def get_item(id: int):
+    async with engine.connect() as conn:
+        for _ in range(3):
+            await conn.execute(text("select 1"))
+    return id
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_measured_by_route_template():
+    client = TestClient(app)
+    requests = _sample(
+        "http_requests_total", method="GET", route="/items/{id}", status="200"
+    )
+    statements = _sample("db_statements_per_request_sum")
+    unmatched = _sample(
+        "http_requests_total", method="GET", route="unmatched", status="404"
+    )
+
+    assert client.get("/items/1").json() == 1
+    assert client.get("/items/2").json() == 2
+    assert client.get("/missing").status_code == 404
+
+    assert (
+        _sample(
+            "http_requests_total",
+            method="GET",
+            route="/items/{id}",
+            status="200",
+        )
+        == requests + 2
+    )
+    assert _sample("db_statements_per_request_sum") == statements + 6
+    assert (
+        _sample(
+            "http_requests_total",
+            method="GET",
+            route="unmatched",
+            status="404",
+        )
+        == unmatched + 1
+    )
+    assert _sample("http_requests_in_progress") == 0
+
+
+async def _lookups():
+    cache = PageCache()
+    await cache.set("a", 1)
+    await cache.get("a")
+    await cache.get("b")
+    await cache.get_many(["a", "b", "c"])
+
+
+def test_cache_lookups_are_counted_per_tier_and_exposed():
+    hits = _sample("cache_requests_total", tier="memory", result="hit")
+    misses = _sample("cache_requests_total", tier="memory", result="miss")
+    asyncio.run(_lookups())
+    assert _sample("cache_requests_total", tier="memory", result="hit") == (
+        hits + 2
+    )
+    assert _sample("cache_requests_total", tier="memory", result="miss") == (
+        misses + 3
+    )
+    names = {
+        family.name
+        for family in text_string_to_metric_families(metrics.render().decode())
+    }
+    assert {
+        "http_requests",
+        "http_request_duration_seconds",
+        "db_pool_checkout_wait_seconds",
+        "cache_requests",
+        "jwt_verify_seconds",
+        "password_hash_queued",
+    } <= names
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from src.main.app.core.cache.cache_manager import get_cache_client
+from src.main.app.core.cache.page_cache import PageCache
+
+
+async def _bounded_memory():
+    cache = PageCache(maxsize=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2, timeout=0.05)
+    await cache.get("a")
+    await cache.set("c", 3)
+    # b was least recently used
+    seen = [await cache.get(key) for key in ("a", "b", "c")]
+    await cache.set("d", 4, timeout=0.05)
+    await asyncio.sleep(0.06)
+    seen.append(await cache.get("d"))
+    seen.append(await cache.keys(""))
+    return seen
+
+
+def test_memory_tier_is_bounded_and_expires_keys():
+    assert asyncio.run(_bounded_memory()) == [1, None, 3, None, ["c"]]
+
+
+async def _share_directory(directory):
+    writer = PageCache(directory=directory)
+    reader = PageCache(directory=directory)
+    await writer.set("page:1", {"rows": [1, 2]})
+    await writer.incr("views", 2)
+    threads = set()
+    disk_get = reader.disk.get
+
+    def recording_get(*args, **kwargs):
+        threads.add(threading.current_thread())
+        return disk_get(*args, **kwargs)
+
+    reader.disk.get = recording_get
+    seen = [await reader.get("page:1"), await reader.incr("views", 0)]
+    # Served from memory the second time
+    seen.append(await reader.get("page:1"))
+    return seen, threads
+
+
+def test_disk_tier_is_shared_and_read_off_the_event_loop(tmp_path):
+    seen, threads = asyncio.run(_share_directory(str(tmp_path)))
+    assert seen == [{"rows": [1, 2]}, 2, {"rows": [1, 2]}]
+    assert len(threads) == 1
+    assert threading.main_thread() not in threads
+
+
+def test_page_cache_is_a_singleton():
+    first = asyncio.run(get_cache_client())
+    assert isinstance(first, PageCache)
+    assert asyncio.run(get_cache_client()) is first
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.main.app.core.enums.enum import CommonErrorCode
+from src.main.app.core.exception import CustomException
+from src.main.app.core.security.password_hasher import (
+    ARGON2ID,
+    PasswordHasher,
+    argon2,
+)
+
+
+async def _hash_and_verify():
+    hasher = PasswordHasher(bcrypt_rounds=4)
+    hashed = await hasher.hash("secret")
+    return (
+        await hasher.verify("secret", hashed),
+        await hasher.verify("wrong", hashed),
+        hasher.needs_rehash(hashed),
+        PasswordHasher(bcrypt_rounds=5).needs_rehash(hashed),
+    )
+
+
+def test_bcrypt_hashes_verify_and_track_their_cost():
+    assert asyncio.run(_hash_and_verify()) == (True, False, False, True)
+
+
+async def _overflow_queue():
+    hasher = PasswordHasher(workers=1, max_queue=1, bcrypt_rounds=4)
+    release = threading.Event()
+    blocking = asyncio.ensure_future(hasher._submit(release.wait))
+    while hasher.stats()["running"] == 0:
+        await asyncio.sleep(0.01)
+    queued = asyncio.ensure_future(hasher.hash("queued"))
+    await asyncio.sleep(0)
+    with pytest.raises(CustomException) as exc_info:
+        await hasher.hash("rejected")
+    release.set()
+    await asyncio.gather(blocking, queued)
+    return exc_info.value.code, hasher.stats()
+
+
+def test_full_queue_rejects_new_hashes():
+    code, stats = asyncio.run(_overflow_queue())
+    assert code == CommonErrorCode.SERVER_BUSY.code
+    assert stats == {
+        "workers": 1,
+        "queued": 0,
+        "running": 0,
+        "peak_queued": 1,
+        "completed": 2,
+        "rejected": 1,
+    }
+
+
+async def _cancel_queued():
+    hasher = PasswordHasher(workers=1, bcrypt_rounds=4)
+    release = threading.Event()
+    blocking = asyncio.ensure_future(hasher._submit(release.wait))
+    while hasher.stats()["running"] == 0:
+        await asyncio.sleep(0.01)
+    gauge = REGISTRY.get_sample_value("password_hash_queued")
+    queued = asyncio.ensure_future(hasher.hash("cancelled"))
+    await asyncio.sleep(0)
+    queued.cancel()
+    await asyncio.sleep(0)
+    cancelled = hasher.stats()
+    release.set()
+    await blocking
+    return (
+        cancelled,
+        hasher.stats(),
+        REGISTRY.get_sample_value("password_hash_queued") - gauge,
+    )
+
+
+def test_cancelled_callers_leave_the_queue():
+    cancelled, done, gauge = asyncio.run(_cancel_queued())
+    assert cancelled["queued"] == 0
+    assert (done["queued"], done["running"], done["completed"]) == (0, 0, 1)
+    assert gauge == 0
+
+
+async def _migrate_to_argon2():
+    bcrypt_hash = await PasswordHasher(bcrypt_rounds=4).hash("secret")
+    hasher = PasswordHasher(scheme=ARGON2ID)
+    argon2_hash = await hasher.hash("secret")
+    return (
+        await hasher.verify("secret", bcrypt_hash),
+        hasher.needs_rehash(bcrypt_hash),
+        await hasher.verify("secret", argon2_hash),
+        hasher.needs_rehash(argon2_hash),
+    )
+
+
+@pytest.mark.skipif(argon2 is None, reason="argon2-cffi is not installed")
+def test_argon2id_verifies_old_bcrypt_hashes_and_asks_to_rehash():
+    assert asyncio.run(_migrate_to_argon2()) == (True, True, True, False)
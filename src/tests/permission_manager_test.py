@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.manager.permission_manager import PermissionManager
+from src.main.app.mapper.sys_role_menu_mapper import roleMenuMapper
+from src.main.app.model.sys_menu_model import MenuModel
+from src.main.app.model.sys_role_menu_model import RoleMenuModel
+from src.main.app.model.sys_role_model import RoleModel
+from src.main.app.model.sys_user_role_model import UserRoleModel
+
+TABLES = [
+    UserRoleModel.__table__,
+    RoleModel.__table__,
+    RoleMenuModel.__table__,
+    MenuModel.__table__,
+]
+
+
+def _role(id: int, name: str) -> RoleModel:
+    return RoleModel(id=id, name=name, code=name, sort=id, status=0)
+
+
+def _menu(id: int, permission: str) -> MenuModel:
+    return MenuModel(id=id, name=permission, permission=permission)
+
+
+async def _resolve_around_writes():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=TABLES)
+    manager = PermissionManager(ttl=60, maxsize=16)
+    resolved = []
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            [
+                _role(1, "editor"),
+                _role(2, "viewer"),
+                _menu(1, "doc.edit"),
+                _menu(2, "doc.view"),
+                UserRoleModel(id=1, user_id=100, role_id=1),
+                UserRoleModel(id=2, user_id=100, role_id=2),
+                RoleMenuModel(id=1, role_id=1, menu_id=1),
+                RoleMenuModel(id=2, role_id=1, menu_id=2),
+                RoleMenuModel(id=3, role_id=2, menu_id=2),
+            ]
+        )
+        await session.commit()
+
+        async def resolve():
+            user_permission = await manager.get_user_permission(
+                user_id=100, db_session=session
+            )
+            resolved.append(user_permission)
+
+        await resolve()
+        await resolve()
+        # A role menu write through the mapper evicts the cached entry
+        await roleMenuMapper.delete_by_id(id=1, db_session=session)
+        await session.commit()
+        await resolve()
+    await engine.dispose()
+    return resolved
+
+
+def test_permissions_are_cached_until_permission_tables_change():
+    first, second, third = asyncio.run(_resolve_around_writes())
+    assert first is second
+    assert first.roles == {"editor", "viewer"}
+    assert sorted(first.permissions) == ["doc.edit", "doc.view"]
+    assert len(first.menus) == 2
+    assert third is not first
+    assert third.permissions == ["doc.view"]
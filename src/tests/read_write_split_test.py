@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tempfile
+from collections import Counter
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.mapper.impl.base_mapper_impl import SqlModelMapper
+from src.main.app.core.middleware.db_session_middleware import (
+    create_middleware_and_session_proxy,
+)
+from src.main.app.core.session.replica_router import ReplicaRouter
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+
+
+async def _create_db(url: str, name: str):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[DictTypeModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        session.add(DictTypeModel(id=1, name=name, type="t"))
+        await session.commit()
+    return engine
+
+
+async def _route_reads(tmp_dir: str):
+    primary = await _create_db(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'primary.db')}", "primary"
+    )
+    replica = await _create_db(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'replica.db')}", "replica"
+    )
+    middleware, db = create_middleware_and_session_proxy()
+    middleware(None, custom_engine=primary, replicas=[(replica, 1)])
+    mapper = SqlModelMapper(DictTypeModel)
+    mapper.db = db
+
+    async def name(**kwargs):
+        return (await mapper.select_by_id(id=1, **kwargs)).name
+
+    names = []
+    async with db(commit_on_exit=True):
+        names.append(await name())
+        names.append(await name(use_primary=True))
+        await mapper.insert(data=DictTypeModel(id=2, name="new", type="new"))
+        names.append(await name())
+        await db.session.commit()
+        # Replicas may lag behind the commit, reads stay on the primary
+        names.append(await name())
+        records, _ = await mapper.select_by_page()
+        names.append(len(records))
+    async with db():
+        names.append(await name())
+        chunks = [chunk async for chunk in mapper.select_stream()]
+        names.append(len(chunks[0]))
+    await primary.dispose()
+    await replica.dispose()
+    return names
+
+
+def test_reads_go_to_replica_until_the_request_writes():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names = asyncio.run(_route_reads(tmp_dir))
+    assert names == [
+        "replica",
+        "primary",
+        "primary",
+        "primary",
+        2,
+        "replica",
+        1,
+    ]
+
+
+async def _pick(tmp_dir: str):
+    down = create_async_engine(
+        f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'missing', 'x.db')}"
+    )
+    heavy = create_async_engine("sqlite+aiosqlite://")
+    light = create_async_engine("sqlite+aiosqlite://")
+    router = ReplicaRouter([(heavy, 2), (light, 1), (down, 1)])
+    picks = [router.pick() for _ in range(8)]
+    await router.check_health()
+    healthy_picks = Counter(router.pick() for _ in range(9))
+    for engine in (down, heavy, light):
+        await engine.dispose()
+    return (heavy, light, down), picks, healthy_picks
+
+
+def test_router_weights_replicas_and_skips_unhealthy_ones():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engines, picks, healthy_picks = asyncio.run(_pick(tmp_dir))
+    heavy, light, down = engines
+    assert Counter(picks) == {heavy: 4, light: 2, down: 2}
+    # Smooth round-robin interleaves instead of sending bursts
+    assert picks[:2] == [heavy, light]
+    assert healthy_picks == {heavy: 6, light: 3}
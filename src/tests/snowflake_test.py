@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from src.main.app.core.utils.snowflake_util import (
+    API_EPOCH,
+    MAX_SAFE_ID,
+    SnowflakeGenerator,
+    WorkerIdLease,
+    sequence_mask,
+    snowflake_ids,
+    timestamp_left_shift,
+)
+
+
+def _fields(id: int):
+    return (
+        (id >> timestamp_left_shift) + API_EPOCH,
+        (id >> 17) & 31,
+        (id >> 12) & 31,
+        id & sequence_mask,
+    )
+
+
+def test_ids_carry_millisecond_timestamp_and_node():
+    generator = SnowflakeGenerator(
+        worker_id=7, datacenter_id=3, clock=lambda: API_EPOCH + 1234
+    )
+    assert [_fields(id) for id in generator.next_ids(2)] == [
+        (API_EPOCH + 1234, 3, 7, 0),
+        (API_EPOCH + 1234, 3, 7, 1),
+    ]
+
+
+def test_ids_fit_json_numbers_until_the_timestamp_bits_run_out():
+    generator = SnowflakeGenerator(
+        worker_id=31, datacenter_id=31, clock=lambda: API_EPOCH + 2**31 - 1
+    )
+    assert generator.next_id() == MAX_SAFE_ID - sequence_mask
+
+
+def test_clock_rollback_and_exhausted_sequence_never_sleep(monkeypatch):
+    now = [API_EPOCH + 1000]
+    generator = SnowflakeGenerator(clock=lambda: now[0])
+    monkeypatch.setattr(time, "sleep", None)
+    ids = generator.next_ids(sequence_mask + 2)
+    # The sequence of a millisecond ran out, the next one was borrowed
+    assert _fields(ids[-1])[0] == API_EPOCH + 1001
+    now[0] -= 500
+    ids.append(generator.next_id())
+    now[0] += 2000
+    ids.append(generator.next_id())
+    assert ids == sorted(set(ids))
+    assert _fields(ids[-2])[0] == API_EPOCH + 1001
+    assert _fields(ids[-1])[0] == API_EPOCH + 2500
+
+
+def test_bulk_allocation_is_unique_and_ascending():
+    ids = snowflake_ids(3 * sequence_mask)
+    assert ids == sorted(set(ids))
+    assert snowflake_ids(0) == []
+
+
+async def _lease(server):
+    leases = [
+        WorkerIdLease(
+            ttl=60,
+            generator=SnowflakeGenerator(),
+            redis_factory=lambda: _async(server.client()),
+        )
+        for _ in range(3)
+    ]
+    worker_ids = [await lease.acquire() for lease in leases]
+    seen = [worker_ids, [lease.generator.worker_id for lease in leases]]
+    await leases[0].release()
+    seen.append(await leases[0].acquire())
+    # A lease taken over by another process is neither extended nor freed
+    server.data["snowflake_worker:0:1"] = "other"
+    await leases[1].renew()
+    seen.append(leases[1].worker_id)
+    for lease in leases:
+        await lease.release()
+    seen.append(sorted(server.data))
+    return seen
+
+
+async def _async(value):
+    return value
+
+
+def test_worker_ids_are_leased_through_redis(redis_server):
+    assert asyncio.run(_lease(redis_server)) == [
+        [0, 1, 2],
+        [0, 1, 2],
+        0,
+        3,
+        ["snowflake_worker:0:1"],
+    ]
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from src.main.app.core.middleware.db_session_middleware import (
+    create_middleware_and_session_proxy,
+)
+from src.main.app.core.session.sql_profiler import (
+    assert_max_queries,
+    statement_shape,
+)
+from src.main.app.model.sys_dict_type_model import DictTypeModel
+
+engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+SQLAlchemyMiddleware, db = create_middleware_and_session_proxy()
+app = FastAPI()
+app.add_middleware(
+    SQLAlchemyMiddleware,
+    custom_engine=engine,
+    profile_sql=True,
+    slowest=2,
+    n_plus_one_threshold=3,
+)
+
+
+@app.get("/types")
+async def types():
+    ids = (await db.session.exec(select(DictTypeModel.id))).all()
+    # One query per row, the N+1 the profile should point at
+    return [
+        (
+            await db.session.exec(
+                select(DictTypeModel.name).where(DictTypeModel.id == id)
+            )
+        ).one()
+        for id in ids
+    ]
+
+
+@app.get("/types/in")
+async def types_in():
+    statement = select(DictTypeModel.name).where(
+        DictTypeModel.id.in_([1, 2, 3])
+    )
+    return (await db.session.exec(statement)).all()
+
+
+@pytest.fixture(scope="module")
+def client():
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                SQLModel.metadata.create_all, tables=[DictTypeModel.__table__]
+            )
+            await conn.execute(
+                DictTypeModel.__table__.insert(),
+                [
+                    {"id": id, "name": f"n{id}", "type": f"t{id}"}
+                    for id in (1, 2, 3)
+                ],
+            )
+
+    with TestClient(app) as test_client:
+        test_client.portal.call(create_tables)
+        yield test_client
+
+
+def test_requests_are_profiled_with_likely_n_plus_one(client):
+    lines = []
+    sink = logger.add(lines.append, format="{message}")
+    try:
+        response = client.get("/types")
+    finally:
+        logger.remove(sink)
+
+    assert response.json() == ["n1", "n2", "n3"]
+    assert response.headers["server-timing"].endswith(
+        'desc="4 statements, 1 repeated"'
+    )
+    profile = json.loads(lines[-1].split("SQL profile ", 1)[1])
+    assert profile["request"] == "GET /types"
+    assert profile["statements"] == 4
+    assert list(profile["n_plus_one"].values()) == [3]
+    assert len(profile["slowest"]) == 2
+
+
+def test_query_budgets_fail_with_the_statements_run(client):
+    with assert_max_queries(1):
+        assert client.get("/types/in").json() == ["n1", "n2", "n3"]
+    with pytest.raises(AssertionError, match="at most 2 statements, 4"):
+        with assert_max_queries(2):
+            client.get("/types")
+
+
+def test_in_lists_of_any_length_share_a_shape():
+    assert statement_shape("SELECT a\n FROM t WHERE id IN (?, ?, ?)") == (
+        statement_shape("SELECT a FROM t WHERE id IN ($1::INTEGER, $2)")
+    )
@@ -0,0 +1,75 @@
+import asyncio
+import io
+
+from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.main.app.core.constant import FilterOperators
+from src.main.app.core.enums import ExportTypeEnum
+from src.main.app.core.utils import excel_util
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.model.sys_user_model import UserModel
+from src.main.app.schema.sys_user_schema import UserPage
+
+
+async def _export(export_type: ExportTypeEnum) -> bytes:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all, tables=[UserModel.__table__]
+        )
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            UserModel(
+                id=index,
+                username=f"user{index}",
+                password="x",
+                nickname="n",
+                status=index % 2,
+            )
+            for index in range(1, 8)
+        )
+        await session.commit()
+        chunk_sizes = []
+
+        async def chunks():
+            async for chunk in userMapper.select_stream(
+                sort_list=[{"field": "id", "order": "asc"}],
+                chunk_size=2,
+                db_session=session,
+                **{FilterOperators.EQ: {"status": 1}},
+            ):
+                chunk_sizes.append(len(chunk))
+                yield chunk
+
+        response = await excel_util.stream_export(
+            schema=UserPage,
+            file_name="user_data_export",
+            chunks=chunks(),
+            export_type=export_type,
+        )
+        body = b"".join([block async for block in response.body_iterator])
+        assert chunk_sizes == [2, 2]
+    await engine.dispose()
+    return body
+
+
+def test_stream_csv_export():
+    lines = asyncio.run(_export(ExportTypeEnum.CSV)).decode("utf-8-sig")
+    rows = lines.splitlines()
+    assert rows[0].split(",")[:2] == ["id", "username"]
+    assert [row.split(",")[1] for row in rows[1:]] == [
+        "user1",
+        "user3",
+        "user5",
+        "user7",
+    ]
+
+
+def test_stream_xlsx_export():
+    workbook = load_workbook(io.BytesIO(asyncio.run(_export("xlsx"))))
+    rows = list(workbook.active.iter_rows(values_only=True))
+    assert rows[0][:2] == ("id", "username")
+    assert [row[1] for row in rows[1:]] == ["user1", "user3", "user5", "user7"]
@@ -0,0 +1,119 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from src.main.app.core.cache.redis_cache import RedisCache
+from src.main.app.core.cache.tiered_cache import TieredCache
+
+
+def _requests(tier: str, result: str) -> float:
+    labels = {"tier": tier, "result": result}
+    return REGISTRY.get_sample_value("cache_requests_total", labels) or 0
+
+
+def _snapshot():
+    return {
+        (tier, result): _requests(tier, result)
+        for tier in ("local", "redis")
+        for result in ("hit", "miss")
+    }
+
+
+def _since(before):
+    return {key: _requests(*key) - value for key, value in before.items()}
+
+
+def make_cache(server) -> TieredCache:
+    client = server.client()
+    return TieredCache(RedisCache(client), client, maxsize=100, ttl=60)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _invalidate_across_workers(server):
+    first, second = make_cache(server), make_cache(server)
+    await first.set("user:1", "alice")
+    await asyncio.gather(first.get("warmup"), second.get("warmup"))
+    await _settle()
+    before = _snapshot()
+    seen = [await second.get("user:1"), await second.get("user:1")]
+    gets = server.gets
+    await first.set("user:1", "bob")
+    await _settle()
+    seen.append(await second.get("user:1"))
+    await first.delete("user:1")
+    await _settle()
+    seen.append(await second.get("user:1"))
+    requests = _since(before)
+    await asyncio.gather(first.close(), second.close())
+    return seen, server.gets - gets, requests
+
+
+def test_writes_invalidate_the_local_tier_of_every_worker(redis_server):
+    seen, remote_gets, requests = asyncio.run(
+        _invalidate_across_workers(redis_server)
+    )
+    assert seen == ["alice", "alice", "bob", None]
+    assert remote_gets == 2
+    assert requests == {
+        ("local", "hit"): 1,
+        ("local", "miss"): 3,
+        ("redis", "hit"): 2,
+        ("redis", "miss"): 1,
+    }
+
+
+async def _load_once(server):
+    cache = make_cache(server)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    values = await asyncio.gather(
+        *(cache.get_or_set("key", loader) for _ in range(20))
+    )
+    await cache.close()
+    return values, calls, server.gets
+
+
+def test_concurrent_misses_share_one_load(redis_server):
+    values, calls, remote_gets = asyncio.run(_load_once(redis_server))
+    assert values == ["value"] * 20
+    assert calls == 1
+    # One get shared by the first misses, one more inside the loader
+    assert remote_gets == 2
+
+
+async def _expire_with_redis(server):
+    cache = make_cache(server)
+    await cache.get("warmup")
+    await _settle()
+    await cache.set("single", "value", timeout=0.05)
+    await cache.set_many({"batch": "value"}, timeout=0.05)
+    await cache.set("kept", "value")
+    cached = [await cache.get("single"), await cache.get_many(["batch"])]
+    await cache.get("kept")
+    await asyncio.sleep(0.1)
+    # Expired by Redis, which publishes no invalidation for it
+    for key in ("single", "batch", "kept"):
+        del server.data[key]
+    expired = [
+        await cache.get("single"),
+        await cache.get_many(["batch"]),
+        await cache.get("kept"),
+    ]
+    await cache.close()
+    return cached, expired
+
+
+def test_local_entries_expire_with_their_redis_timeout(redis_server):
+    cached, expired = asyncio.run(_expire_with_redis(redis_server))
+    assert cached == ["value", {"batch": "value"}]
+    assert expired == [None, {}, "value"]
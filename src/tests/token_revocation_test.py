@@ -0,0 +1,148 @@
+import asyncio
+import time
+
+from src.main.app.core.cache.page_cache import PageCache
+from src.main.app.core.cache.redis_cache import RedisCache
+from src.main.app.core.cache.serializer import JsonSerializer
+from src.main.app.core.enums import TokenTypeEnum
+from src.main.app.core.security import security
+from src.main.app.core.security.token_denylist import TokenDenylist
+from src.main.app.enums import AuthErrorCode
+from src.main.app.exception import AuthException
+from src.main.app.mapper.sys_user_mapper import userMapper
+from src.main.app.service.impl.sys_user_service_impl import UserServiceImpl
+
+
+class CountingCache(PageCache):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return await super().get(key)
+
+
+async def _share_revocations():
+    store = CountingCache()
+
+    async def cache_factory():
+        return store
+
+    local, remote = (
+        TokenDenylist(
+            capacity=1000, sync_interval=3600, cache_factory=cache_factory
+        )
+        for _ in range(2)
+    )
+    await asyncio.gather(local.sync(), remote.sync())
+    expire_at = time.time() + 60
+    await local.revoke("revoked", expire_at)
+    store.gets = 0
+    seen = [
+        await local.is_revoked("revoked"),
+        await remote.is_revoked("revoked"),
+    ]
+    # Unknown JTIs are answered by the Bloom filter alone
+    seen += [await remote.is_revoked(f"jti{index}") for index in range(1000)]
+    gets_before_sync = store.gets
+    await remote.sync()
+    seen.append(await remote.is_revoked("revoked"))
+    seen.append(await remote.is_revoked("revoked"))
+    return seen, gets_before_sync, store.gets - gets_before_sync
+
+
+def test_denylist_checks_the_store_only_for_filter_hits():
+    seen, gets_before_sync, gets_after_sync = asyncio.run(_share_revocations())
+    assert seen[:2] == [True, False]
+    assert not any(seen[2:-2])
+    assert seen[-2:] == [True, True]
+    assert gets_before_sync == 0
+    # One version read by the sync, then one confirmation of the filter hit
+    assert gets_after_sync == 2
+
+
+async def _sync_from_binary_client(server):
+    # Non-raw serializers may read through a client returning bytes
+    store = RedisCache(server.client(decode_responses=False), JsonSerializer())
+
+    async def cache_factory():
+        return store
+
+    local, remote = (
+        TokenDenylist(
+            capacity=1000, sync_interval=3600, cache_factory=cache_factory
+        )
+        for _ in range(2)
+    )
+    await local.revoke("revoked", time.time() + 60)
+    await remote.sync()
+    return "revoked" in remote.bloom, await store.keys("revoked_token:")
+
+
+def test_denylist_syncs_through_a_binary_redis_client(redis_server):
+    in_filter, keys = asyncio.run(_sync_from_binary_client(redis_server))
+    assert in_filter
+    assert keys == ["revoked_token:revoked"]
+
+
+async def _rotate():
+    user_service = UserServiceImpl(mapper=userMapper)
+    token = await user_service.generate_tokens(user_id=7)
+    rotated = await user_service.refresh_tokens(
+        refresh_token=token.refresh_token
+    )
+    errors = []
+    for refresh_token in (token.refresh_token, token.access_token):
+        try:
+            await user_service.refresh_tokens(refresh_token=refresh_token)
+        except AuthException as e:
+            errors.append(e.code)
+    await user_service.logout(
+        access_token=rotated.access_token,
+        refresh_token=rotated.refresh_token,
+    )
+    for access_token in (token.access_token, rotated.access_token):
+        try:
+            await security.verify_token(access_token)
+            errors.append(None)
+        except security.TokenRevokedError:
+            errors.append(AuthErrorCode.TOKEN_REVOKED.code)
+    try:
+        await security.verify_token(
+            rotated.refresh_token, TokenTypeEnum.refresh
+        )
+    except security.TokenRevokedError:
+        errors.append(AuthErrorCode.TOKEN_REVOKED.code)
+    return errors
+
+
+def test_refresh_tokens_rotate_and_logout_revokes():
+    errors = asyncio.run(_rotate())
+    assert errors == [
+        AuthErrorCode.TOKEN_REVOKED.code,
+        AuthErrorCode.INVALID_TOKEN.code,
+        None,
+        AuthErrorCode.TOKEN_REVOKED.code,
+        AuthErrorCode.TOKEN_REVOKED.code,
+    ]
+
+
+async def _refresh_concurrently():
+    user_service = UserServiceImpl(mapper=userMapper)
+    token = await user_service.generate_tokens(user_id=7)
+
+    async def refresh():
+        try:
+            await user_service.refresh_tokens(refresh_token=token.refresh_token)
+            return None
+        except AuthException as e:
+            return e.code
+
+    return await asyncio.gather(*(refresh() for _ in range(5)))
+
+
+def test_concurrent_refreshes_with_one_token_succeed_once():
+    codes = asyncio.run(_refresh_concurrently())
+    assert codes.count(None) == 1
+    assert codes.count(AuthErrorCode.TOKEN_REVOKED.code) == 4